@@ -10,7 +10,7 @@ from typing import Any, Dict, List
 from celery import shared_task
 
 from agents.base_agent import BaseAgent
-from brain.llm_router import get_llm
+from brain.llm_router import resolve_llm
 from brain.prompts import ANALYTICS_SUMMARY_SYSTEM, ANALYTICS_SUMMARY_PROMPT
 
 logger = logging.getLogger(__name__)
@@ -123,7 +123,8 @@ class AnalyticsAgent(BaseAgent):
 
         prompt = ANALYTICS_SUMMARY_PROMPT.format(analytics_data=data_str)
 
-        return await get_llm("analytics_agent").generate(
+        llm = await resolve_llm("analytics_agent")
+        return await llm.generate(
             prompt=prompt,
             system_prompt=ANALYTICS_SUMMARY_SYSTEM,
             temperature=0.5,
@@ -3,10 +3,18 @@ ClawtBot — Agent 1: Content Creator Agent
 Generates social media content (caption, hook, CTA, post text) using LLM.
 """
 
-from typing import Any, Dict
+import asyncio
+from typing import Any, Dict, List
 from agents.base_agent import BaseAgent
-from brain.llm_router import get_llm
-from brain.prompts import CONTENT_CREATOR_SYSTEM, CONTENT_CREATOR_PROMPT
+from agents.platform_rules import validate_content
+from brain.llm_router import resolve_llm
+from brain.prompts import (
+    CONTENT_CREATOR_SYSTEM,
+    CONTENT_CREATOR_PROMPT,
+    CONTENT_CREATOR_MULTI_PROMPT,
+)
+
+POST_FIELDS = ("caption", "hook", "cta", "post_text")
 
 
 class ContentCreatorAgent(BaseAgent):
@@ -15,6 +23,13 @@ class ContentCreatorAgent(BaseAgent):
 
     Input:  { topic, platform, tone }
     Output: { caption, hook, cta, post_text }
+
+    Multi-platform mode — one LLM call for every platform:
+    Input:  { topic, platforms: [...], tone }
+    Output: { topic, tone, platforms: { <platform>: { caption, hook, cta, post_text } } }
+
+    Each platform's text is checked against its length limit locally
+    (see agents.platform_rules); fixes are listed under "validation_issues".
     """
 
     def __init__(self):
@@ -23,36 +38,89 @@ class ContentCreatorAgent(BaseAgent):
     async def run(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         self.log_start(input_data)
 
-        topic = input_data["topic"]
-        platform = input_data["platform"]
-        tone = input_data.get("tone", "professional")
+        try:
+            if "platforms" in input_data:
+                output = await self._run_multi(input_data)
+            else:
+                output = await self._run_single(
+                    input_data["topic"],
+                    input_data["platform"],
+                    input_data.get("tone", "professional"),
+                )
+            self.log_complete(output)
+            return output
+
+        except Exception as e:
+            self.log_error(e)
+            raise
 
+    async def _run_single(self, topic: str, platform: str, tone: str) -> Dict[str, Any]:
         prompt = CONTENT_CREATOR_PROMPT.format(
             topic=topic,
             platform=platform,
             tone=tone,
         )
 
-        try:
-            result = await get_llm("content_creator").generate_json(
-                prompt=prompt,
+        llm = await resolve_llm("content_creator")
+        result = await llm.generate_json(
+            prompt=prompt,
+            system_prompt=CONTENT_CREATOR_SYSTEM,
+            temperature=0.8,
+        )
+
+        return self._post(result, topic, platform, tone)
+
+    async def _run_multi(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        topic = input_data["topic"]
+        tone = input_data.get("tone", "professional")
+        platforms: List[str] = list(dict.fromkeys(p.lower() for p in input_data["platforms"]))
+        if not platforms:
+            raise ValueError("At least one platform is required")
+
+        by_platform: Dict[str, Dict[str, Any]] = {}
+        if len(platforms) > 1:
+            llm = await resolve_llm("content_creator")
+            result = await llm.generate_json(
+                prompt=CONTENT_CREATOR_MULTI_PROMPT.format(
+                    platforms=", ".join(platforms),
+                    topic=topic,
+                    tone=tone,
+                ),
                 system_prompt=CONTENT_CREATOR_SYSTEM,
                 temperature=0.8,
+                max_tokens=min(4096, 1024 * len(platforms)),
             )
+            if not isinstance(result, dict):
+                result = {}
+            elif isinstance(result.get("platforms"), dict):
+                result = result["platforms"]
+            result = {str(k).lower(): v for k, v in result.items()}
+            for platform in platforms:
+                section = result.get(platform)
+                if isinstance(section, dict) and section.get("post_text"):
+                    by_platform[platform] = self._post(section, topic, platform, tone)
 
-            output = {
-                "caption": result.get("caption", ""),
-                "hook": result.get("hook", ""),
-                "cta": result.get("cta", ""),
-                "post_text": result.get("post_text", ""),
-                "topic": topic,
-                "platform": platform,
-                "tone": tone,
-            }
+        # Platforms the combined response missed get a call of their own
+        missing = [p for p in platforms if p not in by_platform]
+        if missing:
+            if len(platforms) > 1:
+                self.logger.warning(f"[{self.name}] Multi-platform response missed {missing}")
+            posts = await asyncio.gather(*(self._run_single(topic, p, tone) for p in missing))
+            by_platform.update(zip(missing, posts))
 
-            self.log_complete(output)
-            return output
+        return {
+            "topic": topic,
+            "tone": tone,
+            "platforms": {p: by_platform[p] for p in platforms},
+        }
 
-        except Exception as e:
-            self.log_error(e)
-            raise
+    @staticmethod
+    def _post(result: Any, topic: str, platform: str, tone: str) -> Dict[str, Any]:
+        if not isinstance(result, dict):
+            result = {}
+        output = {field: result.get(field, "") for field in POST_FIELDS}
+        output.update({"topic": topic, "platform": platform, "tone": tone})
+        output, issues = validate_content(platform, output)
+        if issues:
+            output["validation_issues"] = issues
+        return output
@@ -12,24 +12,37 @@ can invoke it for any data ingestion task. Each source type has a dedicated
 parser, and the output is always a list of normalized dictionaries.
 """
 
+import asyncio
+import codecs
 import csv
 import io
 import json
 import logging
+import random
 import re
+import uuid
+from collections import deque
+from contextlib import aclosing, asynccontextmanager
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
 from enum import Enum
+from urllib.parse import urlsplit
 
 import httpx
 
 from agents.base_agent import BaseAgent
+from brain.http_pool import get_http_client
+from config import settings
 
 logger = logging.getLogger(__name__)
 
 
 # ─── Source Types ────────────────────────────────────────────────────────────
 
+HTTP_POOL = "data_parser"  # brain.http_pool key shared by all URL fetches
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
 class DataSourceType(str, Enum):
     CSV_FILE = "csv_file"           # Direct CSV file upload (bytes/string)
     CSV_URL = "csv_url"             # CSV accessible via URL
@@ -123,27 +136,45 @@ def _parse_bool(value: str) -> bool:
     return str(value).strip().upper() in ("TRUE", "YES", "1", "Y", "✓", "✔")
 
 
+PLATFORM_ALIASES = {
+    "x": "twitter",
+    "x (twitter)": "twitter",
+    "twitter/x": "twitter",
+    "ig": "instagram",
+    "fb": "facebook",
+    "yt": "youtube",
+    "li": "linkedin",
+    "in": "linkedin",
+}
+
+# Common date formats, in the order they are tried
+DATE_FORMATS = [
+    "%m/%d/%Y",    # 3/1/2026
+    "%d/%m/%Y",    # 01/03/2026
+    "%Y-%m-%d",    # 2026-03-01
+    "%m-%d-%Y",    # 03-01-2026
+    "%d-%m-%Y",    # 01-03-2026
+    "%B %d, %Y",   # March 1, 2026
+    "%b %d, %Y",   # Mar 1, 2026
+    "%d %B %Y",    # 1 March 2026
+    "%Y/%m/%d",    # 2026/03/01
+]
+
+_PLATFORM_SPLIT_RE = re.compile(r'[,/|;]+')
+_HASHTAG_SPLIT_RE = re.compile(r'[,\s]+')
+
+
 def _parse_platforms(value: str) -> List[str]:
     """Parse a comma/slash separated platform string into a list."""
     if not value:
         return []
     # Handle comma-separated, possibly quoted
     platforms = []
-    for p in re.split(r'[,/|;]+', str(value)):
+    for p in _PLATFORM_SPLIT_RE.split(str(value)):
         cleaned = p.strip().lower()
         if cleaned:
             # Normalize platform names
-            platform_aliases = {
-                "x": "twitter",
-                "x (twitter)": "twitter",
-                "twitter/x": "twitter",
-                "ig": "instagram",
-                "fb": "facebook",
-                "yt": "youtube",
-                "li": "linkedin",
-                "in": "linkedin",
-            }
-            platforms.append(platform_aliases.get(cleaned, cleaned))
+            platforms.append(PLATFORM_ALIASES.get(cleaned, cleaned))
     return platforms
 
 
@@ -152,7 +183,7 @@ def _parse_hashtags(value: str) -> List[str]:
     if not value:
         return []
     # Split by comma or space
-    tags = re.split(r'[,\s]+', str(value).strip())
+    tags = _HASHTAG_SPLIT_RE.split(str(value).strip())
     result = []
     for tag in tags:
         tag = tag.strip()
@@ -163,25 +194,16 @@ def _parse_hashtags(value: str) -> List[str]:
     return result
 
 
-def _parse_date(value: str) -> Optional[str]:
-    """Parse various date formats to ISO 8601."""
+def _parse_date(value: str, preferred_format: Optional[str] = None) -> Optional[str]:
+    """Parse various date formats to ISO 8601 (`preferred_format` is tried first)."""
     if not value or not str(value).strip():
         return None
 
     value = str(value).strip()
 
-    # Try common date formats
-    formats = [
-        "%m/%d/%Y",    # 3/1/2026
-        "%d/%m/%Y",    # 01/03/2026
-        "%Y-%m-%d",    # 2026-03-01
-        "%m-%d-%Y",    # 03-01-2026
-        "%d-%m-%Y",    # 01-03-2026
-        "%B %d, %Y",   # March 1, 2026
-        "%b %d, %Y",   # Mar 1, 2026
-        "%d %B %Y",    # 1 March 2026
-        "%Y/%m/%d",    # 2026/03/01
-    ]
+    formats = DATE_FORMATS
+    if preferred_format:
+        formats = [preferred_format] + [fmt for fmt in DATE_FORMATS if fmt != preferred_format]
 
     for fmt in formats:
         try:
@@ -194,6 +216,164 @@ def _parse_date(value: str) -> Optional[str]:
     return value
 
 
+def _detect_date_format(values: List[str]) -> Optional[str]:
+    """
+    The format that parses the most of the sample values (earlier formats
+    win ties), so a day-first calendar is read day-first throughout.
+    """
+    best, best_count = None, 0
+    samples = [str(v).strip() for v in values if v and str(v).strip()]
+    for fmt in DATE_FORMATS:
+        count = 0
+        for value in samples:
+            try:
+                datetime.strptime(value, fmt)
+                count += 1
+            except ValueError:
+                pass
+        if count > best_count:
+            best, best_count = fmt, count
+    return best
+
+
+def _serialize_db_value(val: Any) -> Any:
+    """Make a database value JSON-ready."""
+    if isinstance(val, datetime):
+        return val.isoformat()
+    if isinstance(val, Enum):
+        return val.value
+    if isinstance(val, bytes):
+        return val.hex()
+    if isinstance(val, uuid.UUID):
+        return str(val)
+    return val
+
+
+class _LineFeed:
+    """Line iterator for csv.reader that notes when it is asked past the queued lines."""
+
+    def __init__(self):
+        self.lines: deque = deque()
+        self.taken: List[str] = []
+        self.starved = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if not self.lines:
+            self.starved = True
+            raise StopIteration
+        line = self.lines.popleft()
+        self.taken.append(line)
+        return line
+
+
+# ─── Normalization Plan ─────────────────────────────────────────────────────
+
+DATE_FIELDS = ("date", "scheduled_date")
+HASHTAG_FIELDS = ("default_hashtags", "generated_hashtags")
+PLAN_SAMPLE_ROWS = 50  # rows inspected to pick the date format
+ROW_DEFAULTS = (
+    ("brand", "Unknown"),
+    ("topic", ""),
+    ("platforms", []),
+    ("approval_required", False),
+    ("status", "pending"),
+    ("content_type", "general"),
+    ("default_hashtags", []),
+    ("tone", "professional"),
+)
+
+
+class NormalizationPlan:
+    """
+    Row normalization compiled once per upload: every raw column is mapped
+    to its standard name and converter up front, the calendar's date format
+    is detected from a sample of rows, and converted values are memoized —
+    dates, platform lists and hashtag strings repeat heavily in a calendar.
+
+    `normalize(raw_row, row_num)` gives the same result as renaming the
+    columns and calling `DataParserAgent._normalize_row`.
+    """
+
+    def __init__(self, fieldnames: List[str], sample_rows: List[Dict[str, Any]] = ()):
+        self.columns: Dict[Any, Tuple[str, Any]] = {
+            raw: self._column(raw) for raw in fieldnames
+        }
+        date_columns = [raw for raw, (key, _) in self.columns.items() if key in DATE_FIELDS]
+        self.date_format = _detect_date_format([
+            row.get(raw) for row in sample_rows for raw in date_columns
+        ]) if date_columns else None
+
+        # Defaults only for the fields the header does not provide
+        keys = {key for key, _ in self.columns.values()}
+        self.defaults = [(key, value) for key, value in ROW_DEFAULTS if key not in keys]
+
+        self._dates: Dict[str, Optional[str]] = {}
+        self._platform_lists: Dict[str, List[str]] = {}
+        self._hashtag_lists: Dict[str, List[str]] = {}
+
+    def _column(self, raw: Any) -> Tuple[Any, Any]:
+        if raw is None:
+            return None, None  # extra cells beyond the header (csv.DictReader restkey)
+        key = _normalize_column_name(raw)
+        if key in DATE_FIELDS:
+            return key, self._date
+        if key == "approval_required":
+            return key, _parse_bool
+        if key == "platforms":
+            return key, self._platforms
+        if key in HASHTAG_FIELDS:
+            return key, self._hashtags
+        return key, None
+
+    def _date(self, value: str) -> Optional[str]:
+        try:
+            return self._dates[value]
+        except KeyError:
+            parsed = self._dates[value] = _parse_date(value, self.date_format)
+            return parsed
+
+    def _platforms(self, value: str) -> List[str]:
+        try:
+            return list(self._platform_lists[value])
+        except KeyError:
+            parsed = self._platform_lists[value] = _parse_platforms(value)
+            return list(parsed)
+
+    def _hashtags(self, value: str) -> List[str]:
+        try:
+            return list(self._hashtag_lists[value])
+        except KeyError:
+            parsed = self._hashtag_lists[value] = _parse_hashtags(value)
+            return list(parsed)
+
+    def normalize(self, raw_row: Dict[Any, Any], row_num: int) -> Dict[str, Any]:
+        normalized: Dict[Any, Any] = {}
+        columns = self.columns
+        for raw_key, value in raw_row.items():
+            column = columns.get(raw_key)
+            if column is None:
+                column = columns[raw_key] = self._column(raw_key)
+            key, convert = column
+            value = (value or "").strip()
+            if convert is not None:
+                normalized[key] = convert(value)
+            else:
+                normalized[key] = value if value else None
+
+        # Ensure required fields have defaults
+        for key, value in self.defaults:
+            if key not in normalized:
+                normalized[key] = list(value) if isinstance(value, list) else value
+
+        # Add metadata
+        normalized["_row_number"] = row_num
+
+        return normalized
+
+
 # ═════════════════════════════════════════════════════════════════════════════
 # Data Parser Agent
 # ═════════════════════════════════════════════════════════════════════════════
@@ -231,8 +411,10 @@ class DataParserAgent(BaseAgent):
             source_type: DataSourceType value
             data: Raw data (for csv_file, json_file)
             url: URL to fetch (for csv_url, google_sheet, google_doc)
-            query: SQL-like filter (for database)
             table: Table name (for database)
+            filters: Column equality filters (for database)
+            columns: Columns to select (for database; default all)
+            limit: Max rows (for database; default settings.data_parser_db_default_limit)
             schema_hint: Optional dict mapping expected columns
 
         Returns:
@@ -252,42 +434,8 @@ class DataParserAgent(BaseAgent):
             source_type = DataSourceType(source_type)
 
         try:
-            if source_type == DataSourceType.CSV_FILE:
-                rows, columns, errors = self._parse_csv(input_data.get("data", ""))
-
-            elif source_type == DataSourceType.CSV_URL:
-                csv_data = await self._fetch_url(input_data["url"])
-                rows, columns, errors = self._parse_csv(csv_data)
-
-            elif source_type == DataSourceType.GOOGLE_SHEET:
-                csv_data = await self._fetch_google_sheet(input_data["url"])
-                rows, columns, errors = self._parse_csv(csv_data)
-
-            elif source_type == DataSourceType.GOOGLE_DOC:
-                doc_data = await self._fetch_google_doc(input_data["url"])
-                rows, columns, errors = self._parse_google_doc(doc_data)
-
-            elif source_type == DataSourceType.JSON_FILE:
-                rows, columns, errors = self._parse_json(input_data.get("data", ""))
-
-            elif source_type == DataSourceType.DATABASE:
-                rows, columns, errors = await self._query_database(
-                    table=input_data.get("table", ""),
-                    filters=input_data.get("filters", {}),
-                )
-
-            else:
-                raise ValueError(f"Unsupported source type: {source_type}")
-
-            output = {
-                "rows": rows,
-                "total_rows": len(rows),
-                "columns": columns,
-                "source_type": source_type.value,
-                "parse_errors": errors,
-                "parsed_at": datetime.utcnow().isoformat(),
-            }
-
+            rows, columns, errors = await self._load(source_type, input_data)
+            output = self._output(source_type, rows, columns, errors)
             self.log_complete({"total_rows": len(rows), "columns": columns})
             return output
 
@@ -295,6 +443,85 @@ class DataParserAgent(BaseAgent):
             self.log_error(e)
             raise
 
+    async def run_many(self, inputs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Parse several sources at once (e.g. all the sheets linked to a brand).
+
+        URL sources are fetched concurrently over the shared connection pool,
+        at most `settings.data_parser_max_per_host` at a time per host, and
+        CSV bodies are decoded and parsed while they stream in. Results come
+        back in input order, each shaped like `run()`'s output; a source
+        that fails gets an "error" key and no rows instead of failing the
+        batch.
+        """
+        host_slots: Dict[str, asyncio.Semaphore] = {}
+
+        async def one(input_data: Dict[str, Any]) -> Dict[str, Any]:
+            source_type = input_data.get("source_type", DataSourceType.CSV_FILE)
+            try:
+                source_type = DataSourceType(source_type)
+                rows, columns, errors = await self._load(source_type, input_data, host_slots)
+                return self._output(source_type, rows, columns, errors)
+            except Exception as e:
+                self.logger.warning(f"[{self.name}] Source {input_data.get('url') or source_type} failed: {e}")
+                output = self._output(source_type, [], [], [])
+                output["source_type"] = getattr(source_type, "value", source_type)
+                output["error"] = str(e)
+                return output
+
+        self.log_start({"sources": len(inputs)})
+        results = await asyncio.gather(*(one(input_data) for input_data in inputs))
+        self.log_complete({
+            "sources": len(results),
+            "failed": sum(1 for result in results if "error" in result),
+        })
+        return list(results)
+
+    async def _load(
+        self,
+        source_type: DataSourceType,
+        input_data: Dict[str, Any],
+        host_slots: Optional[Dict[str, asyncio.Semaphore]] = None,
+    ) -> Tuple[List[Dict], List[str], List[str]]:
+        """Fetch and parse one source into (rows, columns, errors)."""
+        if source_type == DataSourceType.CSV_FILE:
+            return self._parse_csv(input_data.get("data", ""))
+
+        elif source_type == DataSourceType.CSV_URL:
+            return await self._fetch_csv_rows(input_data["url"], host_slots)
+
+        elif source_type == DataSourceType.GOOGLE_SHEET:
+            csv_url = self._google_sheet_csv_url(input_data["url"])
+            return await self._fetch_csv_rows(csv_url, host_slots)
+
+        elif source_type == DataSourceType.GOOGLE_DOC:
+            doc_data = await self._fetch_google_doc(input_data["url"], host_slots)
+            return self._parse_google_doc(doc_data)
+
+        elif source_type == DataSourceType.JSON_FILE:
+            return self._parse_json(input_data.get("data", ""))
+
+        elif source_type == DataSourceType.DATABASE:
+            return await self._query_database(
+                table=input_data.get("table", ""),
+                filters=input_data.get("filters", {}),
+                columns=input_data.get("columns"),
+                limit=input_data.get("limit"),
+            )
+
+        raise ValueError(f"Unsupported source type: {source_type}")
+
+    @staticmethod
+    def _output(source_type, rows: List[Dict], columns: List[str], errors: List[str]) -> Dict[str, Any]:
+        return {
+            "rows": rows,
+            "total_rows": len(rows),
+            "columns": columns,
+            "source_type": source_type.value,
+            "parse_errors": errors,
+            "parsed_at": datetime.utcnow().isoformat(),
+        }
+
     # ── CSV Parser ──────────────────────────────────────────────────────
 
     def _parse_csv(self, data: Any) -> Tuple[List[Dict], List[str], List[str]]:
@@ -322,29 +549,191 @@ class DataParserAgent(BaseAgent):
 
         # Normalize column names
         if reader.fieldnames:
-            raw_columns = list(reader.fieldnames)
-            column_mapping = {raw: _normalize_column_name(raw) for raw in raw_columns}
-            normalized_columns = list(column_mapping.values())
+            raw_rows = list(reader)
+            plan = NormalizationPlan(reader.fieldnames, raw_rows[:PLAN_SAMPLE_ROWS])
+            normalized_columns = [key for key, _ in plan.columns.values()]
         else:
             return [], [], ["No header row found"]
 
         rows = []
-        for i, raw_row in enumerate(reader):
+        for i, raw_row in enumerate(raw_rows):
             try:
-                row = {}
-                for raw_key, value in raw_row.items():
-                    norm_key = column_mapping.get(raw_key, raw_key)
-                    row[norm_key] = (value or "").strip()
-
-                # Apply type conversions
-                normalized = self._normalize_row(row, i + 2)  # +2 for header + 0-index
-                rows.append(normalized)
-
+                rows.append(plan.normalize(raw_row, i + 2))  # +2 for header + 0-index
             except Exception as e:
                 errors.append(f"Row {i + 2}: {str(e)}")
 
         return rows, normalized_columns, errors
 
+    # ── Streaming Parsers (chunked uploads) ─────────────────────────────
+
+    @staticmethod
+    async def _decode_stream(chunks: AsyncIterable[Any]) -> AsyncIterator[str]:
+        """
+        Decode a byte stream incrementally as UTF-8 (BOM-aware). Like
+        `_parse_csv`, fall back to latin-1 — from the first undecodable
+        chunk on — if the data turns out not to be UTF-8.
+        """
+        decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        async for chunk in chunks:
+            if isinstance(chunk, str):
+                yield chunk
+                continue
+            try:
+                text = decoder.decode(chunk)
+            except UnicodeDecodeError:
+                pending = decoder.getstate()[0]
+                decoder = codecs.getincrementaldecoder("latin-1")()
+                text = decoder.decode(pending + chunk)
+            if text:
+                yield text
+        try:
+            tail = decoder.decode(b"", final=True)
+        except UnicodeDecodeError:
+            tail = decoder.getstate()[0].decode("latin-1")
+        if tail:
+            yield tail
+
+    @staticmethod
+    async def _iter_lines(text_chunks: AsyncIterable[str]) -> AsyncIterator[str]:
+        """Split decoded text into lines (without the trailing newline)."""
+        tail = ""
+        async for text in text_chunks:
+            lines = (tail + text).split("\n")
+            tail = lines.pop()
+            for line in lines:
+                yield line
+        if tail:
+            yield tail
+
+    @classmethod
+    async def _iter_csv_values(cls, text_chunks: AsyncIterable[str]) -> AsyncIterator[Any]:
+        """
+        Run one csv.reader over the decoded stream, yielding each record's
+        values (or the csv.Error it raised). The reader tracks quote state
+        itself; when it asks for a line that has not arrived yet, the
+        record is incomplete and is re-read once more lines are queued.
+        """
+        feed = _LineFeed()
+        reader = csv.reader(feed)
+
+        def read_queued(final: bool):
+            while feed.lines:
+                feed.taken, feed.starved = [], False
+                try:
+                    values = next(reader)
+                except StopIteration:
+                    return
+                except csv.Error as e:
+                    yield e
+                    continue
+                if feed.starved and not final:
+                    feed.lines.extendleft(reversed(feed.taken))
+                    return
+                yield values
+
+        async for line in cls._iter_lines(text_chunks):
+            feed.lines.append(line + "\n")
+            for item in read_queued(final=False):
+                yield item
+        for item in read_queued(final=True):
+            yield item
+
+    async def stream_csv(
+        self,
+        chunks: AsyncIterable[Any],
+        errors: List[str],
+        columns: Optional[List[str]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Parse a CSV byte stream without buffering it: rows are normalized and
+        yielded as soon as their record has arrived. Row errors are appended
+        to `errors` (and the normalized header to `columns`, if given);
+        memory use does not depend on the file size.
+        """
+        fieldnames: Optional[List[str]] = None
+        plan: Optional[NormalizationPlan] = None
+        sample: List[Tuple[Dict[Any, Any], int]] = []  # rows held back to build the plan
+        index = 0
+
+        def normalize(raw_row: Dict[Any, Any], row_num: int) -> Optional[Dict[str, Any]]:
+            try:
+                return plan.normalize(raw_row, row_num)
+            except Exception as e:
+                errors.append(f"Row {row_num}: {str(e)}")
+                return None
+
+        async for values in self._iter_csv_values(self._decode_stream(chunks)):
+            if isinstance(values, csv.Error):
+                errors.append(f"Row {index + 2}: {str(values)}")
+                index += 1
+                continue
+            if not values:
+                continue  # blank line
+
+            if fieldnames is None:
+                fieldnames = values
+                if columns is not None:
+                    columns.extend(_normalize_column_name(raw) for raw in fieldnames)
+                continue
+
+            # Same shape csv.DictReader gives _parse_csv
+            raw_row: Dict[Any, Any] = dict(zip(fieldnames, values))
+            if len(values) > len(fieldnames):
+                raw_row[None] = values[len(fieldnames):]
+            for missing in fieldnames[len(values):]:
+                raw_row[missing] = None
+            index += 1
+
+            if plan is None:
+                sample.append((raw_row, index + 1))
+                if len(sample) < PLAN_SAMPLE_ROWS:
+                    continue
+                plan = NormalizationPlan(fieldnames, [row for row, _ in sample])
+                for held_row, row_num in sample:
+                    row = normalize(held_row, row_num)
+                    if row is not None:
+                        yield row
+                sample = []
+                continue
+
+            row = normalize(raw_row, index + 1)
+            if row is not None:
+                yield row
+
+        if fieldnames is None:
+            errors.append("Empty CSV data")
+        elif plan is None:
+            plan = NormalizationPlan(fieldnames, [row for row, _ in sample])
+            for held_row, row_num in sample:
+                row = normalize(held_row, row_num)
+                if row is not None:
+                    yield row
+
+    async def stream_jsonl(
+        self,
+        chunks: AsyncIterable[Any],
+        errors: List[str],
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Parse a JSONL byte stream line by line, yielding one object per line."""
+        line_number = 0
+        async for line in self._iter_lines(self._decode_stream(chunks)):
+            line_number += 1
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                obj = json.loads(line)
+            except json.JSONDecodeError:
+                errors.append(f"Line {line_number}: Invalid JSON")
+                continue
+            if not isinstance(obj, dict):
+                errors.append(f"Line {line_number}: Expected a JSON object")
+                continue
+            yield obj
+
+        if not line_number:
+            errors.append("Empty JSON data")
+
     def _normalize_row(self, row: Dict[str, str], row_num: int) -> Dict[str, Any]:
         """Apply type conversions and validation to a parsed row."""
         normalized = {}
@@ -376,11 +765,61 @@ class DataParserAgent(BaseAgent):
 
         return normalized
 
-    # ── Google Sheets Fetcher ───────────────────────────────────────────
+    # ── CSV URL / Google Sheets Fetcher ─────────────────────────────────
+
+    async def _fetch_csv_rows(
+        self,
+        url: str,
+        host_slots: Optional[Dict[str, asyncio.Semaphore]] = None,
+    ) -> Tuple[List[Dict], List[str], List[str]]:
+        """Fetch a CSV URL, parsing rows as the body streams in."""
+
+        async def parse(response: httpx.Response):
+            rows, columns, errors = [], [], []
+            async for row in self.stream_csv(response.aiter_bytes(), errors, columns):
+                rows.append(row)
+            return rows, columns, errors
+
+        return await self._fetch(url, parse, host_slots=host_slots)
+
+    async def fetch_google_sheet_if_changed(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Conditional fetch of a Google Sheet's CSV for incremental syncs.
+
+        Returns:
+            {
+                "not_modified": bool,   # the server answered 304
+                "text": str | None,     # CSV body when modified
+                "etag": str | None,
+                "last_modified": str | None,
+            }
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        async def read(response: httpx.Response) -> Dict[str, Any]:
+            not_modified = response.status_code == 304
+            return {
+                "not_modified": not_modified,
+                "text": None if not_modified else await self._read_text(response),
+                "etag": response.headers.get("etag") or etag,
+                "last_modified": response.headers.get("last-modified") or last_modified,
+            }
 
-    async def _fetch_google_sheet(self, url: str) -> str:
+        return await self._fetch(self._google_sheet_csv_url(url), read, headers=headers)
+
+    @staticmethod
+    def _google_sheet_csv_url(url: str) -> str:
         """
-        Fetch Google Sheets data as CSV.
+        CSV URL of a Google Sheet.
         Supports:
           - Published CSV URL: .../pub?output=csv
           - Regular share URL: extracts sheet ID and builds CSV export URL
@@ -397,11 +836,15 @@ class DataParserAgent(BaseAgent):
             # Try published CSV first; fall back to export
             csv_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv"
 
-        return await self._fetch_url(csv_url)
+        return csv_url
 
     # ── Google Docs Fetcher ─────────────────────────────────────────────
 
-    async def _fetch_google_doc(self, url: str) -> str:
+    async def _fetch_google_doc(
+        self,
+        url: str,
+        host_slots: Optional[Dict[str, asyncio.Semaphore]] = None,
+    ) -> str:
         """
         Fetch Google Docs content as plain text.
         Converts share URL to export URL.
@@ -410,10 +853,10 @@ class DataParserAgent(BaseAgent):
         if doc_id_match:
             doc_id = doc_id_match.group(1)
             export_url = f"https://docs.google.com/document/d/{doc_id}/export?format=txt"
-            return await self._fetch_url(export_url)
+            return await self._fetch_url(export_url, host_slots=host_slots)
 
         # If it's already an export URL or text URL
-        return await self._fetch_url(url)
+        return await self._fetch_url(url, host_slots=host_slots)
 
     def _parse_google_doc(self, text: str) -> Tuple[List[Dict], List[str], List[str]]:
         """
@@ -514,86 +957,187 @@ class DataParserAgent(BaseAgent):
         self,
         table: str,
         filters: Dict[str, Any],
+        columns: Optional[List[str]] = None,
+        limit: Optional[int] = None,
     ) -> Tuple[List[Dict], List[str], List[str]]:
         """
-        Query internal database for records.
+        Query internal database for the newest `limit` records (default
+        `settings.data_parser_db_default_limit`); bulk readers should
+        iterate `stream_database` instead of collecting a list.
         Supports: calendar_entries, contents, schedules
         """
+        limit = limit or settings.data_parser_db_default_limit
+        batch_size = min(limit, settings.data_parser_db_batch_size)
         errors = []
-
-        from db.database import async_session
-        from sqlalchemy import select, text
-
-        table_mapping = {
-            "calendar_entries": "calendar_entries",
-            "calendar": "calendar_entries",
-            "contents": "contents",
-            "content": "contents",
-            "schedules": "schedules",
-        }
-
-        actual_table = table_mapping.get(table.lower(), table)
-
+        rows = []
         try:
-            async with async_session() as session:
-                # Use text query for flexibility
-                query_str = f"SELECT * FROM {actual_table}"
-                where_clauses = []
+            async with aclosing(self.stream_database(table, filters, columns, batch_size)) as stream:
+                async for row in stream:
+                    rows.append(row)
+                    if len(rows) >= limit:
+                        break
+        except Exception as e:
+            errors.append(f"Database query failed: {str(e)}")
+            return [], [], errors
 
-                for key, value in filters.items():
-                    where_clauses.append(f"{key} = :{key}")
+        if columns:
+            result_columns = list(columns)
+        else:
+            result_columns = list(rows[0].keys()) if rows else []
+        return rows, result_columns, errors
 
-                if where_clauses:
-                    query_str += " WHERE " + " AND ".join(where_clauses)
+    async def stream_database(
+        self,
+        table: str,
+        filters: Optional[Dict[str, Any]] = None,
+        columns: Optional[List[str]] = None,
+        batch_size: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a table's records, newest first, as JSON-ready dicts.
+
+        Pages are fetched by keyset on (created_at, id) — each page resumes
+        after the last row of the previous one, so deep pages cost the same
+        as the first — and each page is read through a server-side cursor
+        in its own short session. Only `columns` (default: all) are
+        selected; filters are equality matches on real columns. Rows with
+        no created_at are not included.
+        """
+        from db.database import async_session
+        from sqlalchemy import select, tuple_
+
+        table_obj = self._database_table(table)
+        filters = filters or {}
+        batch_size = batch_size or settings.data_parser_db_batch_size
+
+        unknown = [name for name in list(filters) + list(columns or []) if name not in table_obj.c]
+        if unknown:
+            raise ValueError(f"Unknown column(s) for {table_obj.name}: {unknown}")
+
+        created_at, id_ = table_obj.c.created_at, table_obj.c.id
+        wanted = list(columns) if columns else [column.name for column in table_obj.c]
+        selected = [table_obj.c[name] for name in wanted]
+        for key_column in (created_at, id_):
+            if key_column.name not in wanted:
+                selected.append(key_column)
+
+        base = (
+            select(*selected)
+            .where(created_at.isnot(None), *(table_obj.c[key] == value for key, value in filters.items()))
+            .order_by(created_at.desc(), id_.desc())
+            .limit(batch_size)
+        )
 
-                query_str += " ORDER BY created_at DESC LIMIT 500"
+        last_key = None
+        while True:
+            query = base
+            if last_key is not None:
+                query = query.where(tuple_(created_at, id_) < tuple_(*last_key))
 
-                result = await session.execute(text(query_str), filters)
-                columns = list(result.keys())
-                rows = [dict(zip(columns, row)) for row in result.fetchall()]
+            fetched = 0
+            async with async_session() as session:
+                result = await session.stream(query.execution_options(yield_per=batch_size))
+                async for row in result.mappings():
+                    fetched += 1
+                    last_key = (row[created_at.name], row[id_.name])
+                    yield {name: _serialize_db_value(row[name]) for name in wanted}
 
-                # Serialize non-serializable types
-                for row in rows:
-                    for key, val in row.items():
-                        if isinstance(val, datetime):
-                            row[key] = val.isoformat()
-                        elif hasattr(val, "value"):  # Enum
-                            row[key] = val.value
-                        elif isinstance(val, bytes):
-                            row[key] = val.hex()
+            if fetched < batch_size:
+                return
 
-                return rows, columns, errors
+    @staticmethod
+    def _database_table(table: str):
+        """The Table behind a DATABASE source name."""
+        from db.calendar_models import CalendarEntry
+        from db.models import Content, Schedule
 
-        except Exception as e:
-            errors.append(f"Database query failed: {str(e)}")
-            return [], [], errors
+        table_mapping = {
+            "calendar_entries": CalendarEntry,
+            "calendar": CalendarEntry,
+            "contents": Content,
+            "content": Content,
+            "schedules": Schedule,
+        }
+        model = table_mapping.get((table or "").lower())
+        if model is None:
+            raise ValueError(f"Unsupported table: {table}")
+        return model.__table__
 
     # ── URL Fetcher (shared) ────────────────────────────────────────────
 
-    async def _fetch_url(self, url: str, timeout: float = 30.0) -> str:
+    async def _fetch_url(
+        self,
+        url: str,
+        timeout: float = 30.0,
+        host_slots: Optional[Dict[str, asyncio.Semaphore]] = None,
+    ) -> str:
         """Fetch content from a URL with timeout and retry."""
+        return await self._fetch(url, self._read_text, timeout=timeout, host_slots=host_slots)
+
+    async def _read_text(self, response: httpx.Response) -> str:
+        """Decode a streamed body incrementally (UTF-8, latin-1 fallback)."""
+        parts = [text async for text in self._decode_stream(response.aiter_bytes())]
+        return "".join(parts)
+
+    async def _fetch(
+        self,
+        url: str,
+        consume: Callable[[httpx.Response], Awaitable[Any]],
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 30.0,
+        host_slots: Optional[Dict[str, asyncio.Semaphore]] = None,
+    ) -> Any:
+        """
+        Stream a GET over the shared pooled client and return
+        `await consume(response)`. Timeouts, transport errors, 429 and 5xx
+        are retried (`settings.data_parser_fetch_retries` attempts) with
+        full-jitter exponential backoff; other HTTP errors raise. 304 is
+        passed to `consume` like a success.
+        """
         self.logger.info(f"Fetching URL: {url}")
+        client = get_http_client(HTTP_POOL)
+        attempts = max(1, settings.data_parser_fetch_retries)
 
-        async with httpx.AsyncClient(
-            follow_redirects=True,
-            timeout=timeout,
-        ) as client:
-            for attempt in range(3):
-                try:
-                    response = await client.get(url)
-                    response.raise_for_status()
-                    return response.text
-                except httpx.TimeoutException:
-                    self.logger.warning(
-                        f"Timeout fetching {url} (attempt {attempt + 1}/3)"
-                    )
-                    if attempt == 2:
-                        raise
-                except httpx.HTTPStatusError as e:
-                    self.logger.error(f"HTTP error: {e.response.status_code}")
+        for attempt in range(attempts):
+            last_attempt = attempt == attempts - 1
+            try:
+                async with self._host_slot(url, host_slots):
+                    async with client.stream(
+                        "GET", url, headers=headers, timeout=timeout, follow_redirects=True,
+                    ) as response:
+                        if response.status_code in RETRY_STATUSES and not last_attempt:
+                            self.logger.warning(
+                                f"HTTP {response.status_code} from {url} (attempt {attempt + 1}/{attempts})"
+                            )
+                        else:
+                            if response.status_code != 304:
+                                response.raise_for_status()
+                            return await consume(response)
+            except httpx.HTTPStatusError as e:
+                self.logger.error(f"HTTP error: {e.response.status_code}")
+                raise
+            except (httpx.TimeoutException, httpx.TransportError) as e:
+                self.logger.warning(
+                    f"{type(e).__name__} fetching {url} (attempt {attempt + 1}/{attempts})"
+                )
+                if last_attempt:
                     raise
 
-        return ""
+            await asyncio.sleep(random.uniform(0, settings.data_parser_backoff_base * 2 ** attempt))
+
+    @staticmethod
+    @asynccontextmanager
+    async def _host_slot(url: str, host_slots: Optional[Dict[str, asyncio.Semaphore]]):
+        """Hold one of the host's concurrent-fetch slots (no cap without `host_slots`)."""
+        if host_slots is None:
+            yield
+            return
+        host = urlsplit(url).netloc.lower()
+        slot = host_slots.get(host)
+        if slot is None:
+            slot = host_slots[host] = asyncio.Semaphore(max(1, settings.data_parser_max_per_host))
+        async with slot:
+            yield
 
     # ── Convenience Methods (for Master Agent reuse) ────────────────────
 
@@ -633,7 +1177,11 @@ class DataParserAgent(BaseAgent):
         })
 
     async def query_db(self, table: str, **filters) -> Dict[str, Any]:
-        """Convenience: Query internal database."""
+        """
+        Convenience: Query internal database (the newest
+        `settings.data_parser_db_default_limit` rows; use `stream_database`
+        for bulk reads).
+        """
         return await self.run({
             "source_type": DataSourceType.DATABASE,
             "table": table,
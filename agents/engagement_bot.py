@@ -10,7 +10,7 @@ from typing import Any, Dict, List
 from celery import shared_task
 
 from agents.base_agent import BaseAgent
-from brain.llm_router import get_llm
+from brain.llm_router import resolve_llm
 from brain.prompts import ENGAGEMENT_REPLY_SYSTEM, ENGAGEMENT_REPLY_PROMPT
 
 logger = logging.getLogger(__name__)
@@ -135,7 +135,8 @@ class EngagementBot(BaseAgent):
             commenter_name=commenter_name,
         )
 
-        return await get_llm("engagement_bot").generate_json(
+        llm = await resolve_llm("engagement_bot")
+        return await llm.generate_json(
             prompt=prompt,
             system_prompt=ENGAGEMENT_REPLY_SYSTEM,
             temperature=0.6,
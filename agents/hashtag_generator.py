@@ -3,10 +3,16 @@ ClawtBot — Agent 2: Hashtag Generator Agent
 Generates niche and broad hashtags for social media posts.
 """
 
-from typing import Any, Dict
+import asyncio
+from typing import Any, Dict, List
 from agents.base_agent import BaseAgent
-from brain.llm_router import get_llm
-from brain.prompts import HASHTAG_SYSTEM, HASHTAG_PROMPT
+from agents.platform_rules import validate_hashtags
+from brain.llm_router import resolve_llm
+from brain.prompts import HASHTAG_SYSTEM, HASHTAG_PROMPT, HASHTAG_MULTI_PROMPT
+
+
+def _has_hashtags(section: Any) -> bool:
+    return isinstance(section, dict) and ("niche_hashtags" in section or "broad_hashtags" in section)
 
 
 class HashtagGeneratorAgent(BaseAgent):
@@ -15,6 +21,13 @@ class HashtagGeneratorAgent(BaseAgent):
 
     Input:  { platform, topic }
     Output: { niche_hashtags: [...], broad_hashtags: [...] }
+
+    Multi-platform mode — one LLM call for every platform:
+    Input:  { platforms: [...], topic }
+    Output: { platforms: { <platform>: { niche_hashtags, broad_hashtags } } }
+
+    Platforms the combined reply misses fall back to a call of their own.
+    Hashtags are normalized, de-duplicated and capped per platform locally.
     """
 
     def __init__(self):
@@ -23,25 +36,34 @@ class HashtagGeneratorAgent(BaseAgent):
     async def run(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         self.log_start(input_data)
 
-        platform = input_data["platform"]
         topic = input_data["topic"]
 
-        prompt = HASHTAG_PROMPT.format(
-            platform=platform,
-            topic=topic,
-        )
-
         try:
-            result = await get_llm("hashtag_generator").generate_json(
-                prompt=prompt,
-                system_prompt=HASHTAG_SYSTEM,
-                temperature=0.7,
-            )
+            llm = await resolve_llm("hashtag_generator")
 
-            output = {
-                "niche_hashtags": result.get("niche_hashtags", []),
-                "broad_hashtags": result.get("broad_hashtags", []),
-            }
+            if "platforms" in input_data:
+                platforms: List[str] = list(dict.fromkeys(p.lower() for p in input_data["platforms"]))
+                result = await llm.generate_json(
+                    prompt=HASHTAG_MULTI_PROMPT.format(
+                        platforms=", ".join(platforms),
+                        topic=topic,
+                    ),
+                    system_prompt=HASHTAG_SYSTEM,
+                    temperature=0.7,
+                )
+                sections = self._sections(result, platforms)
+                # Platforms the combined response missed get a call of their own
+                missing = [p for p in platforms if p not in sections]
+                if missing:
+                    self.logger.warning(f"[{self.name}] Multi-platform response missed {missing}")
+                    replies = await asyncio.gather(*(self._generate(llm, topic, p) for p in missing))
+                    sections.update(zip(missing, replies))
+                output = {
+                    "platforms": {p: self._hashtags(p, sections[p]) for p in platforms},
+                }
+            else:
+                platform = input_data["platform"]
+                output = self._hashtags(platform, await self._generate(llm, topic, platform))
 
             self.log_complete(output)
             return output
@@ -49,3 +71,44 @@ class HashtagGeneratorAgent(BaseAgent):
         except Exception as e:
             self.log_error(e)
             raise
+
+    @staticmethod
+    async def _generate(llm, topic: str, platform: str) -> Any:
+        return await llm.generate_json(
+            prompt=HASHTAG_PROMPT.format(
+                platform=platform,
+                topic=topic,
+            ),
+            system_prompt=HASHTAG_SYSTEM,
+            temperature=0.7,
+        )
+
+    @staticmethod
+    def _sections(result: Any, platforms: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Usable per-platform sections of a multi-platform reply. A flat
+        single-platform reply ({"niche_hashtags": ...}) applies to every
+        platform; missing or malformed sections are left out.
+        """
+        if not isinstance(result, dict):
+            return {}
+        if _has_hashtags(result):
+            return {platform: result for platform in platforms}
+        if isinstance(result.get("platforms"), dict):
+            result = result["platforms"]
+        result = {str(k).lower(): v for k, v in result.items()}
+        return {
+            platform: result[platform]
+            for platform in platforms if _has_hashtags(result.get(platform))
+        }
+
+    @staticmethod
+    def _hashtags(platform: str, result: Any) -> Dict[str, List[str]]:
+        if not isinstance(result, dict):
+            result = {}
+        niche, broad = validate_hashtags(
+            platform,
+            result.get("niche_hashtags", []),
+            result.get("broad_hashtags", []),
+        )
+        return {"niche_hashtags": niche, "broad_hashtags": broad}
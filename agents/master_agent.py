@@ -4,21 +4,34 @@ Conversational AI controller that lets non-technical users manage the entire
 system through natural-language chat (text or voice) in any language.
 
 The Master Agent classifies user intent via LLM, executes the matching system
-action through the ActionExecutor, and responds conversationally.
+action through the ActionExecutor, and responds conversationally. Unambiguous
+commands ("list my content", "system status") are matched by a rule-based
+grammar first and skip the LLM entirely.
 
 Identity:  ClawtBot — Built by Abhishek Singh (Avii)
 Fallback:  Primary LLM → Secondary LLM → Default offline response
 Memory:    Tracks per-user interaction patterns for personalization
+           (bounded LRU, write-behind to Redis, warm-load from chat history)
 """
 
+import asyncio
 import json
 import logging
 import re
-from collections import Counter, defaultdict
+import time
+from collections import Counter, OrderedDict
 from datetime import datetime
-from typing import Any, Dict, List, Optional
-
-from brain.llm_router import get_llm
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from brain.llm_router import get_llm, llm_router
+from brain.user_memory_store import (
+    UserMemoryBackend,
+    apply_delta,
+    empty_memory,
+    get_backend as get_memory_backend,
+    load_from_chat_history,
+)
+from config import settings as app_settings
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +45,19 @@ def _current_date() -> str:
     return datetime.now().strftime("%d %B %Y, %I:%M %p")
 
 
+def prompt_history_limit() -> int:
+    """
+    Most conversation messages sent to the LLM verbatim: the history window
+    plus, with summaries on, the messages that have scrolled out of it but
+    are not folded into the summary yet (fewer than
+    `settings.chat_summary_min_messages` while the summary keeps up).
+    """
+    limit = app_settings.chat_history_window
+    if app_settings.chat_summary_enabled:
+        limit += max(0, app_settings.chat_summary_min_messages - 1)
+    return max(1, limit)
+
+
 DEFAULT_INTRO_MESSAGE = (
     "I am **ClawtBot**, an AI automation system built by **Abhishek Singh (Avii)**.\n\n"
     f"As of {_current_date()}, I am actively running with multi-agent orchestration "
@@ -65,29 +91,96 @@ IDENTITY_PATTERNS = [
 # ═════════════════════════════════════════════════════════════════════════════
 
 
+class _MemoryEntry:
+    __slots__ = ("mem", "accessed", "loaded")
+
+    def __init__(self, mem: Dict[str, Any], loaded: float):
+        self.mem = mem
+        self.accessed = time.monotonic()
+        self.loaded = loaded
+
+
 class UserMemory:
     """
-    In-memory tracker for per-user interaction patterns.
+    Tracker for per-user interaction patterns.
     Stores intent frequency, preferred language, and interaction history
     to personalize responses over time.
 
-    NOTE: This is a lightweight in-process cache. For persistence across
-    restarts, the ChatMessage table serves as the durable store and can
-    be loaded on demand.
+    The in-process copy is an LRU bounded by `settings.user_memory_max_users`
+    and an idle TTL, in front of a durable backend (a Redis hash per user,
+    shared by every worker). `record_interaction` updates the local copy at
+    once and queues a delta; deltas are written in batches (write-behind).
+    Users the backend does not know are warm-loaded from chat_messages.
     """
 
-    def __init__(self):
-        # user_id → { intent_counts, topics, last_language, message_count, ... }
-        self._store: Dict[str, Dict[str, Any]] = defaultdict(lambda: {
-            "intent_counts": Counter(),
-            "topics": [],
-            "last_language": "en",
-            "message_count": 0,
-            "first_seen": None,
-            "last_seen": None,
-            "preferred_platform": None,
-            "preferred_tone": None,
-        })
+    def __init__(self, backend: Optional[UserMemoryBackend] = None):
+        self.backend = backend if backend is not None else get_memory_backend()
+        # user_id → entry, least recently used first
+        self._store: "OrderedDict[str, _MemoryEntry]" = OrderedDict()
+        # user_id → accumulated delta not yet written to the backend
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flusher: Optional[asyncio.Task] = None
+        # Metrics
+        self.backend_loads = 0
+        self.warm_loads = 0
+        self.evictions = 0
+        self.flushes = 0
+
+    # ── Local LRU ───────────────────────────────────────────────────────
+
+    def _get(self, user_id: str) -> Optional[_MemoryEntry]:
+        entry = self._store.get(user_id)
+        if entry is not None:
+            entry.accessed = time.monotonic()
+            self._store.move_to_end(user_id)
+        return entry
+
+    def _put(self, user_id: str, mem: Dict[str, Any], loaded: float) -> _MemoryEntry:
+        self._store.pop(user_id, None)
+        self._evict()
+        entry = self._store[user_id] = _MemoryEntry(mem, loaded)
+        return entry
+
+    def _evict(self):
+        """Drop idle users, then least recently used ones, to make room for one more."""
+        horizon = time.monotonic() - app_settings.user_memory_idle_ttl
+        while self._store:
+            user_id, entry = next(iter(self._store.items()))
+            if entry.accessed >= horizon and len(self._store) < app_settings.user_memory_max_users:
+                break
+            del self._store[user_id]
+            self.evictions += 1
+
+    async def ensure_loaded(self, user_id: str):
+        """
+        Make sure the local copy is present and fresh (re-read after
+        `settings.user_memory_refresh_seconds` to see other workers' updates).
+        Only a local miss warm-loads from chat_messages; a loaded copy is
+        kept when the backend has nothing (disabled, or Redis backing off).
+        """
+        entry = self._get(user_id)
+        if entry is not None and time.monotonic() - entry.loaded < app_settings.user_memory_refresh_seconds:
+            return
+        if user_id in self._pending:
+            await self.flush([user_id])  # the re-read must include our own updates
+            if user_id in self._pending:
+                return  # not stored: the local copy is ahead, retry next turn
+        loaded = entry is not None and entry.loaded > 0
+
+        mem = await self.backend.load(user_id)
+        if mem is not None:
+            self.backend_loads += 1
+        elif not loaded:
+            mem = await load_from_chat_history(user_id)
+            if mem is not None:
+                self.warm_loads += 1
+                await self.backend.save(user_id, mem)
+        if mem is None:
+            mem = entry.mem if entry is not None else empty_memory()
+        self._put(user_id, mem, time.monotonic())
+
+    # ── Recording / Reading ─────────────────────────────────────────────
 
     def record_interaction(
         self,
@@ -97,32 +190,40 @@ class UserMemory:
         params: Optional[dict] = None,
     ):
         """Record an interaction for pattern tracking."""
-        mem = self._store[user_id]
         now = datetime.utcnow()
+        delta = empty_memory()
+        delta["intent_counts"][intent] += 1
+        delta["message_count"] = 1
+        delta["first_seen"] = now
+        delta["last_seen"] = now
 
-        mem["intent_counts"][intent] += 1
-        mem["message_count"] += 1
-        mem["last_seen"] = now
-
-        if mem["first_seen"] is None:
-            mem["first_seen"] = now
-
-        # Track topics from workflows
-        if params and "topic" in params:
-            mem["topics"].append(params["topic"])
-            # Keep last 50 topics
-            mem["topics"] = mem["topics"][-50:]
-
-        # Track platform/tone preferences
         if params:
+            # Track topics from workflows
+            if "topic" in params:
+                delta["topics"].append(params["topic"])
+            # Track platform/tone preferences
             if "platform" in params:
-                mem["preferred_platform"] = params["platform"]
+                delta["preferred_platform"] = params["platform"]
             if "tone" in params:
-                mem["preferred_tone"] = params["tone"]
+                delta["preferred_tone"] = params["tone"]
+
+        entry = self._get(user_id)
+        if entry is None:
+            # Not loaded yet (loaded=0 → the next ensure_loaded re-reads it)
+            entry = self._put(user_id, empty_memory(), 0.0)
+        apply_delta(entry.mem, delta)
+        apply_delta(self._pending.setdefault(user_id, empty_memory()), delta)
+
+        if len(self._pending) >= app_settings.user_memory_flush_batch:
+            self._schedule_flush()
+
+    def _memory(self, user_id: str) -> Dict[str, Any]:
+        entry = self._get(user_id)
+        return entry.mem if entry is not None else empty_memory()
 
     def get_context(self, user_id: str) -> str:
         """Get a brief context string about the user for the LLM."""
-        mem = self._store[user_id]
+        mem = self._memory(user_id)
         if mem["message_count"] == 0:
             return ""
 
@@ -149,7 +250,7 @@ class UserMemory:
 
     def get_stats(self, user_id: str) -> dict:
         """Return raw stats for a user (used by status/debug)."""
-        mem = self._store[user_id]
+        mem = self._memory(user_id)
         return {
             "message_count": mem["message_count"],
             "top_intents": dict(mem["intent_counts"].most_common(5)),
@@ -160,6 +261,72 @@ class UserMemory:
             "last_seen": mem["last_seen"].isoformat() if mem["last_seen"] else None,
         }
 
+    # ── Write-behind ────────────────────────────────────────────────────
+
+    async def flush(self, user_ids: Optional[List[str]] = None):
+        """
+        Write pending deltas (all, or just these users) to the backend. A
+        batch the backend could not store is re-queued ahead of newer deltas.
+        """
+        if user_ids is None:
+            batch, self._pending = self._pending, {}
+        else:
+            batch = {uid: self._pending.pop(uid) for uid in user_ids if uid in self._pending}
+        if not batch:
+            return
+        if not await self.backend.apply(batch):
+            for user_id, delta in batch.items():
+                newer = self._pending.get(user_id)
+                if newer is not None:
+                    apply_delta(delta, newer)
+                self._pending[user_id] = delta
+            return
+        self.flushes += 1
+
+    def _schedule_flush(self):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self.flush())
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(app_settings.user_memory_flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning(f"User memory flush failed: {e}")
+
+    def start_flusher(self):
+        """Start the periodic write-behind flusher on the running loop (API lifespan)."""
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    async def stop_flusher(self):
+        """Stop the flusher and write whatever is still pending."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.backend.name,
+            "cached_users": len(self._store),
+            "max_users": app_settings.user_memory_max_users,
+            "pending_users": len(self._pending),
+            "backend_loads": self.backend_loads,
+            "warm_loads": self.warm_loads,
+            "evictions": self.evictions,
+            "flushes": self.flushes,
+        }
+
 
 # Singleton
 user_memory = UserMemory()
@@ -259,6 +426,154 @@ User: "मुझे बताओ कि तुम क्या कर सकत
 {{{{user_memory_context}}}}
 """
 
+SUMMARY_SYSTEM_PROMPT = """You maintain a running summary of a chat between a user and ClawtBot.
+Merge the new messages into the previous summary. Keep facts that matter for
+later turns: what the user asked for, decisions made, content/provider names,
+IDs, and anything still pending. Drop greetings and filler.
+Reply with the summary only — plain text, at most 120 words, in the user's language."""
+
+
+# ═════════════════════════════════════════════════════════════════════════════
+# Intent Fast Path (rule-based, no LLM)
+# ═════════════════════════════════════════════════════════════════════════════
+
+# Whole-message grammar for unambiguous commands. Each pattern must match
+# the ENTIRE message (polite filler and trailing punctuation allowed), so
+# anything with extra content — a question, a topic, a second request —
+# falls through to the LLM. Named groups become intent params.
+_PLEASE = r"(?:(?:please|pls|can\s+you|could\s+you|kindly)\s+)?"
+_ME = r"(?:me\s+)?"
+_MY = r"(?:(?:my|the|all|all\s+my|our)\s+)?"
+_END = r"\s*(?:please|pls|plz)?\s*[.!?]*\s*$"
+_SHOW = r"(?:show|list|display|get|view|see)"
+_UUID = r"(?P<content_id>[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})"
+_STATUS = r"(?:(?P<status>draft|reviewed|approved|scheduled|published|failed)\s+)?"
+_PROVIDER = r"(?P<provider>ollama|openai|gemini|anthropic|groq)"
+
+FAST_INTENT_RULES: List[tuple] = [
+    # (intent, language, pattern)
+    ("list_content", "en", rf"^{_PLEASE}{_SHOW}\s+{_ME}{_MY}(?:latest\s+|recent\s+)?(?:(?P<limit>\d{{1,2}})\s+)?{_STATUS}(?:content|contents|posts)(?:\s+(?P<status_after>draft|reviewed|approved|scheduled|published|failed))?{_END}"),
+    ("list_content", "hi", rf"^(?:mera|mere|meri)\s+(?:content|posts?)\s+(?:dikhao|batao){_END}"),
+    ("list_providers", "en", rf"^{_PLEASE}{_SHOW}\s+{_ME}{_MY}(?:llm\s+|ai\s+|model\s+)?providers{_END}"),
+    ("list_providers", "en", rf"^(?:which|what)\s+(?:llm\s+|ai\s+)?providers\s+(?:are\s+)?(?:configured|available|set\s+up){_END}"),
+    ("list_agents", "en", rf"^{_PLEASE}{_SHOW}\s+{_ME}{_MY}(?:agents|agent\s+models|agent\s+configs?|agent\s+configurations){_END}"),
+    ("get_system_status", "en", rf"^{_PLEASE}(?:{_SHOW}\s+{_ME})?(?:the\s+)?(?:system\s+)?(?:status|health)(?:\s+check)?{_END}"),
+    ("get_system_status", "hi", rf"^(?:system\s+)?status\s+(?:dikhao|batao|kya\s+hai){_END}"),
+    ("get_settings", "en", rf"^{_PLEASE}{_SHOW}\s+{_ME}{_MY}(?:current\s+)?(?:settings|cron\s+settings|schedule\s+settings){_END}"),
+    ("approve_content", "en", rf"^{_PLEASE}approve\s+(?:content\s+|post\s+)?{_UUID}{_END}"),
+    ("approve_content", "hi", rf"^{_UUID}\s+(?:ko\s+)?approve\s+karo{_END}"),
+    ("test_provider", "en", rf"^{_PLEASE}(?:test|check)\s+(?:the\s+)?(?:provider\s+)?{_PROVIDER}(?:\s+(?:provider|connection|connectivity))?{_END}"),
+    ("help", "en", rf"^/?{_PLEASE}(?:help|commands|show\s+commands|what\s+commands\s+are\s+there){_END}"),
+    ("help", "hi", rf"^(?:madad|help)\s+(?:karo|chahiye){_END}"),
+]
+
+HELP_MESSAGES = {
+    "en": (
+        "Here's what I can do for you 🤖\n\n"
+        "• **Create content** — \"Create an Instagram post about AI trends\"\n"
+        "• **Manage content** — \"list my content\", \"approve <content id>\"\n"
+        "• **Content calendars** — upload a CSV or connect a Google Sheet\n"
+        "• **AI models** — \"show providers\", \"set my OpenAI key to …\", \"test groq\"\n"
+        "• **Agents** — \"list agents\", \"switch all agents to gemini\"\n"
+        "• **Schedules** — \"show settings\", \"run the scheduler at 10am\"\n"
+        "• **System** — \"system status\"\n\n"
+        "Just tell me what you need in plain language!"
+    ),
+    "hi": (
+        "मैं आपकी मदद कर सकता हूँ 🤖\n\n"
+        "• सोशल मीडिया पोस्ट बनाना\n"
+        "• कंटेंट देखना और approve करना\n"
+        "• AI मॉडल और API keys सेट करना\n"
+        "• शेड्यूल बदलना\n"
+        "• सिस्टम स्टेटस देखना\n\n"
+        "बस मुझसे बात करें!"
+    ),
+}
+
+FAST_RESPONSES = {
+    "en": {
+        "list_content": "Here's your latest content 📋",
+        "list_providers": "Here are your LLM providers 🧠",
+        "list_agents": "Here's how your agents are configured 🤖",
+        "get_system_status": "Here's the current system status 📊",
+        "get_settings": "Here are your current settings ⚙️",
+        "approve_content": "Content {content_id_short}… approved ✅",
+        "test_provider": "{provider} connection test finished 🔌",
+    },
+    "hi": {
+        "list_content": "यह रहा आपका हालिया कंटेंट 📋",
+        "get_system_status": "यह रहा सिस्टम का मौजूदा स्टेटस 📊",
+        "approve_content": "कंटेंट {content_id_short}… approve हो गया ✅",
+    },
+}
+
+
+class IntentClassifier:
+    """
+    Deterministic classifier for unambiguous chat commands.
+
+    Returns (intent, params, language) for a whole-message match of
+    FAST_INTENT_RULES, or None to let the LLM decide. Hit/miss counters
+    show how much traffic the grammar absorbs, so it can be grown.
+    """
+
+    def __init__(self, rules: List[tuple] = FAST_INTENT_RULES):
+        self._rules = [
+            (intent, lang, re.compile(pattern, re.IGNORECASE))
+            for intent, lang, pattern in rules
+        ]
+        self.hits: Counter = Counter()
+        self.misses = 0
+
+    def classify(self, message: str) -> Optional[tuple]:
+        text = " ".join(message.split())
+        for intent, lang, pattern in self._rules:
+            match = pattern.match(text)
+            if match:
+                self.hits[intent] += 1
+                return intent, self._params(match), lang
+        self.misses += 1
+        return None
+
+    @staticmethod
+    def _params(match: "re.Match") -> dict:
+        params = {}
+        groups = match.groupdict()
+        if groups.get("limit"):
+            params["limit"] = int(groups["limit"])
+        status = groups.get("status") or groups.get("status_after")
+        if status:
+            params["status"] = status.lower()
+        if groups.get("content_id"):
+            params["content_id"] = groups["content_id"].lower()
+        if groups.get("provider"):
+            params["provider"] = groups["provider"].lower()
+        return params
+
+    @staticmethod
+    def render(intent: str, params: dict, lang: str) -> str:
+        """Templated reply for a fast-path intent (before action data is appended)."""
+        if intent == "help":
+            return HELP_MESSAGES.get(lang, HELP_MESSAGES["en"])
+        template = FAST_RESPONSES.get(lang, {}).get(intent) or FAST_RESPONSES["en"][intent]
+        values = dict(params)
+        values["content_id_short"] = params.get("content_id", "")[:8]
+        return template.format(**values)
+
+    def stats(self) -> dict:
+        hits = sum(self.hits.values())
+        total = hits + self.misses
+        return {
+            "hits": hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / total, 3) if total else 0.0,
+            "by_intent": dict(self.hits),
+        }
+
+
+# Singleton
+intent_classifier = IntentClassifier()
+
 
 # ═════════════════════════════════════════════════════════════════════════════
 # Action Executor
@@ -346,30 +661,15 @@ class ActionExecutor:
 
     async def _handle_test_provider(self, params: dict) -> dict:
         provider = params.get("provider", "").lower()
-        from brain.llm_router import create_provider, PROVIDER_MODELS
+        from brain.llm_router import PROVIDER_MODELS
 
         if provider not in PROVIDER_MODELS:
             return {"success": False, "message": f"Unknown provider: {provider}"}
 
         try:
-            if provider == "ollama":
-                from config import settings
-                p = create_provider("ollama", settings.ollama_model)
-            else:
-                from db.database import async_session
-                from db.settings_models import LLMProviderConfig
-                from sqlalchemy import select
-                from utils.crypto import decrypt_value
-
-                async with async_session() as session:
-                    result = await session.execute(
-                        select(LLMProviderConfig).where(LLMProviderConfig.provider == provider)
-                    )
-                    cfg = result.scalar_one_or_none()
-                    if not cfg or not cfg.api_key_encrypted:
-                        return {"success": False, "message": f"No API key for {provider}"}
-                    api_key = decrypt_value(cfg.api_key_encrypted)
-                    p = create_provider(provider, PROVIDER_MODELS[provider][0], api_key=api_key)
+            p = await llm_router.provider_for(provider)
+            if p is None:
+                return {"success": False, "message": f"No API key for {provider}"}
 
             healthy = await p.health_check()
             return {"success": healthy, "message": f"{provider} {'connected' if healthy else 'unreachable'}"}
@@ -795,6 +1095,87 @@ class ActionExecutor:
             return {"success": False, "message": f"Processing failed: {str(e)}"}
 
 
+# ═════════════════════════════════════════════════════════════════════════════
+# Streaming helpers
+# ═════════════════════════════════════════════════════════════════════════════
+
+_JSON_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+class _ResponseTextExtractor:
+    """
+    Incrementally decodes the `"response"` string of a streamed JSON reply,
+    so users see the natural-language answer while the rest of the JSON
+    (intent, params) is still being generated.
+    """
+
+    _FIELD_START = re.compile(r'"response"\s*:\s*"')
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos: Optional[int] = None  # index just after the opening quote
+        self._done = False
+
+    def feed(self, chunk: str) -> str:
+        """Add a raw chunk; return newly decoded response text (may be empty)."""
+        if self._done:
+            return ""
+        self._buffer += chunk
+        if self._pos is None:
+            match = self._FIELD_START.search(self._buffer)
+            if not match:
+                return ""
+            self._pos = match.end()
+
+        buf = self._buffer
+        i = self._pos
+        out = []
+        while i < len(buf):
+            ch = buf[i]
+            if ch == '"':
+                self._done = True
+                i += 1
+                break
+            if ch != "\\":
+                out.append(ch)
+                i += 1
+                continue
+            # Escape sequence — wait for the rest of it if it is split across chunks
+            if i + 1 >= len(buf):
+                break
+            esc = buf[i + 1]
+            if esc != "u":
+                out.append(_JSON_ESCAPES.get(esc, esc))
+                i += 2
+                continue
+            if i + 6 > len(buf):
+                break
+            try:
+                code = int(buf[i + 2:i + 6], 16)
+            except ValueError:
+                i += 6
+                continue
+            if 0xD800 <= code < 0xDC00:
+                # High surrogate: combine with the following \uDCxx (emoji etc.)
+                if i + 12 > len(buf):
+                    break
+                try:
+                    low = int(buf[i + 8:i + 12], 16) if buf[i + 6:i + 8] == "\\u" else 0
+                except ValueError:
+                    low = 0
+                if 0xDC00 <= low < 0xE000:
+                    out.append(chr(0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)))
+                    i += 12
+                    continue
+                i += 6
+                continue
+            out.append(chr(code))
+            i += 6
+
+        self._pos = i
+        return "".join(out)
+
+
 # ═════════════════════════════════════════════════════════════════════════════
 # Master Agent — with Fallback + Memory
 # ═════════════════════════════════════════════════════════════════════════════
@@ -814,6 +1195,9 @@ class MasterAgent:
     # Provider priority for fallback (first = primary, rest = fallback chain)
     FALLBACK_PROVIDERS = ["ollama", "openai", "gemini", "anthropic", "groq"]
 
+    # Seconds to wait on one provider (or for its first streamed token)
+    PER_PROVIDER_TIMEOUT = 30.0
+
     def __init__(self):
         self.logger = logging.getLogger("clawtbot.master_agent")
 
@@ -835,7 +1219,47 @@ class MasterAgent:
 
     # ── LLM call with fallback chain ──────────────────────────────────
 
-    async def _call_llm_with_fallback(self, prompt: str, system_prompt: str) -> str:
+    async def _get_primary_llm(self):
+        """Master agent's configured provider, with a fresh config snapshot."""
+        try:
+            await llm_router.refresh_agent_configs()
+        except Exception as e:
+            self.logger.debug(f"Using cached LLM config snapshot: {e}")
+        return get_llm("master_agent")
+
+    async def _fallback_provider(self, provider_name: str, model: str):
+        """Reusable fallback provider from the router's registry (None if it has no key)."""
+        return await llm_router.provider_for(provider_name, model)
+
+    def _fallback_models(self):
+        """(provider, model) pairs of the fallback chain, in order."""
+        from brain.llm_router import PROVIDER_MODELS
+
+        for provider_name in self.FALLBACK_PROVIDERS:
+            if provider_name == "ollama":
+                yield provider_name, app_settings.ollama_model
+            else:
+                yield provider_name, PROVIDER_MODELS[provider_name][0]
+
+    def _generate_reply(self, llm, prompt: str, system_prompt: str):
+        """The Master Agent's completion call against one provider, with its timeout."""
+        return asyncio.wait_for(
+            llm.generate(
+                prompt=prompt,
+                system_prompt=system_prompt,
+                temperature=0.3,
+                max_tokens=768,
+                json_mode=True,
+            ),
+            timeout=self.PER_PROVIDER_TIMEOUT,
+        )
+
+    async def _call_llm_with_fallback(
+        self,
+        prompt: str,
+        system_prompt: str,
+        skip_primary: bool = False,
+    ) -> str:
         """
         Try the configured master_agent LLM first, then fall through the
         provider chain. If everything fails, return None to signal offline mode.
@@ -843,72 +1267,39 @@ class MasterAgent:
         Optimizations:
         - max_tokens=768 (Master Agent JSON responses are small)
         - 30s timeout per provider to fail fast
+        - providers whose circuit breaker is open are skipped instantly
+        - with `settings.llm_hedging_enabled`, slow providers are hedged
+          (see `_call_llm_hedged`)
         """
-        import asyncio
-
-        errors = []
-        PER_PROVIDER_TIMEOUT = 30.0  # seconds — fail fast, try next provider
+        from brain.circuit_breaker import llm_breakers
 
-        # 1) Try primary configured LLM
-        try:
-            llm = get_llm("master_agent")
-            result = await asyncio.wait_for(
-                llm.generate(
-                    prompt=prompt,
-                    system_prompt=system_prompt,
-                    temperature=0.3,
-                    max_tokens=768,
-                    json_mode=True,
-                ),
-                timeout=PER_PROVIDER_TIMEOUT,
-            )
-            return result
-        except asyncio.TimeoutError:
-            errors.append("primary: timeout")
-            self.logger.warning("Primary LLM timed out after 30s")
-        except Exception as e:
-            errors.append(f"primary: {e}")
-            self.logger.warning(f"Primary LLM failed: {e}")
+        if app_settings.llm_hedging_enabled:
+            return await self._call_llm_hedged(prompt, system_prompt, skip_primary)
 
-        # 2) Try each fallback provider
-        from brain.llm_router import create_provider, PROVIDER_MODELS
+        errors = []
 
-        for provider_name in self.FALLBACK_PROVIDERS:
+        # 1) Try primary configured LLM (skipped when the caller already tried it)
+        if not skip_primary:
             try:
-                if provider_name == "ollama":
-                    from config import settings as app_settings
-                    p = create_provider("ollama", app_settings.ollama_model)
-                else:
-                    # Check if we have an API key for this provider
-                    from db.database import async_session
-                    from db.settings_models import LLMProviderConfig
-                    from sqlalchemy import select
-                    from utils.crypto import decrypt_value
-
-                    async with async_session() as session:
-                        result = await session.execute(
-                            select(LLMProviderConfig).where(
-                                LLMProviderConfig.provider == provider_name
-                            )
-                        )
-                        cfg = result.scalar_one_or_none()
-                        if not cfg or not cfg.api_key_encrypted:
-                            continue
-                        api_key = decrypt_value(cfg.api_key_encrypted)
-                        p = create_provider(
-                            provider_name, PROVIDER_MODELS[provider_name][0], api_key=api_key
-                        )
+                llm = await self._get_primary_llm()
+                return await self._generate_reply(llm, prompt, system_prompt)
+            except asyncio.TimeoutError:
+                errors.append("primary: timeout")
+                self.logger.warning("Primary LLM timed out after 30s")
+            except Exception as e:
+                errors.append(f"primary: {e}")
+                self.logger.warning(f"Primary LLM failed: {e}")
 
-                result = await asyncio.wait_for(
-                    p.generate(
-                        prompt=prompt,
-                        system_prompt=system_prompt,
-                        temperature=0.3,
-                        max_tokens=768,
-                        json_mode=True,
-                    ),
-                    timeout=PER_PROVIDER_TIMEOUT,
-                )
+        # 2) Try each fallback provider (skipping those whose circuit is open)
+        for provider_name, model in self._fallback_models():
+            if not llm_breakers.is_available(provider_name, model):
+                errors.append(f"{provider_name}: circuit open")
+                continue
+            try:
+                p = await self._fallback_provider(provider_name, model)
+                if p is None:
+                    continue
+                result = await self._generate_reply(p, prompt, system_prompt)
                 self.logger.info(f"Fallback succeeded via {provider_name}")
                 return result
             except asyncio.TimeoutError:
@@ -924,6 +1315,127 @@ class MasterAgent:
         self.logger.error(f"All LLM providers failed: {errors}")
         return None
 
+    async def _call_llm_hedged(
+        self,
+        prompt: str,
+        system_prompt: str,
+        skip_primary: bool = False,
+    ) -> Optional[str]:
+        """
+        Hedged variant of the fallback chain.
+
+        Starts the primary, and whenever the newest in-flight call outlives
+        its provider's recent p95 latency (`llm_hedging.delay_for`), fires
+        the next healthy provider in parallel. A failed call immediately
+        starts the next one. The first reply that parses as intent JSON
+        wins and the other calls are cancelled. Hedges to paid providers
+        are capped per minute; when the budget is spent we just wait.
+        """
+        from brain.circuit_breaker import llm_breakers
+        from brain.llm_hedging import llm_hedging
+
+        candidates: List[tuple] = []  # (label, provider_name, model, build)
+        if not skip_primary:
+            candidates.append(("primary", None, None, self._get_primary_llm))
+        for provider_name, model in self._fallback_models():
+            candidates.append((
+                provider_name, provider_name, model,
+                lambda name=provider_name, m=model: self._fallback_provider(name, m),
+            ))
+
+        pending: Dict[asyncio.Task, tuple] = {}  # task → (label, provider)
+        errors: List[str] = []
+        invalid_reply: Optional[str] = None
+        next_index = 0
+        newest = None  # provider most recently started
+        started = set()  # (provider, model) already called this turn
+        hedged = False
+
+        async def start_next(hedge: bool) -> bool:
+            nonlocal next_index, newest, hedged
+            while next_index < len(candidates):
+                label, provider_name, model, build = candidates[next_index]
+                if (provider_name, model) in started:
+                    next_index += 1
+                    continue
+                if provider_name and not llm_breakers.is_available(provider_name, model):
+                    errors.append(f"{label}: circuit open")
+                    next_index += 1
+                    continue
+                try:
+                    llm = await build()
+                except Exception as e:
+                    errors.append(f"{label}: {e}")
+                    next_index += 1
+                    continue
+                if llm is None:
+                    next_index += 1
+                    continue
+                # Charge the budget only for calls actually made
+                if hedge and not llm_hedging.try_hedge(llm.provider_name):
+                    return False  # over budget — keep the candidate for a sequential try
+                next_index += 1
+                task = asyncio.ensure_future(self._generate_reply(llm, prompt, system_prompt))
+                pending[task] = (label, llm)
+                started.add((llm.provider_name, llm.model))
+                newest = llm
+                hedged = hedged or hedge
+                return True
+            return False
+
+        can_hedge = True
+        await start_next(hedge=False)
+        try:
+            while pending:
+                timeout = None
+                if can_hedge and next_index < len(candidates) and newest is not None:
+                    timeout = llm_hedging.delay_for(newest.provider_name, newest.model)
+                done, _ = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED,
+                )
+
+                if not done:
+                    if not await start_next(hedge=True):
+                        can_hedge = False
+                    continue
+
+                failed = 0
+                for task in done:
+                    label, llm = pending.pop(task)
+                    try:
+                        raw = task.result()
+                    except asyncio.TimeoutError:
+                        errors.append(f"{label}: timeout")
+                        failed += 1
+                        continue
+                    except Exception as e:
+                        errors.append(f"{label}: {e}")
+                        failed += 1
+                        continue
+                    if isinstance(self._extract_json(raw), dict):
+                        llm_hedging.record_win(llm.provider_name, hedged=hedged)
+                        self.logger.info(
+                            f"LLM reply from {label} ({llm.provider_name})"
+                            + (" — won hedge" if hedged else "")
+                        )
+                        return raw
+                    errors.append(f"{label}: invalid JSON")
+                    invalid_reply = invalid_reply or raw
+                    failed += 1
+
+                # Each failed call is replaced, even while others are in flight
+                for _ in range(failed):
+                    if not await start_next(hedge=False):
+                        break
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if invalid_reply is not None:
+            return invalid_reply
+        self.logger.error(f"All LLM providers failed: {errors}")
+        return None
+
     # ── Main chat method ──────────────────────────────────────────────
 
     # Intents that are allowed for unauthenticated (guest) users
@@ -935,12 +1447,13 @@ class MasterAgent:
         user_id: str,
         conversation_history: Optional[List[Dict[str, str]]] = None,
         is_authenticated: bool = True,
+        conversation_summary: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Process a user message through the Master Agent.
 
         Flow:
-        1. Quick check: is this an identity question? → respond offline
+        1. Fast path: unambiguous command (intent grammar) → skip the LLM
         2. Build context from memory + history
         3. Call LLM with fallback chain
         4. If total LLM failure → respond with default intro
@@ -956,10 +1469,112 @@ class MasterAgent:
         # are natural and varied each time, while the system prompt ensures
         # core facts (ClawtBot, built by Abhishek Singh/Avii) stay constant.
 
+        await user_memory.ensure_loaded(user_id)
+
+        # ── Step 1: Rule-based fast path for unambiguous commands ────
+        fast = await self._fast_path(message, user_id, is_authenticated)
+        if fast is not None:
+            return fast
+
         # ── Step 2: Build context ────────────────────────────────────
+        full_prompt, system_prompt = self._build_prompts(
+            message, user_id, conversation_history, conversation_summary,
+        )
+
+        # ── Step 3: Call LLM with fallback ───────────────────────────
+        raw = await self._call_llm_with_fallback(full_prompt, system_prompt)
+
+        if raw is None:
+            return self._offline_response(message, user_id)
+
+        return await self._complete(raw, message, user_id, is_authenticated)
+
+    async def chat_stream(
+        self,
+        message: str,
+        user_id: str,
+        conversation_history: Optional[List[Dict[str, str]]] = None,
+        is_authenticated: bool = True,
+        conversation_summary: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of `chat()`.
+
+        Yields `{"type": "token", "text": ...}` events with the user-facing
+        `response` text as the primary LLM produces it, then exactly one
+        `{"type": "result", "result": {...}}` event carrying the same dict
+        `chat()` returns. The final `result["response"]` is authoritative —
+        it may append action data or replace the streamed text (auth gate,
+        fallback provider, offline reply).
+        """
+        self.logger.info(f"Master Agent streaming: {message[:100]}...")
+
+        await user_memory.ensure_loaded(user_id)
+
+        fast = await self._fast_path(message, user_id, is_authenticated)
+        if fast is not None:
+            yield {"type": "token", "text": fast["response"]}
+            yield {"type": "result", "result": fast}
+            return
+
+        full_prompt, system_prompt = self._build_prompts(
+            message, user_id, conversation_history, conversation_summary,
+        )
+
+        raw = None
+        chunks: List[str] = []
+        extractor = _ResponseTextExtractor()
+        try:
+            llm = await self._get_primary_llm()
+            tokens = llm.stream(
+                prompt=full_prompt,
+                system_prompt=system_prompt,
+                temperature=0.3,
+                max_tokens=768,
+                json_mode=True,
+            ).__aiter__()
+            # Fail fast on a stalled provider: bound the time to first token
+            first = await asyncio.wait_for(tokens.__anext__(), timeout=self.PER_PROVIDER_TIMEOUT)
+            chunks.append(first)
+            text = extractor.feed(first)
+            if text:
+                yield {"type": "token", "text": text}
+            async for token in tokens:
+                chunks.append(token)
+                text = extractor.feed(token)
+                if text:
+                    yield {"type": "token", "text": text}
+            raw = "".join(chunks)
+        except StopAsyncIteration:
+            self.logger.warning("Primary LLM stream ended without output")
+        except asyncio.TimeoutError:
+            self.logger.warning("Primary LLM stream produced no token within the timeout")
+        except Exception as e:
+            self.logger.warning(f"Primary LLM stream failed: {e}")
+
+        if raw is None:
+            raw = await self._call_llm_with_fallback(full_prompt, system_prompt, skip_primary=True)
+
+        if raw is None:
+            result = self._offline_response(message, user_id)
+        else:
+            result = await self._complete(raw, message, user_id, is_authenticated)
+
+        yield {"type": "result", "result": result}
+
+    def _build_prompts(
+        self,
+        message: str,
+        user_id: str,
+        conversation_history: Optional[List[Dict[str, str]]],
+        conversation_summary: Optional[str] = None,
+    ) -> tuple:
+        """Build the (prompt, system_prompt) pair for the intent-classification call."""
         context = ""
+        if conversation_summary:
+            context += f"(Earlier in this conversation: {conversation_summary})\n"
         if conversation_history:
-            recent = conversation_history[-6:]  # Last 3 exchanges
+            recent = conversation_history[-prompt_history_limit():]
             for msg in recent:
                 role = "User" if msg["role"] == "user" else "Assistant"
                 context += f"{role}: {msg['content']}\n"
@@ -1003,34 +1618,93 @@ CURRENT USER MESSAGE:
 Analyze the user's message. Determine the intent and extract parameters.
 Respond ONLY with valid JSON matching the schema from your instructions."""
 
-        # ── Step 3: Call LLM with fallback ───────────────────────────
-        raw = await self._call_llm_with_fallback(full_prompt, system_prompt)
-
-        if raw is None:
-            # ── Step 4: Total failure → use intro for identity, error for rest
-            self.logger.warning("All LLMs failed — returning offline response")
-            user_memory.record_interaction(user_id, "general_chat", message)
+        return full_prompt, system_prompt
 
-            # Identity questions can still be answered offline
-            if self._is_identity_question(message):
-                return self._build_intro_response()
+    async def summarize_history(
+        self,
+        previous_summary: Optional[str],
+        messages: List[Dict[str, str]],
+    ) -> Optional[str]:
+        """
+        Fold older messages into a conversation's rolling summary.
 
-            return {
-                "intent": "general_chat",
-                "response": (
-                    "⚠️ I'm having trouble connecting to my AI brain right now. "
-                    "All language model providers are currently unreachable.\n\n"
-                    "**Quick fixes:**\n"
-                    "• Make sure **Ollama** is running: `ollama serve`\n"
-                    "• Verify the model is installed: `ollama list`\n"
-                    "• Or add a cloud API key (OpenAI/Gemini/etc.) in Settings\n\n"
-                    "I'll keep trying — please send your message again in a moment! 🔄"
+        Only the new messages and the previous summary are sent, so the cost
+        per call stays flat however long the conversation gets. Returns None
+        if the LLM is unavailable (the caller keeps the old summary).
+        """
+        lines = "\n".join(
+            f"{'User' if m['role'] == 'user' else 'Assistant'}: {m['content'][:500]}"
+            for m in messages
+        )
+        prompt = (
+            f"PREVIOUS SUMMARY:\n{previous_summary or '(none)'}\n\n"
+            f"NEW MESSAGES:\n{lines}\n\n"
+            "Write the updated summary."
+        )
+        try:
+            llm = await self._get_primary_llm()
+            summary = await asyncio.wait_for(
+                llm.generate(
+                    prompt=prompt,
+                    system_prompt=SUMMARY_SYSTEM_PROMPT,
+                    temperature=0.2,
+                    max_tokens=256,
                 ),
-                "action_success": False,
-                "action_data": None,
-            }
+                timeout=self.PER_PROVIDER_TIMEOUT,
+            )
+        except Exception as e:
+            self.logger.warning(f"Conversation summary failed: {e}")
+            return None
+        summary = (summary or "").strip()
+        return summary[:app_settings.chat_summary_max_chars] or None
+
+    def _offline_response(self, message: str, user_id: str) -> Dict[str, Any]:
+        """Step 4: total LLM failure → intro for identity questions, help text otherwise."""
+        self.logger.warning("All LLMs failed — returning offline response")
+        user_memory.record_interaction(user_id, "general_chat", message)
+
+        # Identity questions can still be answered offline
+        if self._is_identity_question(message):
+            return self._build_intro_response()
 
-        # Parse the LLM response
+        return {
+            "intent": "general_chat",
+            "response": (
+                "⚠️ I'm having trouble connecting to my AI brain right now. "
+                "All language model providers are currently unreachable.\n\n"
+                "**Quick fixes:**\n"
+                "• Make sure **Ollama** is running: `ollama serve`\n"
+                "• Verify the model is installed: `ollama list`\n"
+                "• Or add a cloud API key (OpenAI/Gemini/etc.) in Settings\n\n"
+                "I'll keep trying — please send your message again in a moment! 🔄"
+            ),
+            "action_success": False,
+            "action_data": None,
+        }
+
+    async def _fast_path(
+        self,
+        message: str,
+        user_id: str,
+        is_authenticated: bool,
+    ) -> Optional[Dict[str, Any]]:
+        """Step 1: answer a rule-matched command without the LLM, or None to fall through."""
+        match = intent_classifier.classify(message)
+        if match is None:
+            return None
+        intent, params, lang = match
+        self.logger.info(f"Fast-path intent: {intent}, params: {list(params.keys())}")
+        response = intent_classifier.render(intent, params, lang)
+        return await self._act(intent, params, response, message, user_id, is_authenticated, templated=True)
+
+    async def _complete(
+        self,
+        raw: str,
+        message: str,
+        user_id: str,
+        is_authenticated: bool,
+    ) -> Dict[str, Any]:
+        """Steps 5–8: parse the LLM reply, gate, execute the action, record memory."""
         parsed = self._parse_response(raw)
 
         intent = parsed.get("intent", "general_chat")
@@ -1039,6 +1713,24 @@ Respond ONLY with valid JSON matching the schema from your instructions."""
 
         self.logger.info(f"Classified intent: {intent}, params: {list(params.keys())}")
 
+        return await self._act(intent, params, llm_response, message, user_id, is_authenticated)
+
+    async def _act(
+        self,
+        intent: str,
+        params: dict,
+        llm_response: str,
+        message: str,
+        user_id: str,
+        is_authenticated: bool,
+        templated: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Gate, execute and record one classified intent.
+
+        `templated` marks a fast-path reply written before the action ran;
+        if the action fails, its error message replaces the optimistic text.
+        """
         # ── Step 5: Auth gate for guest users ────────────────────────
         if not is_authenticated and intent not in self.GUEST_ALLOWED_INTENTS:
             self.logger.info(f"Guest user attempted action intent '{intent}' — asking to login")
@@ -1059,6 +1751,9 @@ Respond ONLY with valid JSON matching the schema from your instructions."""
         executor = ActionExecutor(user_id=user_id)
         action_result = await executor.execute(intent, params)
 
+        if templated and not action_result.get("success", True):
+            llm_response = f"⚠️ {action_result.get('message', 'That did not work.')}"
+
         # For intents that provide data, enrich the response
         if action_result.get("data") and intent not in ("help", "general_chat", "introduce"):
             enriched = llm_response
@@ -1089,6 +1784,22 @@ Respond ONLY with valid JSON matching the schema from your instructions."""
 
     def _parse_response(self, raw: str) -> dict:
         """Parse LLM response JSON, with fallback extraction."""
+        parsed = self._extract_json(raw)
+        if parsed is not None:
+            return parsed
+
+        # Fallback: treat as general chat
+        return {
+            "intent": "general_chat",
+            "params": {},
+            "response": raw.strip(),
+        }
+
+    def _extract_json(self, raw: str) -> Optional[dict]:
+        """Extract the JSON object from an LLM reply, or None if there is none."""
+        if not raw:
+            return None
+
         # Try direct parse
         try:
             return json.loads(raw)
@@ -1111,9 +1822,4 @@ Respond ONLY with valid JSON matching the schema from your instructions."""
             except json.JSONDecodeError:
                 pass
 
-        # Fallback: treat as general chat
-        return {
-            "intent": "general_chat",
-            "params": {},
-            "response": raw.strip(),
-        }
+        return None
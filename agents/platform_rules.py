@@ -0,0 +1,117 @@
+"""
+ClawtBot — Platform Rules
+Per-platform publishing constraints, enforced locally on generated content
+so a multi-platform LLM response never has to be regenerated just because
+one platform's text came back too long.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+# max_chars: whole published text (post text + hashtags); None = no limit
+# max_hashtags: hashtags kept per post
+PLATFORM_RULES: Dict[str, Dict[str, Optional[int]]] = {
+    "instagram": {"max_chars": 2200, "max_hashtags": 30},
+    "twitter": {"max_chars": 280, "max_hashtags": 5},
+    "facebook": {"max_chars": 63206, "max_hashtags": 10},
+    "linkedin": {"max_chars": 3000, "max_hashtags": 5},
+    "youtube": {"max_chars": 5000, "max_hashtags": 15},
+    "reddit": {"max_chars": 40000, "max_hashtags": 0},
+    "medium": {"max_chars": None, "max_hashtags": 5},
+    "blogger": {"max_chars": None, "max_hashtags": 20},
+    "gmail": {"max_chars": None, "max_hashtags": 0},
+}
+
+DEFAULT_RULES: Dict[str, Optional[int]] = {"max_chars": None, "max_hashtags": 30}
+
+ELLIPSIS = "…"
+
+
+def rules_for(platform: str) -> Dict[str, Optional[int]]:
+    return PLATFORM_RULES.get((platform or "").lower(), DEFAULT_RULES)
+
+
+def fit_text(text: str, max_chars: Optional[int]) -> str:
+    """Shorten text to max_chars, preferring a word boundary."""
+    if not text or max_chars is None or len(text) <= max_chars:
+        return text
+    if max_chars <= len(ELLIPSIS):
+        return text[:max_chars]
+    cut = text[:max_chars - len(ELLIPSIS)]
+    space = cut.rfind(" ")
+    if space >= len(cut) * 0.8:
+        cut = cut[:space]
+    return cut.rstrip() + ELLIPSIS
+
+
+def validate_content(platform: str, content: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Enforce the platform's length limit on generated post fields.
+    Returns (content, issues); over-long fields are shortened in the copy.
+    """
+    max_chars = rules_for(platform)["max_chars"]
+    content = dict(content)
+    issues = []
+    for field in ("post_text", "caption"):
+        value = content.get(field) or ""
+        if max_chars is not None and len(value) > max_chars:
+            content[field] = fit_text(value, max_chars)
+            issues.append(f"{field} was {len(value)} chars; {platform} allows {max_chars}")
+    return content, issues
+
+
+def clean_hashtags(tags: Any) -> List[str]:
+    """Normalize to unique '#tag' strings, preserving order."""
+    if isinstance(tags, str):
+        tags = tags.replace(",", " ").split()
+    cleaned, seen = [], set()
+    for tag in tags or []:
+        tag = str(tag).strip().replace(" ", "")
+        if not tag:
+            continue
+        if not tag.startswith("#"):
+            tag = "#" + tag
+        if tag.lower() not in seen:
+            seen.add(tag.lower())
+            cleaned.append(tag)
+    return cleaned
+
+
+def validate_hashtags(platform: str, niche: Any, broad: Any) -> Tuple[List[str], List[str]]:
+    """Clean both lists and cap their combined size at the platform limit (niche first)."""
+    niche = clean_hashtags(niche)
+    seen = {tag.lower() for tag in niche}
+    broad = [tag for tag in clean_hashtags(broad) if tag.lower() not in seen]
+    limit = rules_for(platform)["max_hashtags"]
+    if limit is not None and len(niche) + len(broad) > limit:
+        keep_niche = min(len(niche), (limit + 1) // 2 if broad else limit)
+        keep_broad = min(len(broad), limit - keep_niche)
+        keep_niche = min(len(niche), limit - keep_broad)
+        niche, broad = niche[:keep_niche], broad[:keep_broad]
+    return niche, broad
+
+
+def fit_post(
+    platform: str,
+    post_text: str,
+    niche: List[str],
+    broad: List[str],
+) -> Tuple[str, List[str], List[str]]:
+    """
+    Make post text + hashtags (as the publisher joins them) fit the platform's
+    character limit: broad hashtags are dropped first, then niche ones, and
+    only then is the text shortened.
+    """
+    max_chars = rules_for(platform)["max_chars"]
+    if max_chars is None:
+        return post_text, niche, broad
+    niche, broad = list(niche), list(broad)
+
+    def length() -> int:
+        tags = " ".join(niche + broad)
+        return len(post_text) + (len(tags) + 2 if tags else 0)
+
+    while length() > max_chars and (broad or niche):
+        (broad or niche).pop()
+    if length() > max_chars:
+        post_text = fit_text(post_text, max_chars)
+    return post_text, niche, broad
@@ -5,7 +5,7 @@ Reviews content for grammar, compliance, and engagement quality.
 
 from typing import Any, Dict
 from agents.base_agent import BaseAgent
-from brain.llm_router import get_llm
+from brain.llm_router import resolve_llm
 from brain.prompts import REVIEW_SYSTEM, REVIEW_PROMPT
 
 
@@ -44,7 +44,8 @@ class ReviewAgent(BaseAgent):
         )
 
         try:
-            result = await get_llm("review_agent").generate_json(
+            llm = await resolve_llm("review_agent")
+            result = await llm.generate_json(
                 prompt=prompt,
                 system_prompt=REVIEW_SYSTEM,
                 temperature=0.3,  # Lower temp for more consistent scoring
@@ -0,0 +1,24 @@
+"""add_calendar_entry_claimed_at
+
+Revision ID: a8c4e6f2b0d5
+Revises: f7b3d5e9a1c4
+Create Date: 2026-10-16 16:41:09.214873
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8c4e6f2b0d5'
+down_revision: Union[str, None] = 'f7b3d5e9a1c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('calendar_entries', sa.Column('claimed_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('calendar_entries', 'claimed_at')
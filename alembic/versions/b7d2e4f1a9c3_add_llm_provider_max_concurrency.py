@@ -0,0 +1,24 @@
+"""add_llm_provider_max_concurrency
+
+Revision ID: b7d2e4f1a9c3
+Revises: 986f24928b1a
+Create Date: 2026-10-16 10:12:44.118532
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2e4f1a9c3'
+down_revision: Union[str, None] = '986f24928b1a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('llm_provider_configs', sa.Column('max_concurrency', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('llm_provider_configs', 'max_concurrency')
@@ -0,0 +1,39 @@
+"""add_chat_history_index_and_summaries
+
+Revision ID: c4e8a2d6f1b5
+Revises: b7d2e4f1a9c3
+Create Date: 2026-10-16 11:02:17.640215
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8a2d6f1b5'
+down_revision: Union[str, None] = 'b7d2e4f1a9c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_chat_messages_conversation_created', 'chat_messages',
+        ['conversation_id', 'created_at'], unique=False,
+    )
+    op.create_table('chat_conversation_summaries',
+    sa.Column('conversation_id', sa.String(length=50), nullable=False),
+    sa.Column('user_id', sa.String(length=50), nullable=False),
+    sa.Column('summary', sa.Text(), nullable=False),
+    sa.Column('summarized_until', sa.DateTime(), nullable=True),
+    sa.Column('message_count', sa.Integer(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('conversation_id')
+    )
+    op.create_index(op.f('ix_chat_conversation_summaries_user_id'), 'chat_conversation_summaries', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_chat_conversation_summaries_user_id'), table_name='chat_conversation_summaries')
+    op.drop_table('chat_conversation_summaries')
+    op.drop_index('ix_chat_messages_conversation_created', table_name='chat_messages')
@@ -0,0 +1,32 @@
+"""add_calendar_upload_processing_progress
+
+Revision ID: d5f1b3a7c9e2
+Revises: c4e8a2d6f1b5
+Create Date: 2026-10-16 12:26:41.305117
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5f1b3a7c9e2'
+down_revision: Union[str, None] = 'c4e8a2d6f1b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('calendar_uploads', sa.Column('processing_total', sa.Integer(), nullable=True))
+    op.add_column('calendar_uploads', sa.Column('processing_succeeded', sa.Integer(), nullable=True))
+    op.add_column('calendar_uploads', sa.Column('processing_failed', sa.Integer(), nullable=True))
+    op.add_column('calendar_uploads', sa.Column('processing_started_at', sa.DateTime(), nullable=True))
+    op.add_column('calendar_uploads', sa.Column('processing_completed_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('calendar_uploads', 'processing_completed_at')
+    op.drop_column('calendar_uploads', 'processing_started_at')
+    op.drop_column('calendar_uploads', 'processing_failed')
+    op.drop_column('calendar_uploads', 'processing_succeeded')
+    op.drop_column('calendar_uploads', 'processing_total')
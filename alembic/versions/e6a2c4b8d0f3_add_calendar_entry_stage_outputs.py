@@ -0,0 +1,24 @@
+"""add_calendar_entry_stage_outputs
+
+Revision ID: e6a2c4b8d0f3
+Revises: d5f1b3a7c9e2
+Create Date: 2026-10-16 13:08:55.472930
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6a2c4b8d0f3'
+down_revision: Union[str, None] = 'd5f1b3a7c9e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('calendar_entries', sa.Column('stage_outputs', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('calendar_entries', 'stage_outputs')
@@ -0,0 +1,40 @@
+"""add_calendar_sheet_sync
+
+Revision ID: f7b3d5e9a1c4
+Revises: e6a2c4b8d0f3
+Create Date: 2026-10-16 14:02:17.630418
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7b3d5e9a1c4'
+down_revision: Union[str, None] = 'e6a2c4b8d0f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('calendar_uploads', sa.Column('source_etag', sa.String(length=255), nullable=True))
+    op.add_column('calendar_uploads', sa.Column('source_last_modified', sa.String(length=64), nullable=True))
+    op.add_column('calendar_uploads', sa.Column('source_hash', sa.String(length=64), nullable=True))
+    op.add_column('calendar_uploads', sa.Column('last_synced_at', sa.DateTime(), nullable=True))
+    op.add_column('calendar_entries', sa.Column('row_key', sa.String(length=64), nullable=True))
+    op.add_column('calendar_entries', sa.Column('row_hash', sa.String(length=64), nullable=True))
+    op.create_index(
+        'ix_calendar_entries_upload_row_key',
+        'calendar_entries',
+        ['upload_id', 'row_key'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_calendar_entries_upload_row_key', table_name='calendar_entries')
+    op.drop_column('calendar_entries', 'row_hash')
+    op.drop_column('calendar_entries', 'row_key')
+    op.drop_column('calendar_uploads', 'last_synced_at')
+    op.drop_column('calendar_uploads', 'source_hash')
+    op.drop_column('calendar_uploads', 'source_last_modified')
+    op.drop_column('calendar_uploads', 'source_etag')
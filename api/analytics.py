@@ -2,18 +2,19 @@
 ClawtBot — Analytics API Routes
 """
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
-from typing import Optional, List
-from datetime import datetime, timedelta
+from typing import Literal, Optional, List
+from uuid import UUID
+from datetime import date, datetime, timedelta
 
-from sqlalchemy import select, desc, func
+from sqlalchemy import Date, cast, select, desc, func, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth.dependencies import get_current_user
 from auth.models import User
 from db.database import get_db
-from db.models import AnalyticsRecord
+from db.models import AnalyticsRecord, Platform
 
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
 
@@ -32,48 +33,162 @@ class AnalyticsResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class AnalyticsGroup(BaseModel):
+    day: Optional[date] = None
+    platform: Optional[str] = None
+    likes: int
+    comments: int
+    shares: int
+    reach: int
+    impressions: int
+    avg_engagement_rate: float
+    record_count: int
+
+
 class AnalyticsSummary(BaseModel):
     total_likes: int
     total_comments: int
     total_shares: int
     total_reach: int
     avg_engagement_rate: float
+    record_count: int = 0
+    groups: Optional[List[AnalyticsGroup]] = None
     records: List[AnalyticsResponse]
+    next_cursor: Optional[str] = None
 
 
+# ─── Report Builder ──────────────────────────────────────────────────────────
+
+def _metric_columns():
+    """Aggregates shared by the report totals and its groups."""
+    return (
+        func.coalesce(func.sum(AnalyticsRecord.likes), 0).label("likes"),
+        func.coalesce(func.sum(AnalyticsRecord.comments), 0).label("comments"),
+        func.coalesce(func.sum(AnalyticsRecord.shares), 0).label("shares"),
+        func.coalesce(func.sum(AnalyticsRecord.reach), 0).label("reach"),
+        func.coalesce(func.sum(AnalyticsRecord.impressions), 0).label("impressions"),
+        func.coalesce(func.avg(AnalyticsRecord.engagement_rate), 0.0).label("avg_engagement_rate"),
+        func.count().label("record_count"),
+    )
+
+
+def _parse_cursor(cursor: str):
+    """A `next_cursor` is "<fetched_at ISO>,<record id>" of the last record returned."""
+    try:
+        fetched_at, record_id = cursor.split(",", 1)
+        return datetime.fromisoformat(fetched_at), UUID(record_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def _build_report(
+    db: AsyncSession,
+    conditions: list,
+    include_records: bool,
+    limit: int,
+    cursor: Optional[str],
+    group_by: List[str],
+) -> AnalyticsSummary:
+    """
+    Totals (and optional day/platform groups) are aggregated in SQL; records
+    are read one keyset page at a time, newest first, on (fetched_at, id).
+    """
+    totals = (await db.execute(select(*_metric_columns()).where(*conditions))).one()
+
+    groups = None
+    if group_by:
+        keys = []
+        if "day" in group_by:
+            keys.append(cast(AnalyticsRecord.fetched_at, Date).label("day"))
+        if "platform" in group_by:
+            keys.append(AnalyticsRecord.platform.label("platform"))
+        result = await db.execute(
+            select(*keys, *_metric_columns()).where(*conditions).group_by(*keys).order_by(*keys)
+        )
+        groups = [
+            AnalyticsGroup(
+                day=row.day if "day" in group_by else None,
+                platform=row.platform.value if "platform" in group_by else None,
+                likes=row.likes,
+                comments=row.comments,
+                shares=row.shares,
+                reach=row.reach,
+                impressions=row.impressions,
+                avg_engagement_rate=round(row.avg_engagement_rate, 2),
+                record_count=row.record_count,
+            )
+            for row in result.all()
+        ]
+
+    records, next_cursor = [], None
+    if include_records:
+        query = select(
+            AnalyticsRecord.id,
+            AnalyticsRecord.content_id,
+            AnalyticsRecord.platform,
+            AnalyticsRecord.likes,
+            AnalyticsRecord.comments,
+            AnalyticsRecord.shares,
+            AnalyticsRecord.reach,
+            AnalyticsRecord.impressions,
+            AnalyticsRecord.engagement_rate,
+            AnalyticsRecord.fetched_at,
+        ).where(*conditions)
+        if cursor:
+            query = query.where(
+                tuple_(AnalyticsRecord.fetched_at, AnalyticsRecord.id) < tuple_(*_parse_cursor(cursor))
+            )
+        result = await db.execute(
+            query.order_by(desc(AnalyticsRecord.fetched_at), desc(AnalyticsRecord.id)).limit(limit + 1)
+        )
+        rows = result.all()
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = f"{rows[-1].fetched_at.isoformat()},{rows[-1].id}"
+        records = [
+            AnalyticsResponse(
+                content_id=str(row.content_id),
+                platform=row.platform.value,
+                likes=row.likes or 0,
+                comments=row.comments or 0,
+                shares=row.shares or 0,
+                reach=row.reach or 0,
+                impressions=row.impressions or 0,
+                engagement_rate=row.engagement_rate or 0.0,
+                fetched_at=row.fetched_at,
+            )
+            for row in rows
+        ]
+
+    return AnalyticsSummary(
+        total_likes=totals.likes,
+        total_comments=totals.comments,
+        total_shares=totals.shares,
+        total_reach=totals.reach,
+        avg_engagement_rate=round(totals.avg_engagement_rate, 2),
+        record_count=totals.record_count,
+        groups=groups,
+        records=records,
+        next_cursor=next_cursor,
+    )
+
+
+# ─── Routes ──────────────────────────────────────────────────────────────────
+
 @router.get("/report", response_model=AnalyticsSummary)
 async def get_analytics_report(
     days: int = Query(default=7, ge=1, le=90),
+    include_records: bool = Query(default=True),
+    limit: int = Query(default=100, ge=1, le=1000),
+    cursor: Optional[str] = Query(default=None, description="next_cursor of the previous page"),
+    group_by: List[Literal["day", "platform"]] = Query(default=[]),
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
     """Get an analytics summary report for the specified time period."""
     since = datetime.utcnow() - timedelta(days=days)
-
-    result = await db.execute(
-        select(AnalyticsRecord)
-        .where(AnalyticsRecord.fetched_at >= since)
-        .order_by(desc(AnalyticsRecord.fetched_at))
-    )
-    records = result.scalars().all()
-
-    total_likes = sum(r.likes for r in records)
-    total_comments = sum(r.comments for r in records)
-    total_shares = sum(r.shares for r in records)
-    total_reach = sum(r.reach for r in records)
-    avg_engagement = (
-        sum(r.engagement_rate for r in records) / len(records)
-        if records
-        else 0.0
-    )
-
-    return AnalyticsSummary(
-        total_likes=total_likes,
-        total_comments=total_comments,
-        total_shares=total_shares,
-        total_reach=total_reach,
-        avg_engagement_rate=round(avg_engagement, 2),
-        records=[AnalyticsResponse.model_validate(r) for r in records],
+    return await _build_report(
+        db, [AnalyticsRecord.fetched_at >= since], include_records, limit, cursor, group_by,
     )
 
 
@@ -81,37 +196,21 @@ async def get_analytics_report(
 async def get_platform_analytics(
     platform: str,
     days: int = Query(default=7, ge=1, le=90),
+    include_records: bool = Query(default=True),
+    limit: int = Query(default=100, ge=1, le=1000),
+    cursor: Optional[str] = Query(default=None, description="next_cursor of the previous page"),
+    group_by: List[Literal["day", "platform"]] = Query(default=[]),
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
     """Get analytics for a specific platform."""
+    try:
+        platform_enum = Platform(platform.lower())
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Unknown platform: {platform}")
     since = datetime.utcnow() - timedelta(days=days)
-
-    result = await db.execute(
-        select(AnalyticsRecord)
-        .where(
-            AnalyticsRecord.platform == platform,
-            AnalyticsRecord.fetched_at >= since,
-        )
-        .order_by(desc(AnalyticsRecord.fetched_at))
-    )
-    records = result.scalars().all()
-
-    total_likes = sum(r.likes for r in records)
-    total_comments = sum(r.comments for r in records)
-    total_shares = sum(r.shares for r in records)
-    total_reach = sum(r.reach for r in records)
-    avg_engagement = (
-        sum(r.engagement_rate for r in records) / len(records)
-        if records
-        else 0.0
-    )
-
-    return AnalyticsSummary(
-        total_likes=total_likes,
-        total_comments=total_comments,
-        total_shares=total_shares,
-        total_reach=total_reach,
-        avg_engagement_rate=round(avg_engagement, 2),
-        records=[AnalyticsResponse.model_validate(r) for r in records],
+    return await _build_report(
+        db,
+        [AnalyticsRecord.platform == platform_enum, AnalyticsRecord.fetched_at >= since],
+        include_records, limit, cursor, group_by,
     )
@@ -80,6 +80,17 @@ class GoogleSheetRequest(BaseModel):
 
 # ─── Upload Routes ───────────────────────────────────────────────────────────
 
+async def _read_chunks(file: UploadFile):
+    """Yield an uploaded file in fixed-size chunks instead of reading it whole."""
+    from config import settings
+
+    while True:
+        chunk = await file.read(settings.calendar_upload_read_bytes)
+        if not chunk:
+            break
+        yield chunk
+
+
 @router.post("/upload/csv", response_model=ProcessResponse)
 async def upload_csv(
     file: UploadFile = File(...),
@@ -93,18 +104,18 @@ async def upload_csv(
             detail="Only CSV and TSV files are supported",
         )
 
-    content = await file.read()
     upload_name = name or file.filename or "CSV Upload"
 
     try:
         from workflow.calendar_pipeline import CalendarPipeline
         pipeline = CalendarPipeline()
 
-        result = await pipeline.parse_and_store(
+        # Parsed and stored as the file is read — rows land in chunks
+        result = await pipeline.stream_and_store(
             source_type="csv_file",
             user_id=str(user.id),
             name=upload_name,
-            data=content,
+            chunks=_read_chunks(file),
             filename=file.filename,
         )
 
@@ -153,21 +164,33 @@ async def upload_json(
     name: Optional[str] = Form(None),
     user: User = Depends(get_current_user),
 ):
-    """Upload a JSON/JSONL file and parse it into calendar entries."""
-    content = await file.read()
+    """
+    Upload a JSON/JSONL file and parse it into calendar entries.
+    JSONL (.jsonl / .ndjson) is streamed line by line; a JSON document is
+    parsed whole.
+    """
     upload_name = name or file.filename or "JSON Upload"
 
     try:
         from workflow.calendar_pipeline import CalendarPipeline
         pipeline = CalendarPipeline()
 
-        result = await pipeline.parse_and_store(
-            source_type="json_file",
-            user_id=str(user.id),
-            name=upload_name,
-            data=content,
-            filename=file.filename,
-        )
+        if (file.filename or "").endswith((".jsonl", ".ndjson")):
+            result = await pipeline.stream_and_store(
+                source_type="json_file",
+                user_id=str(user.id),
+                name=upload_name,
+                chunks=_read_chunks(file),
+                filename=file.filename,
+            )
+        else:
+            result = await pipeline.parse_and_store(
+                source_type="json_file",
+                user_id=str(user.id),
+                name=upload_name,
+                data=await file.read(),
+                filename=file.filename,
+            )
 
         return ProcessResponse(
             status="success",
@@ -218,6 +241,7 @@ async def list_uploads(
                 "parsed_rows": u.parsed_rows,
                 "failed_rows": u.failed_rows,
                 "is_processed": u.is_processed,
+                "progress": _upload_progress(u),
                 "created_at": u.created_at.isoformat() if u.created_at else None,
             }
             for u in uploads
@@ -225,6 +249,71 @@ async def list_uploads(
     }
 
 
+@router.get("/uploads/{upload_id}/progress")
+async def get_upload_progress(
+    upload_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """Live pipeline progress of an upload's latest processing run."""
+    from db.calendar_models import CalendarUpload
+
+    result = await db.execute(
+        select(CalendarUpload).where(
+            CalendarUpload.id == upload_id,
+            CalendarUpload.user_id == user.id,
+        )
+    )
+    upload = result.scalar_one_or_none()
+    if not upload:
+        raise HTTPException(status_code=404, detail="Upload not found")
+
+    return {"upload_id": str(upload.id), **_upload_progress(upload)}
+
+
+def _upload_progress(upload) -> dict:
+    total = upload.processing_total or 0
+    done = (upload.processing_succeeded or 0) + (upload.processing_failed or 0)
+    return {
+        "total": total,
+        "succeeded": upload.processing_succeeded or 0,
+        "failed": upload.processing_failed or 0,
+        "remaining": max(0, total - done),
+        "started_at": upload.processing_started_at.isoformat() if upload.processing_started_at else None,
+        "completed_at": upload.processing_completed_at.isoformat() if upload.processing_completed_at else None,
+    }
+
+
+@router.post("/uploads/{upload_id}/sync", response_model=ProcessResponse)
+async def sync_upload(
+    upload_id: UUID,
+    user: User = Depends(get_current_user),
+):
+    """
+    Re-sync a Google Sheet upload in place: a conditional fetch, then only
+    the rows added, edited or removed since the last sync are written.
+    Edited entries return to pending for the next processing run.
+    """
+    try:
+        from workflow.calendar_pipeline import CalendarPipeline
+        pipeline = CalendarPipeline()
+        result = await pipeline.sync_google_sheet(str(upload_id), user_id=str(user.id))
+    except ValueError as e:
+        raise HTTPException(status_code=404 if "not found" in str(e) else 400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Sheet sync failed: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Sync failed: {str(e)}")
+
+    if not result["changed"]:
+        message = "Sheet unchanged since last sync"
+    else:
+        message = (
+            f"Synced: {result['inserted']} added, {result['updated']} updated, "
+            f"{result['deleted']} removed"
+        )
+    return ProcessResponse(status="success", message=message, data=result)
+
+
 @router.delete("/uploads/{upload_id}")
 async def delete_upload(
     upload_id: UUID,
@@ -367,6 +456,7 @@ async def get_entry(
         "pipeline_stage": entry.pipeline_stage.value if entry.pipeline_stage else "parsed",
         "content_ids": entry.content_ids or [],
         "pipeline_errors": entry.pipeline_errors,
+        "completed_stages": sorted(k for k in (entry.stage_outputs or {}) if k != "_inputs"),
         "raw_data": entry.raw_data,
         "notes": entry.notes,
         "created_at": entry.created_at.isoformat() if entry.created_at else None,
@@ -378,16 +468,19 @@ async def get_entry(
 @router.post("/process/upload/{upload_id}", response_model=ProcessResponse)
 async def process_upload(
     upload_id: UUID,
+    retry_failed: bool = Query(default=False),
     user: User = Depends(get_current_user),
 ):
     """
     Process all pending entries from a calendar upload through the full pipeline.
     This runs Content Creator → Hashtag → Review → Approval → Schedule.
+    With `retry_failed`, failed entries are retried from their first
+    incomplete stage.
     """
     try:
         from workflow.calendar_pipeline import CalendarPipeline
         pipeline = CalendarPipeline()
-        result = await pipeline.process_upload(str(upload_id))
+        result = await pipeline.process_upload(str(upload_id), retry_failed=retry_failed)
 
         return ProcessResponse(
             status="success",
@@ -403,14 +496,20 @@ async def process_upload(
 @router.post("/process/upload/{upload_id}/async", response_model=ProcessResponse)
 async def process_upload_async(
     upload_id: UUID,
+    fan_out: Optional[bool] = Query(default=None),
+    retry_failed: bool = Query(default=False),
     user: User = Depends(get_current_user),
 ):
-    """Process all pending entries asynchronously via Celery."""
+    """
+    Process all pending entries asynchronously via Celery.
+    With `fan_out`, each entry becomes its own task so every worker helps;
+    poll `GET /uploads/{upload_id}/progress` for live counts.
+    """
     try:
         from celery_app import celery_app
         task = celery_app.send_task(
             "workflow.calendar_pipeline.process_calendar_upload",
-            args=[str(upload_id)],
+            args=[str(upload_id), fan_out, retry_failed],
         )
 
         return ProcessResponse(
@@ -455,58 +554,60 @@ async def get_calendar_stats(
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    """Get calendar statistics for the dashboard."""
+    """
+    Get calendar statistics for the dashboard. Every count comes back from
+    one UNION ALL of grouped aggregates (platforms are unnested in SQL);
+    the result is cached per user for `settings.dashboard_stats_ttl`
+    seconds and dropped on any committed calendar change.
+    """
+    from sqlalchemy import String, case, cast, literal, literal_column, null, union_all
     from db.calendar_models import CalendarUpload, CalendarEntry, CalendarEntryStatus
-
-    # Total uploads
-    upload_count = await db.execute(
-        select(func.count()).select_from(CalendarUpload)
-        .where(CalendarUpload.user_id == user.id)
-    )
-    total_uploads = upload_count.scalar() or 0
-
-    # Total entries
-    entry_count = await db.execute(
-        select(func.count()).select_from(CalendarEntry)
-        .where(CalendarEntry.user_id == user.id)
-    )
-    total_entries = entry_count.scalar() or 0
-
-    # By status
-    by_status = {}
-    for s in CalendarEntryStatus:
-        result = await db.execute(
-            select(func.count()).select_from(CalendarEntry)
-            .where(CalendarEntry.user_id == user.id, CalendarEntry.status == s)
-        )
-        count = result.scalar() or 0
-        if count > 0:
-            by_status[s.value] = count
-
-    # By brand
-    brand_result = await db.execute(
-        select(CalendarEntry.brand, func.count())
-        .where(CalendarEntry.user_id == user.id)
-        .group_by(CalendarEntry.brand)
-    )
-    by_brand = {row[0] or "Unknown": row[1] for row in brand_result.fetchall()}
-
-    # By platform (flatten the JSON array)
-    # Note: This is a simplified approach; platform counts may overlap
-    all_entries = await db.execute(
-        select(CalendarEntry.platforms)
-        .where(CalendarEntry.user_id == user.id)
-    )
-    platform_counts = {}
-    for (platforms,) in all_entries.fetchall():
-        if platforms:
-            for p in platforms:
-                platform_counts[p] = platform_counts.get(p, 0) + 1
-
-    return CalendarStatsResponse(
+    from db.stats_cache import stats_cache
+
+    cached = stats_cache.get("calendar", user.id)
+    if cached is not None:
+        return cached
+    generation = stats_cache.generation("calendar")
+
+    owned = CalendarEntry.user_id == user.id
+    platforms = CalendarEntry.platforms
+    platform = func.json_array_elements_text(
+        case((func.json_typeof(platforms) == "array", platforms), else_=literal_column("'[]'::json"))
+    ).column_valued("platform")
+    status_label = cast(CalendarEntry.status, String)
+
+    result = await db.execute(union_all(
+        select(literal("uploads"), cast(null(), String), func.count())
+        .select_from(CalendarUpload).where(CalendarUpload.user_id == user.id),
+        select(literal("status"), status_label, func.count())
+        .where(owned).group_by(status_label),
+        select(literal("brand"), CalendarEntry.brand, func.count())
+        .where(owned).group_by(CalendarEntry.brand),
+        select(literal("platform"), platform, func.count())
+        .select_from(CalendarEntry).where(owned).group_by(platform),
+    ))
+
+    total_uploads = 0
+    by_status, by_brand, platform_counts = {}, {}, {}
+    for kind, key, count in result.all():
+        if kind == "uploads":
+            total_uploads = count
+        elif kind == "status" and key is not None:
+            # Native enums store member names
+            entry_status = CalendarEntryStatus[key] if key in CalendarEntryStatus.__members__ else CalendarEntryStatus(key)
+            by_status[entry_status.value] = count
+        elif kind == "brand":
+            by_brand[key or "Unknown"] = by_brand.get(key or "Unknown", 0) + count
+        elif kind == "platform":
+            platform_counts[key] = count
+    total_entries = sum(by_brand.values())
+
+    stats = CalendarStatsResponse(
         total_uploads=total_uploads,
         total_entries=total_entries,
         by_status=by_status,
         by_brand=by_brand,
         by_platform=platform_counts,
     )
+    stats_cache.set("calendar", user.id, stats, generation)
+    return stats
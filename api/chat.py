@@ -6,20 +6,26 @@ Guest users can chat freely but actions (workflows, settings, etc.)
 will prompt them to log in first.
 """
 
+import asyncio
+import json
+import logging
 import uuid
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Set, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth.dependencies import get_current_user, get_optional_user
 from auth.models import User
-from db.database import get_db
-from db.settings_models import ChatMessage
-from agents.master_agent import MasterAgent
+from brain.llm_limiter import PRIORITY_BATCH, PRIORITY_INTERACTIVE, llm_priority
+from config import settings
+from db.database import get_db, async_session
+from db.settings_models import ChatConversationSummary, ChatMessage
+from agents.master_agent import MasterAgent, prompt_history_limit
 
 router = APIRouter(prefix="/chat", tags=["Chat"])
 
@@ -27,6 +33,24 @@ master_agent = MasterAgent()
 
 GUEST_USER_ID = "guest"
 
+logger = logging.getLogger("clawtbot.chat")
+
+# Background summary refreshes (kept referenced until done) and the
+# conversations currently being summarized in this process.
+_summary_tasks: Set[asyncio.Task] = set()
+_summarizing: Set[str] = set()
+
+TIMEOUT_FALLBACK_RESULT = {
+    "intent": "general_chat",
+    "response": (
+        "⚠️ I took too long processing your request. "
+        "This usually happens when the local AI model is under heavy load.\n\n"
+        "Please try again — shorter messages often get faster responses! 🔄"
+    ),
+    "action_success": False,
+    "action_data": None,
+}
+
 
 # ─── Schemas ────────────────────────────────────────────────────────────────
 
@@ -61,68 +85,92 @@ async def send_chat_message(
     user_id = str(user.id) if user else GUEST_USER_ID
     conv_id = req.conversation_id or str(uuid.uuid4())
 
-    # Load conversation history (only for authenticated users)
-    history = []
-    if req.conversation_id and is_authenticated:
-        result = await db.execute(
-            select(ChatMessage)
-            .where(ChatMessage.conversation_id == conv_id)
-            .order_by(ChatMessage.created_at.asc())
-        )
-        messages = result.scalars().all()
-        history = [{"role": m.role, "content": m.content} for m in messages]
-
-    # Save user message (only for authenticated users)
-    if is_authenticated:
-        user_msg = ChatMessage(
-            conversation_id=conv_id,
-            user_id=user_id,
-            role="user",
-            content=req.message,
-        )
-        db.add(user_msg)
-        await db.flush()
+    history, summary = await _load_history(db, req, conv_id, is_authenticated)
+    await _save_user_message(db, req, conv_id, user_id, is_authenticated)
 
-    # Process through Master Agent
+    # Process through Master Agent (chat LLM calls go ahead of batch work)
+    llm_priority.set(PRIORITY_INTERACTIVE)
     try:
         result = await master_agent.chat(
             message=req.message,
             user_id=user_id,
             conversation_history=history,
             is_authenticated=is_authenticated,
+            conversation_summary=summary,
         )
     except Exception as e:
-        import logging
-        logging.getLogger("clawtbot.chat").error(f"Master Agent error: {e}", exc_info=True)
-        result = {
-            "intent": "general_chat",
-            "response": (
-                "⚠️ I took too long processing your request. "
-                "This usually happens when the local AI model is under heavy load.\n\n"
-                "Please try again — shorter messages often get faster responses! 🔄"
-            ),
-            "action_success": False,
-            "action_data": None,
-        }
+        logger.error(f"Master Agent error: {e}", exc_info=True)
+        result = dict(TIMEOUT_FALLBACK_RESULT)
 
     # Save assistant response (only for authenticated users)
     if is_authenticated:
-        assistant_msg = ChatMessage(
-            conversation_id=conv_id,
-            user_id=user_id,
-            role="assistant",
-            content=result["response"],
-            intent=result.get("intent"),
-        )
-        db.add(assistant_msg)
+        db.add(_assistant_message(conv_id, user_id, result))
         await db.commit()
+        _schedule_summary_refresh(conv_id, user_id)
 
-    return ChatResponse(
-        conversation_id=conv_id,
-        response=result["response"],
-        intent=result.get("intent", "general_chat"),
-        action_success=result.get("action_success", True),
-        action_data=result.get("action_data"),
+    return _chat_response(conv_id, result)
+
+
+@router.post("/stream")
+async def stream_chat_message(
+    req: ChatRequest,
+    db: AsyncSession = Depends(get_db),
+    user: Optional[User] = Depends(get_optional_user),
+):
+    """
+    Streaming variant of `POST /chat` (Server-Sent Events).
+
+    Emits `token` events (`{"text": "..."}`) as the model writes its reply,
+    then one `done` event whose data is the same JSON body `POST /chat`
+    returns. Clients should replace the streamed text with `done.response`,
+    which may include action results. The assistant message is persisted
+    once the reply is complete.
+    """
+    is_authenticated = user is not None
+    user_id = str(user.id) if user else GUEST_USER_ID
+    conv_id = req.conversation_id or str(uuid.uuid4())
+
+    history, summary = await _load_history(db, req, conv_id, is_authenticated)
+    await _save_user_message(db, req, conv_id, user_id, is_authenticated)
+    await db.commit()
+
+    async def event_stream():
+        llm_priority.set(PRIORITY_INTERACTIVE)
+        result = None
+        try:
+            async for event in master_agent.chat_stream(
+                message=req.message,
+                user_id=user_id,
+                conversation_history=history,
+                is_authenticated=is_authenticated,
+                conversation_summary=summary,
+            ):
+                if event["type"] == "token":
+                    yield _sse("token", {"text": event["text"]})
+                else:
+                    result = event["result"]
+        except Exception as e:
+            logger.error(f"Master Agent stream error: {e}", exc_info=True)
+        if result is None:
+            result = dict(TIMEOUT_FALLBACK_RESULT)
+
+        # The request-scoped session is closed once streaming starts,
+        # so persist the reply in a session of our own.
+        if is_authenticated:
+            try:
+                async with async_session() as session:
+                    session.add(_assistant_message(conv_id, user_id, result))
+                    await session.commit()
+                _schedule_summary_refresh(conv_id, user_id)
+            except Exception as e:
+                logger.error(f"Failed to save streamed chat reply: {e}")
+
+        yield _sse("done", _chat_response(conv_id, result).model_dump())
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
@@ -189,3 +237,146 @@ async def list_conversations(
         }
         for r in rows
     ]
+
+
+# ─── Helpers ────────────────────────────────────────────────────────────────
+
+async def _load_history(
+    db: AsyncSession, req: ChatRequest, conv_id: str, is_authenticated: bool,
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    Load the rolling summary and every message it does not cover yet, up to
+    `prompt_history_limit()` — the history window plus the messages that
+    scrolled out of it before the summary caught up — so nothing falls
+    between the two (only for authenticated users).
+    """
+    if not (req.conversation_id and is_authenticated):
+        return [], None
+    query = select(ChatMessage.role, ChatMessage.content).where(ChatMessage.conversation_id == conv_id)
+    if settings.chat_summary_enabled:
+        summarized_until = (
+            select(ChatConversationSummary.summarized_until)
+            .where(ChatConversationSummary.conversation_id == conv_id)
+            .scalar_subquery()
+        )
+        query = query.where(or_(summarized_until.is_(None), ChatMessage.created_at > summarized_until))
+    result = await db.execute(
+        query.order_by(ChatMessage.created_at.desc()).limit(prompt_history_limit())
+    )
+    history = [{"role": r.role, "content": r.content} for r in reversed(result.all())]
+
+    summary = None
+    if settings.chat_summary_enabled:
+        summary = (await db.execute(
+            select(ChatConversationSummary.summary)
+            .where(ChatConversationSummary.conversation_id == conv_id)
+        )).scalar_one_or_none()
+    return history, summary or None
+
+
+async def _save_user_message(
+    db: AsyncSession, req: ChatRequest, conv_id: str, user_id: str, is_authenticated: bool,
+):
+    """Save the user's message (only for authenticated users)."""
+    if not is_authenticated:
+        return
+    db.add(ChatMessage(
+        conversation_id=conv_id,
+        user_id=user_id,
+        role="user",
+        content=req.message,
+    ))
+    await db.flush()
+
+
+def _schedule_summary_refresh(conv_id: str, user_id: str):
+    """Refresh the conversation's rolling summary after the response is sent."""
+    if not settings.chat_summary_enabled or conv_id in _summarizing:
+        return
+    _summarizing.add(conv_id)
+    task = asyncio.get_running_loop().create_task(_refresh_summary(conv_id, user_id))
+    _summary_tasks.add(task)
+    task.add_done_callback(_summary_tasks.discard)
+
+
+async def _refresh_summary(conv_id: str, user_id: str):
+    """
+    Fold messages that have scrolled out of the history window into the
+    conversation's summary, once at least `settings.chat_summary_min_messages`
+    of them have accumulated. No DB connection is held during the LLM call.
+    """
+    llm_priority.set(PRIORITY_BATCH)
+    try:
+        async with async_session() as session:
+            previous = (await session.execute(
+                select(ChatConversationSummary.summary, ChatConversationSummary.summarized_until)
+                .where(ChatConversationSummary.conversation_id == conv_id)
+            )).one_or_none()
+            # Oldest message still inside the verbatim window
+            cutoff = (await session.execute(
+                select(ChatMessage.created_at)
+                .where(ChatMessage.conversation_id == conv_id)
+                .order_by(ChatMessage.created_at.desc())
+                .offset(settings.chat_history_window - 1)
+                .limit(1)
+            )).scalar_one_or_none()
+            if cutoff is None:
+                return
+            query = select(ChatMessage.role, ChatMessage.content, ChatMessage.created_at).where(
+                ChatMessage.conversation_id == conv_id,
+                ChatMessage.created_at < cutoff,
+            )
+            if previous is not None and previous.summarized_until is not None:
+                query = query.where(ChatMessage.created_at > previous.summarized_until)
+            pending = (await session.execute(
+                query.order_by(ChatMessage.created_at.asc()).limit(settings.chat_summary_max_batch)
+            )).all()
+
+        if len(pending) < settings.chat_summary_min_messages:
+            return
+
+        summary = await master_agent.summarize_history(
+            previous.summary if previous is not None else None,
+            [{"role": m.role, "content": m.content} for m in pending],
+        )
+        if summary is None:
+            return
+
+        async with async_session() as session:
+            row = await session.get(ChatConversationSummary, conv_id)
+            if row is None:
+                row = ChatConversationSummary(conversation_id=conv_id, user_id=user_id, message_count=0)
+                session.add(row)
+            row.summary = summary
+            row.summarized_until = pending[-1].created_at
+            row.message_count = (row.message_count or 0) + len(pending)
+            await session.commit()
+    except Exception as e:
+        logger.warning(f"Failed to refresh summary for conversation {conv_id}: {e}")
+    finally:
+        _summarizing.discard(conv_id)
+
+
+def _assistant_message(conv_id: str, user_id: str, result: dict) -> ChatMessage:
+    return ChatMessage(
+        conversation_id=conv_id,
+        user_id=user_id,
+        role="assistant",
+        content=result["response"],
+        intent=result.get("intent"),
+    )
+
+
+def _chat_response(conv_id: str, result: dict) -> ChatResponse:
+    return ChatResponse(
+        conversation_id=conv_id,
+        response=result["response"],
+        intent=result.get("intent", "general_chat"),
+        action_success=result.get("action_success", True),
+        action_data=result.get("action_data"),
+    )
+
+
+def _sse(event: str, data: dict) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
@@ -27,45 +27,45 @@ async def get_content_stats(
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    """Aggregate content counts by status for the dashboard."""
+    """
+    Aggregate content counts by status for the dashboard — one query,
+    cached for `settings.dashboard_stats_ttl` seconds (dropped on any
+    committed content or schedule change).
+    """
+    from datetime import timedelta
     from sqlalchemy import func
+    from db.stats_cache import stats_cache
 
-    # Total count
-    total_result = await db.execute(select(func.count()).select_from(Content))
-    total = total_result.scalar() or 0
-
-    # Count per status
-    status_counts = {}
-    for s in ContentStatus:
-        result = await db.execute(
-            select(func.count()).select_from(Content).where(Content.status == s)
-        )
-        status_counts[s.value] = result.scalar() or 0
-
-    # Average review score
-    avg_result = await db.execute(
-        select(func.avg(Content.review_score)).where(Content.review_score.isnot(None))
-    )
-    avg_score = avg_result.scalar()
-    avg_score = round(float(avg_score), 1) if avg_score else 0.0
+    cached = stats_cache.get("content")
+    if cached is not None:
+        return cached
+    generation = stats_cache.generation("content")
 
-    # Recent published (last 7 days)
-    from datetime import timedelta
     week_ago = datetime.utcnow() - timedelta(days=7)
-    recent_result = await db.execute(
-        select(func.count()).select_from(Schedule).where(
-            Schedule.is_published == True,
-            Schedule.published_at >= week_ago,
-        )
+    recent_published = (
+        select(func.count()).select_from(Schedule)
+        .where(Schedule.is_published == True, Schedule.published_at >= week_ago)
+        .scalar_subquery()
     )
-    recent_published = recent_result.scalar() or 0
-
-    return {
-        "total": total,
-        "by_status": status_counts,
-        "avg_review_score": avg_score,
-        "recent_published_7d": recent_published,
+    result = await db.execute(
+        select(
+            func.count().label("total"),
+            *(func.count().filter(Content.status == s).label(s.value) for s in ContentStatus),
+            func.avg(Content.review_score).label("avg_review_score"),
+            recent_published.label("recent_published"),
+        ).select_from(Content)
+    )
+    row = result.one()._mapping
+
+    avg_score = row["avg_review_score"]
+    stats = {
+        "total": row["total"] or 0,
+        "by_status": {s.value: row[s.value] or 0 for s in ContentStatus},
+        "avg_review_score": round(float(avg_score), 1) if avg_score else 0.0,
+        "recent_published_7d": row["recent_published"] or 0,
     }
+    stats_cache.set("content", None, stats, generation)
+    return stats
 
 
 # ─── Request / Response Schemas ──────────────────────────────────────────────
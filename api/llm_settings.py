@@ -27,6 +27,11 @@ class ProviderKeyRequest(BaseModel):
     api_key: str
 
 
+class ProviderLimitRequest(BaseModel):
+    provider: str
+    max_concurrency: Optional[int] = None  # None = use the config.py default
+
+
 class AgentModelRequest(BaseModel):
     agent_id: str
     provider: str
@@ -59,6 +64,7 @@ async def list_providers(
             "test_status": cfg.test_status if cfg else ("connected" if provider == "ollama" else None),
             "last_tested_at": cfg.last_tested_at.isoformat() if cfg and cfg.last_tested_at else None,
             "masked_key": mask_value(decrypt_value(cfg.api_key_encrypted)) if cfg and cfg.api_key_encrypted else None,
+            "max_concurrency": cfg.max_concurrency if cfg and cfg.max_concurrency else llm_router.provider_limit(provider),
         })
 
     return providers
@@ -123,6 +129,40 @@ async def delete_provider_key(
     return {"status": "deleted", "provider": provider}
 
 
+@router.post("/providers/limit")
+async def set_provider_limit(
+    req: ProviderLimitRequest,
+    db: AsyncSession = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    """Set (or clear) how many concurrent requests a provider may receive."""
+    if req.provider not in PROVIDER_MODELS:
+        raise HTTPException(400, f"Unknown provider: {req.provider}")
+    if req.max_concurrency is not None and req.max_concurrency < 1:
+        raise HTTPException(400, "max_concurrency must be at least 1")
+
+    result = await db.execute(
+        select(LLMProviderConfig).where(LLMProviderConfig.provider == req.provider)
+    )
+    cfg = result.scalar_one_or_none()
+
+    if cfg:
+        cfg.max_concurrency = req.max_concurrency
+        cfg.updated_at = datetime.utcnow()
+    else:
+        cfg = LLMProviderConfig(
+            provider=req.provider,
+            is_enabled=True,
+            max_concurrency=req.max_concurrency,
+        )
+        db.add(cfg)
+
+    await db.commit()
+    llm_router.invalidate_cache()
+
+    return {"status": "saved", "provider": req.provider, "max_concurrency": req.max_concurrency}
+
+
 @router.post("/providers/{provider}/test")
 async def test_provider(
     provider: str,
@@ -275,3 +315,41 @@ async def reset_agent_model(
 
     llm_router.invalidate_cache(req.agent_id)
     return {"status": "reset", "agent_id": req.agent_id}
+
+
+# ─── Runtime Metrics ───────────────────────────────────────────────────────
+
+@router.get("/metrics")
+async def llm_metrics(
+    _user: User = Depends(get_current_user),
+):
+    """
+    Per-process LLM runtime metrics: response cache, request coalescing,
+    per-provider admission (in-flight, queue depth, wait times), circuit
+    breakers, Master Agent hedging (which provider won), the Master Agent's
+    rule-based intent fast path (hit rate), and the user memory store.
+    """
+    from agents.master_agent import intent_classifier, user_memory
+    from brain.circuit_breaker import llm_breakers
+    from brain.llm_cache import llm_cache
+    from brain.llm_hedging import llm_hedging
+    from brain.llm_router import llm_single_flight
+    return {
+        "cache": llm_cache.stats(),
+        "single_flight": llm_single_flight.stats(),
+        "admission": llm_router.admission_stats(),
+        "circuits": llm_breakers.snapshot(),
+        "hedging": llm_hedging.stats(),
+        "intent_fast_path": intent_classifier.stats(),
+        "user_memory": user_memory.stats(),
+    }
+
+
+@router.post("/cache/clear")
+async def clear_llm_cache(
+    _user: User = Depends(get_current_user),
+):
+    """Drop this process's in-memory LLM response cache."""
+    from brain.llm_cache import llm_cache
+    llm_cache.clear()
+    return {"status": "cleared"}
@@ -0,0 +1,269 @@
+"""
+ClawtBot — LLM Circuit Breakers
+One breaker per provider/model, shared by every agent, the router, and the
+Master Agent fallback chain, so a provider that keeps failing or timing out
+is skipped instantly instead of burning a full timeout on every request.
+
+States:
+    closed    → calls flow; outcomes are recorded in a rolling window
+    open      → calls are rejected with CircuitOpenError
+    half_open → one trial call is let through; success closes the breaker,
+                failure re-opens it with a doubled cool-down
+
+Open breakers leave the open state when their cool-down elapses, or earlier
+when the background prober (API process) finds the provider healthy again.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+PROBE_TIMEOUT = 10.0
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose breaker is open."""
+
+
+class CircuitBreaker:
+    """Rolling-window breaker for one provider/model."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.state = CLOSED
+        # (timestamp, ok, latency seconds or None)
+        self._samples: Deque[Tuple[float, bool, Optional[float]]] = deque()
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._open_for = float(settings.llm_breaker_open_seconds)
+        self._trial_in_flight = False
+        self.probe: Optional[Callable[[], Awaitable[bool]]] = None
+        self.times_opened = 0
+        self.rejected = 0
+
+    # ── State ───────────────────────────────────────────────────────────
+
+    def current_state(self) -> str:
+        if self.state == OPEN and time.monotonic() - self._opened_at >= self._open_for:
+            self._transition(HALF_OPEN)
+        return self.state
+
+    def is_available(self) -> bool:
+        """Would a call be let through right now? (Does not reserve the trial.)"""
+        state = self.current_state()
+        return state == CLOSED or (state == HALF_OPEN and not self._trial_in_flight)
+
+    def ensure_available(self):
+        """Fail fast with CircuitOpenError before queueing for a provider slot."""
+        if not self.is_available():
+            self.rejected += 1
+            raise CircuitOpenError(f"{self.name} circuit is open")
+
+    def _transition(self, state: str):
+        if state == self.state:
+            return
+        logger.info(f"LLM circuit {self.name}: {self.state} → {state}")
+        self.state = state
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+            self.times_opened += 1
+        elif state == CLOSED:
+            self._open_for = float(settings.llm_breaker_open_seconds)
+            self._consecutive_failures = 0
+        self._trial_in_flight = False
+
+    def _trip(self):
+        if self.state == HALF_OPEN:
+            self._open_for = min(self._open_for * 2, settings.llm_breaker_max_open_seconds)
+        self._transition(OPEN)
+
+    # ── Call tracking ───────────────────────────────────────────────────
+
+    @asynccontextmanager
+    async def guard(self, track_latency: bool = True):
+        """
+        Run one provider call under the breaker.
+
+        Raises CircuitOpenError if the call is not allowed. Exceptions count
+        as failures; a cancellation counts only once the call has run past
+        `settings.llm_breaker_timeout_seconds` (the caller timed it out) —
+        earlier cancellations (e.g. a hedged call that lost) are ignored.
+        """
+        state = self.current_state()
+        if state == OPEN or (state == HALF_OPEN and self._trial_in_flight):
+            self.rejected += 1
+            raise CircuitOpenError(f"{self.name} circuit is open")
+        if state == HALF_OPEN:
+            self._trial_in_flight = True
+
+        started = time.monotonic()
+        try:
+            yield
+        except asyncio.CancelledError:
+            elapsed = time.monotonic() - started
+            if elapsed >= settings.llm_breaker_timeout_seconds:
+                self.record_failure()
+            else:
+                self._trial_in_flight = False
+            raise
+        except Exception:
+            self.record_failure()
+            raise
+        except BaseException:
+            # e.g. GeneratorExit when a stream consumer stops early
+            self._trial_in_flight = False
+            raise
+        else:
+            self.record_success(time.monotonic() - started if track_latency else None)
+
+    def record_success(self, latency: Optional[float] = None):
+        self._add_sample(True, latency)
+        self._consecutive_failures = 0
+        if self.state != CLOSED:
+            self._transition(CLOSED)
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self._add_sample(False, None)
+        self._consecutive_failures += 1
+        if self.state == HALF_OPEN or (self.state == CLOSED and self._should_trip()):
+            self._trip()
+        self._trial_in_flight = False
+
+    def on_probe(self, healthy: bool):
+        """Apply a background health-check result to an open breaker."""
+        if self.state != OPEN:
+            return
+        if healthy:
+            self._transition(HALF_OPEN)
+        else:
+            self._opened_at = time.monotonic()  # stay open for another cool-down
+
+    # ── Rolling window ──────────────────────────────────────────────────
+
+    def _add_sample(self, ok: bool, latency: Optional[float]):
+        now = time.monotonic()
+        self._samples.append((now, ok, latency))
+        self._prune(now)
+
+    def _prune(self, now: float):
+        horizon = now - settings.llm_breaker_window_seconds
+        while self._samples and self._samples[0][0] < horizon:
+            self._samples.popleft()
+
+    def _should_trip(self) -> bool:
+        if self._consecutive_failures >= settings.llm_breaker_consecutive_failures:
+            return True
+        calls = len(self._samples)
+        if calls < settings.llm_breaker_min_calls:
+            return False
+        failures = sum(1 for _, ok, _ in self._samples if not ok)
+        return failures / calls >= settings.llm_breaker_failure_rate
+
+    def latency_percentile(self, q: float) -> Optional[float]:
+        """Latency (seconds) of successful calls at quantile q over the window."""
+        self._prune(time.monotonic())
+        latencies = sorted(lat for _, ok, lat in self._samples if ok and lat is not None)
+        if not latencies:
+            return None
+        index = min(len(latencies) - 1, int(round(q * (len(latencies) - 1))))
+        return latencies[index]
+
+    def snapshot(self) -> dict:
+        state = self.current_state()
+        self._prune(time.monotonic())
+        calls = len(self._samples)
+        failures = sum(1 for _, ok, _ in self._samples if not ok)
+        p50 = self.latency_percentile(0.5)
+        p95 = self.latency_percentile(0.95)
+        retry_in = max(0.0, self._opened_at + self._open_for - time.monotonic()) if state == OPEN else 0.0
+        return {
+            "state": state,
+            "calls": calls,
+            "failure_rate": round(failures / calls, 3) if calls else 0.0,
+            "consecutive_failures": self._consecutive_failures,
+            "p50_ms": round(p50 * 1000) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000) if p95 is not None else None,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+            "retry_in_seconds": round(retry_in, 1),
+        }
+
+
+class BreakerRegistry:
+    """Process-wide breakers keyed by provider/model, plus the background prober."""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._probe_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def key(provider_name: str, model: str) -> str:
+        return f"{provider_name}:{model}"
+
+    def get(self, provider_name: str, model: str) -> CircuitBreaker:
+        key = self.key(provider_name, model)
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = self._breakers[key] = CircuitBreaker(key)
+        return breaker
+
+    def is_available(self, provider_name: str, model: str) -> bool:
+        breaker = self._breakers.get(self.key(provider_name, model))
+        return breaker is None or breaker.is_available()
+
+    def snapshot(self) -> Dict[str, dict]:
+        return {key: breaker.snapshot() for key, breaker in self._breakers.items()}
+
+    def reset(self):
+        self._breakers.clear()
+
+    # ── Background probing ─────────────────────────────────────────────
+
+    async def probe_open_breakers(self):
+        """Health-check every open breaker's provider once."""
+        for breaker in list(self._breakers.values()):
+            if breaker.current_state() != OPEN or breaker.probe is None:
+                continue
+            try:
+                healthy = await asyncio.wait_for(breaker.probe(), timeout=PROBE_TIMEOUT)
+            except Exception:
+                healthy = False
+            breaker.on_probe(bool(healthy))
+
+    async def _probe_loop(self):
+        while True:
+            await asyncio.sleep(settings.llm_breaker_probe_interval)
+            try:
+                await self.probe_open_breakers()
+            except Exception as e:
+                logger.warning(f"LLM breaker probe failed: {e}")
+
+    def start_probing(self):
+        """Start the background prober on the running loop (API lifespan)."""
+        if self._probe_task is None or self._probe_task.done():
+            self._probe_task = asyncio.get_running_loop().create_task(self._probe_loop())
+
+    async def stop_probing(self):
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            try:
+                await self._probe_task
+            except asyncio.CancelledError:
+                pass
+            self._probe_task = None
+
+
+# ─── Singleton ──────────────────────────────────────────────────────────────
+llm_breakers = BreakerRegistry()
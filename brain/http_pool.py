@@ -0,0 +1,102 @@
+"""
+ClawtBot — Shared HTTP Connection Pools for LLM Providers
+One keep-alive httpx.AsyncClient per provider per event loop, so repeated
+completions reuse TCP/TLS connections instead of paying a new handshake.
+
+Clients are bound to the event loop that created them (Celery tasks spin up
+their own loops), so the registry is keyed by loop and then by provider name.
+"""
+
+import asyncio
+import logging
+import weakref
+from typing import Dict, Optional
+
+import httpx
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401 — optional, enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+DEFAULT_TIMEOUT = 60.0
+
+# loop → { provider_name → AsyncClient }
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _build_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.llm_http_max_connections,
+        max_keepalive_connections=settings.llm_http_max_keepalive_connections,
+        keepalive_expiry=settings.llm_http_keepalive_expiry,
+    )
+
+
+def get_http_client(
+    provider_name: str,
+    http2: bool = False,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> httpx.AsyncClient:
+    """
+    Get the pooled client for a provider on the running event loop.
+
+    Args:
+        provider_name: Pool key (one pool per provider)
+        http2: Negotiate HTTP/2 when the provider supports it and `h2` is installed
+        timeout: Default request timeout for the pool (callers may override per request)
+
+    Returns:
+        A long-lived httpx.AsyncClient — do NOT use it as a context manager.
+    """
+    loop = asyncio.get_running_loop()
+    pools = _clients.setdefault(loop, {})
+
+    client = pools.get(provider_name)
+    if client is None or client.is_closed:
+        use_http2 = http2 and settings.llm_http2_enabled and HTTP2_AVAILABLE
+        client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=_build_limits(),
+            http2=use_http2,
+        )
+        pools[provider_name] = client
+        logger.debug(f"Opened HTTP pool for {provider_name} (http2={use_http2})")
+    return client
+
+
+async def close_http_client(provider_name: str):
+    """Close the pool for one provider on the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop, {}).pop(provider_name, None)
+    if client is not None:
+        await client.aclose()
+
+
+async def close_http_clients():
+    """Close every provider pool on the running event loop (shutdown hook)."""
+    loop = asyncio.get_running_loop()
+    pools = _clients.pop(loop, {})
+    for name, client in pools.items():
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning(f"Failed to close HTTP pool for {name}: {e}")
+    if pools:
+        logger.info(f"Closed {len(pools)} LLM HTTP pool(s)")
+
+
+def run_close_http_clients(loop: Optional[asyncio.AbstractEventLoop] = None):
+    """Synchronously close the pools of a (not running) loop — for Celery shutdown."""
+    targets = [loop] if loop is not None else list(_clients.keys())
+    for target in targets:
+        if target is None or target.is_closed() or target.is_running():
+            continue
+        target.run_until_complete(close_http_clients())
@@ -0,0 +1,163 @@
+"""
+ClawtBot — LLM Response Cache
+Content-addressed cache for completions, so identical prompts (the same
+hashtags for every platform fan-out, retried pipeline stages) are served
+without regenerating them.
+
+Two tiers:
+    1. In-process LRU (bounded, per-entry expiry)
+    2. Redis (shared by the API and every Celery worker)
+
+The key is a SHA-256 of everything that determines the output:
+(provider, model, system_prompt, prompt, temperature, json_mode, max_tokens).
+Only agent-bound providers are cached, with a per-agent TTL; calls hotter
+than `settings.llm_cache_max_temperature` are creative and always bypass it.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "clawtbot:llm_cache:"
+REDIS_RETRY_AFTER = 30.0  # seconds to skip the Redis tier after an error
+
+
+class LLMResponseCache:
+    """Two-tier (LRU + Redis) cache of LLM completions with hit/miss counters."""
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries or settings.llm_cache_max_entries
+        # key → (expires_at monotonic, text)
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._redis_down_until = 0.0
+        self.memory_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.stores = 0
+
+    # ── Policy ──────────────────────────────────────────────────────────
+
+    def ttl_for(self, agent_id: Optional[str], temperature: float) -> int:
+        """
+        TTL in seconds for a call, or 0 if it must not be cached.
+        Counts the call as bypassed when caching is opted out.
+        """
+        if not settings.llm_cache_enabled or agent_id is None:
+            return 0
+        ttl = settings.llm_cache_agent_ttls.get(agent_id, settings.llm_cache_default_ttl)
+        if ttl <= 0 or temperature > settings.llm_cache_max_temperature:
+            self.bypassed += 1
+            return 0
+        return ttl
+
+    @staticmethod
+    def make_key(
+        provider: str,
+        model: str,
+        system_prompt: Optional[str],
+        prompt: str,
+        temperature: float,
+        json_mode: bool,
+        max_tokens: int,
+    ) -> str:
+        """Content address of a completion request."""
+        material = json.dumps(
+            [provider, model, system_prompt or "", prompt, round(temperature, 3), json_mode, max_tokens],
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    # ── Lookup / Store ──────────────────────────────────────────────────
+
+    async def get(self, key: str, ttl: int) -> Optional[str]:
+        """Look the key up in memory, then Redis (promoting Redis hits into memory)."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, text = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return text
+            del self._entries[key]
+
+        text = await self._redis_get(key)
+        if text is not None:
+            self._remember(key, text, ttl)
+            self.redis_hits += 1
+            return text
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, text: str, ttl: int):
+        """Store a completion in both tiers."""
+        self._remember(key, text, ttl)
+        await self._redis_set(key, text, ttl)
+        self.stores += 1
+
+    def _remember(self, key: str, text: str, ttl: int):
+        self._entries[key] = (time.monotonic() + ttl, text)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop the in-process tier (Redis entries expire on their own)."""
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        hits = self.memory_hits + self.redis_hits
+        lookups = hits + self.misses
+        return {
+            "enabled": settings.llm_cache_enabled,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": hits,
+            "memory_hits": self.memory_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "stores": self.stores,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+        }
+
+    # ── Redis tier (best effort — never fails a completion) ────────────
+
+    def _redis_available(self) -> bool:
+        return settings.llm_cache_redis_enabled and time.monotonic() >= self._redis_down_until
+
+    def _redis_failed(self, e: Exception):
+        logger.debug(f"LLM cache Redis tier unavailable: {e}")
+        self._redis_down_until = time.monotonic() + REDIS_RETRY_AFTER
+
+    async def _redis_get(self, key: str) -> Optional[str]:
+        if not self._redis_available():
+            return None
+        try:
+            from utils.redis_client import get_redis
+            return await get_redis().get(KEY_PREFIX + key)
+        except Exception as e:
+            self._redis_failed(e)
+            return None
+
+    async def _redis_set(self, key: str, text: str, ttl: int):
+        if not self._redis_available():
+            return
+        try:
+            from utils.redis_client import get_redis
+            await get_redis().set(KEY_PREFIX + key, text, ex=ttl)
+        except Exception as e:
+            self._redis_failed(e)
+
+
+# ─── Singleton ──────────────────────────────────────────────────────────────
+llm_cache = LLMResponseCache()
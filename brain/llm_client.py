@@ -8,6 +8,7 @@ import logging
 import httpx
 from typing import Optional
 from config import settings
+from brain.http_pool import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +31,10 @@ class OllamaClient:
         self.model = model or settings.ollama_model
         self.base_url = f"{self.host}/api"
 
+    def _http(self) -> httpx.AsyncClient:
+        """Pooled keep-alive client (shared with OllamaProvider)."""
+        return get_http_client("ollama", timeout=REQUEST_TIMEOUT)
+
     async def generate(
         self,
         prompt: str,
@@ -70,14 +75,14 @@ class OllamaClient:
         last_error = None
         for attempt in range(1, MAX_RETRIES + 1):
             try:
-                async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT) as client:
-                    response = await client.post(
-                        f"{self.base_url}/generate",
-                        json=payload,
-                    )
-                    response.raise_for_status()
-                    data = response.json()
-                    return data.get("response", "").strip()
+                response = await self._http().post(
+                    f"{self.base_url}/generate",
+                    json=payload,
+                    timeout=REQUEST_TIMEOUT,
+                )
+                response.raise_for_status()
+                data = response.json()
+                return data.get("response", "").strip()
 
             except httpx.TimeoutException as e:
                 last_error = e
@@ -145,27 +150,26 @@ class OllamaClient:
         if json_mode:
             payload["format"] = "json"
 
-        async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT) as client:
-            response = await client.post(
-                f"{self.base_url}/chat",
-                json=payload,
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data.get("message", {}).get("content", "").strip()
+        response = await self._http().post(
+            f"{self.base_url}/chat",
+            json=payload,
+            timeout=REQUEST_TIMEOUT,
+        )
+        response.raise_for_status()
+        data = response.json()
+        return data.get("message", {}).get("content", "").strip()
 
     async def health_check(self) -> bool:
         """Check if Ollama is running and the model is available."""
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(f"{self.host}/api/tags")
-                response.raise_for_status()
-                models = response.json().get("models", [])
-                available = [m["name"] for m in models]
-                if self.model in available or any(self.model in m for m in available):
-                    return True
-                logger.warning(f"Model '{self.model}' not found. Available: {available}")
-                return False
+            response = await self._http().get(f"{self.host}/api/tags", timeout=10.0)
+            response.raise_for_status()
+            models = response.json().get("models", [])
+            available = [m["name"] for m in models]
+            if self.model in available or any(self.model in m for m in available):
+                return True
+            logger.warning(f"Model '{self.model}' not found. Available: {available}")
+            return False
         except Exception as e:
             logger.error(f"Ollama health check failed: {e}")
             return False
@@ -0,0 +1,74 @@
+"""
+ClawtBot — Hedged LLM Requests
+Bookkeeping for the Master Agent's hedging mode: when the provider being
+waited on is slower than its own recent p95, the next healthy provider is
+fired in parallel and the first valid reply wins.
+
+Hedges against paid providers are capped per rolling minute so a slow local
+model cannot turn every chat turn into several cloud calls.
+"""
+
+import logging
+import time
+from collections import Counter, deque
+from typing import Deque
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+FREE_PROVIDERS = {"ollama"}
+BUDGET_WINDOW = 60.0  # seconds
+
+
+class HedgeController:
+    """Hedge delay, paid-call budget and win counters."""
+
+    def __init__(self):
+        self._paid_hedges: Deque[float] = deque()
+        self.hedges_fired = 0
+        self.budget_denied = 0
+        self.hedged_turns = 0
+        self.wins: Counter = Counter()
+
+    def delay_for(self, provider_name: str, model: str) -> float:
+        """Seconds to wait on a provider before hedging: its windowed p95, clamped."""
+        from brain.circuit_breaker import llm_breakers
+        latency = llm_breakers.get(provider_name, model).latency_percentile(
+            settings.llm_hedge_percentile,
+        )
+        if latency is None:
+            latency = settings.llm_hedge_default_delay
+        return min(max(latency, settings.llm_hedge_min_delay), settings.llm_hedge_max_delay)
+
+    def try_hedge(self, provider_name: str) -> bool:
+        """Reserve a hedge to this provider, honouring the paid-call budget."""
+        if provider_name not in FREE_PROVIDERS:
+            now = time.monotonic()
+            while self._paid_hedges and self._paid_hedges[0] < now - BUDGET_WINDOW:
+                self._paid_hedges.popleft()
+            if len(self._paid_hedges) >= settings.llm_hedge_max_paid_per_minute:
+                self.budget_denied += 1
+                return False
+            self._paid_hedges.append(now)
+        self.hedges_fired += 1
+        return True
+
+    def record_win(self, provider_name: str, hedged: bool):
+        self.wins[provider_name] += 1
+        if hedged:
+            self.hedged_turns += 1
+
+    def stats(self) -> dict:
+        return {
+            "enabled": settings.llm_hedging_enabled,
+            "hedges_fired": self.hedges_fired,
+            "hedged_turns": self.hedged_turns,
+            "budget_denied": self.budget_denied,
+            "paid_hedges_last_minute": len(self._paid_hedges),
+            "wins": dict(self.wins),
+        }
+
+
+# ─── Singleton ──────────────────────────────────────────────────────────────
+llm_hedging = HedgeController()
@@ -0,0 +1,354 @@
+"""
+ClawtBot — LLM Admission Control
+Bounds how many requests each provider gets at once, so a calendar upload
+plus a few chat users cannot saturate a local Ollama box and time out
+every request.
+
+Each provider has an AdmissionController: at most `max_in_flight` calls run,
+up to `max_waiting` more wait in a priority queue, and anything beyond that
+is rejected immediately. Interactive chat jumps ahead of batch calendar work.
+
+Priority is carried by a context variable, so entry points (the /chat
+endpoints, Celery tasks) set it once and every LLM call underneath inherits it.
+
+The in-process queue only sees one event loop of one process. With
+`settings.llm_admission_redis_enabled` the limit is also enforced across
+every API and Celery worker by `SharedAdmission` (Redis): slots are leases
+in a sorted set, and waiters from all processes queue in priority order, so
+API chat still goes ahead of calendar batches running in a worker. While
+Redis is unreachable admission falls back to the per-process limit.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import time
+import uuid
+import weakref
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import List, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# ─── Priority classes (lower runs first) ───────────────────────────────────
+PRIORITY_INTERACTIVE = 0
+PRIORITY_NORMAL = 1
+PRIORITY_BATCH = 2
+
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_NORMAL: "normal",
+    PRIORITY_BATCH: "batch",
+}
+
+llm_priority: ContextVar[int] = ContextVar("llm_priority", default=PRIORITY_NORMAL)
+
+
+class LLMOverloadedError(Exception):
+    """Raised when a provider's wait queue is full or the wait timed out."""
+
+
+class _LoopState:
+    """Admission state for one event loop (futures cannot cross loops)."""
+
+    def __init__(self):
+        self.in_flight = 0
+        # heap of [priority, seq, future]
+        self.waiters: List[list] = []
+
+
+# ─── Shared (cross-process) admission ───────────────────────────────────────
+
+KEY_PREFIX = "clawtbot:llm_admission:"
+REDIS_RETRY_AFTER = 30.0  # seconds to skip Redis after an error
+PRIORITY_SCALE = 1e13  # waiter score = priority * scale + enqueue time (ms)
+
+# KEYS: holders, waiters, waiter heartbeats
+# ARGV: token, limit, lease seconds, waiter score, stale waiter seconds
+_ACQUIRE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local token, limit, lease = ARGV[1], tonumber(ARGV[2]), tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+for _, gone in ipairs(redis.call('ZRANGEBYSCORE', KEYS[3], '-inf', now - tonumber(ARGV[5]))) do
+    redis.call('ZREM', KEYS[2], gone)
+    redis.call('ZREM', KEYS[3], gone)
+end
+redis.call('ZADD', KEYS[2], 'NX', tonumber(ARGV[4]), token)
+redis.call('ZADD', KEYS[3], now, token)
+local ttl = math.ceil(lease + tonumber(ARGV[5])) * 2
+for i = 1, 3 do redis.call('EXPIRE', KEYS[i], ttl) end
+local free = limit - redis.call('ZCARD', KEYS[1])
+if free > 0 and redis.call('ZRANK', KEYS[2], token) < free then
+    redis.call('ZREM', KEYS[2], token)
+    redis.call('ZREM', KEYS[3], token)
+    redis.call('ZADD', KEYS[1], now + lease, token)
+    return 1
+end
+return 0
+"""
+
+# KEYS: holders; ARGV: token, lease seconds
+_RENEW_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+return redis.call('ZADD', KEYS[1], 'XX', 'CH', now + tonumber(ARGV[2]), ARGV[1])
+"""
+
+
+class SharedAdmission:
+    """
+    Provider-wide slots shared by every process through Redis. A slot is a
+    lease (renewed while held, so a crashed worker's slot frees itself);
+    waiters poll their rank in a priority-ordered sorted set.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        key = KEY_PREFIX + name
+        self._keys = [key + ":holders", key + ":waiters", key + ":seen"]
+        self._down_until = 0.0
+        # Metrics
+        self.waits = 0
+        self.fallbacks = 0
+
+    def available(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def _failed(self, e: Exception):
+        logger.warning(f"{self.name}: shared LLM admission unavailable, using per-process limit: {e}")
+        self._down_until = time.monotonic() + REDIS_RETRY_AFTER
+        self.fallbacks += 1
+
+    @asynccontextmanager
+    async def slot(self, priority: int, limit: int, timeout: float):
+        """
+        Hold a provider-wide slot for the block. Raises LLMOverloadedError
+        after `timeout`; if Redis fails, the block runs on the local limit.
+        """
+        from utils.redis_client import get_redis
+
+        if not self.available():
+            yield
+            return
+        client = get_redis()
+        token = uuid.uuid4().hex
+        lease = settings.llm_admission_lease
+        acquired = False
+        try:
+            acquired = await self._acquire(client, token, priority, limit, timeout, lease)
+        except LLMOverloadedError:
+            raise
+        except asyncio.CancelledError:
+            await self._forget(client, token)
+            raise
+        except Exception as e:
+            self._failed(e)
+        if not acquired:
+            yield
+            return
+
+        renewer = asyncio.ensure_future(self._renew(client, token, lease))
+        try:
+            yield
+        finally:
+            renewer.cancel()
+            await self._forget(client, token)
+
+    async def _acquire(self, client, token: str, priority: int, limit: int, timeout: float, lease: float) -> bool:
+        """Poll for a slot until granted (True) or `timeout` (LLMOverloadedError)."""
+        poll = settings.llm_admission_poll_interval
+        score = priority * PRIORITY_SCALE + time.time() * 1000
+        deadline = time.monotonic() + timeout
+        polls = 0
+        while not await client.eval(
+            _ACQUIRE_SCRIPT, 3, *self._keys, token, limit, lease, score, max(2.0, poll * 20),
+        ):
+            polls += 1
+            if time.monotonic() >= deadline:
+                await self._forget(client, token)
+                raise LLMOverloadedError(f"{self.name}: no shared slot free after {timeout:.0f}s")
+            await asyncio.sleep(poll * random.uniform(0.5, 1.5))
+        if polls:
+            self.waits += 1
+        return True
+
+    async def _renew(self, client, token: str, lease: float):
+        while True:
+            await asyncio.sleep(lease / 3)
+            try:
+                await client.eval(_RENEW_SCRIPT, 1, self._keys[0], token, lease)
+            except Exception as e:
+                logger.debug(f"{self.name}: admission lease renewal failed: {e}")
+
+    async def _forget(self, client, token: str):
+        """Drop our lease / place in the queue (best effort; leases expire anyway)."""
+        try:
+            pipe = client.pipeline(transaction=False)
+            for key in self._keys:
+                pipe.zrem(key, token)
+            await asyncio.shield(pipe.execute())
+        except Exception as e:
+            logger.debug(f"{self.name}: admission release failed: {e}")
+
+
+# ─── Per-provider controller ────────────────────────────────────────────────
+
+class AdmissionController:
+    """
+    Max in-flight + bounded priority wait queue for one provider, optionally
+    backed by a `SharedAdmission` that applies the same limit across processes.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_in_flight: int,
+        max_waiting: int,
+        wait_timeout: float,
+        shared: Optional[SharedAdmission] = None,
+    ):
+        self.name = name
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_waiting = max_waiting
+        self.wait_timeout = wait_timeout
+        self.shared = shared
+        self._states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._seq = itertools.count()
+        # Metrics
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.waits = 0  # admitted after queueing
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        state = self._states.get(loop)
+        if state is None:
+            state = self._states[loop] = _LoopState()
+        return state
+
+    @asynccontextmanager
+    async def slot(self, priority: Optional[int] = None):
+        """Hold one in-flight slot (and the shared slot, if any) for the block."""
+        if priority is None:
+            priority = llm_priority.get()
+        await self.acquire(priority)
+        try:
+            if self.shared is None:
+                yield
+            else:
+                async with self.shared.slot(priority, self.max_in_flight, self.wait_timeout):
+                    yield
+        finally:
+            self.release()
+
+    async def acquire(self, priority: Optional[int] = None):
+        state = self._state()
+        if state.in_flight < self.max_in_flight and not state.waiters:
+            state.in_flight += 1
+            self.admitted += 1
+            return
+
+        if len(state.waiters) >= self.max_waiting:
+            self.rejected += 1
+            raise LLMOverloadedError(
+                f"{self.name}: {len(state.waiters)} requests already waiting"
+            )
+
+        if priority is None:
+            priority = llm_priority.get()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(state.waiters, [priority, next(self._seq), future])
+        self.queued += 1
+        started = time.monotonic()
+
+        try:
+            await asyncio.wait_for(future, timeout=self.wait_timeout)
+        except BaseException as e:
+            if future.done() and not future.cancelled():
+                # The slot was handed to us just as we gave up — pass it on.
+                self.release()
+            else:
+                future.cancel()
+                self._discard_cancelled(state)
+            if isinstance(e, asyncio.TimeoutError):
+                self.timeouts += 1
+                raise LLMOverloadedError(
+                    f"{self.name}: no slot free after {self.wait_timeout:.0f}s"
+                ) from None
+            raise
+
+        waited = time.monotonic() - started
+        self.admitted += 1
+        self.waits += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+
+    def release(self):
+        """Free a slot, handing it straight to the highest-priority waiter."""
+        state = self._state()
+        while state.waiters:
+            _, _, future = heapq.heappop(state.waiters)
+            if not future.done():
+                future.set_result(None)  # slot transfers; in_flight unchanged
+                return
+        state.in_flight = max(0, state.in_flight - 1)
+
+    def set_limit(self, max_in_flight: int):
+        """Change the concurrency limit, admitting waiters if it grew."""
+        self.max_in_flight = max(1, max_in_flight)
+        for state in list(self._states.values()):
+            while state.in_flight < self.max_in_flight and state.waiters:
+                _, _, future = heapq.heappop(state.waiters)
+                if not future.done():
+                    state.in_flight += 1
+                    future.set_result(None)
+
+    @staticmethod
+    def _discard_cancelled(state: _LoopState):
+        state.waiters = [w for w in state.waiters if not w[2].done()]
+        heapq.heapify(state.waiters)
+
+    def stats(self) -> dict:
+        try:
+            state = self._states.get(asyncio.get_running_loop())
+        except RuntimeError:
+            state = None
+        waiting = state.waiters if state else []
+        by_priority = {name: 0 for name in PRIORITY_NAMES.values()}
+        for priority, _, future in waiting:
+            if not future.done():
+                name = PRIORITY_NAMES.get(priority, str(priority))
+                by_priority[name] = by_priority.get(name, 0) + 1
+        avg_wait = self.total_wait / self.waits if self.waits else 0.0
+        if self.shared is None:
+            scope = "process"
+        else:
+            scope = "shared" if self.shared.available() else "process (redis unavailable)"
+        return {
+            "scope": scope,
+            "max_in_flight": self.max_in_flight,
+            "max_waiting": self.max_waiting,
+            "in_flight": state.in_flight if state else 0,
+            "queue_depth": sum(by_priority.values()),
+            "queue_by_priority": by_priority,
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": round(avg_wait * 1000, 1),
+            "max_wait_ms": round(self.max_wait * 1000, 1),
+            "shared_waits": self.shared.waits if self.shared else 0,
+            "shared_fallbacks": self.shared.fallbacks if self.shared else 0,
+        }
@@ -4,8 +4,15 @@ Routes agent LLM requests to the correct provider based on per-agent configurati
 Falls back to default Ollama if no override is set.
 """
 
+import asyncio
+import json
 import logging
-from typing import Optional, Dict
+import time
+import uuid
+import weakref
+from typing import Any, Awaitable, Callable, Optional, Dict, Tuple
+from brain.circuit_breaker import llm_breakers
+from brain.llm_limiter import AdmissionController, SharedAdmission
 from brain.providers import BaseLLMProvider
 from brain.providers.ollama_provider import OllamaProvider
 from brain.providers.openai_provider import OpenAIProvider
@@ -25,6 +32,10 @@ AGENT_IDS = [
     "master_agent",
 ]
 
+# Redis channel used to propagate settings changes across API/Celery processes
+CONFIG_INVALIDATION_CHANNEL = "clawtbot:llm_config:invalidate"
+LISTENER_RETRY_DELAY = 5.0  # seconds between re-subscribe attempts after a listener error
+
 # ─── Provider registry ─────────────────────────────────────────────────────
 PROVIDER_MODELS: Dict[str, list] = {
     "ollama": ["llama3", "llama3.1", "llama3.2", "mistral", "gemma2", "phi3", "codellama", "deepseek-r1"],
@@ -70,14 +81,32 @@ class LLMRouter:
     """
     Routes LLM requests to the correct provider based on agent configuration.
 
+    Agent overrides are loaded from the database in one async query and kept
+    as an in-memory snapshot for `settings.llm_config_cache_ttl` seconds.
+    Settings changes invalidate the snapshot locally and broadcast the
+    invalidation to every other API/Celery process over Redis pub/sub.
+
     Usage:
         router = LLMRouter()
-        llm = router.get_provider("content_creator")
+        llm = await router.resolve_provider("content_creator")
         result = await llm.generate_json(...)
     """
 
     def __init__(self):
         self._cache: Dict[str, BaseLLMProvider] = {}
+        # agent_id → {"provider", "model", "api_key_encrypted"} (custom overrides only)
+        self._agent_configs: Dict[str, Dict[str, Optional[str]]] = {}
+        self._configs_loaded_at: Optional[float] = None
+        self._instance_id = uuid.uuid4().hex
+        self._pubsub_thread = None
+        # Credential registry: provider → decrypted API key (enabled providers)
+        self._credentials: Dict[str, str] = {}
+        self._credentials_loaded_at: Optional[float] = None
+        # (provider, model) → reusable instance for fallback/test paths
+        self._instances: Dict[Tuple[str, str], BaseLLMProvider] = {}
+        # provider → admission controller, and per-provider limits from the DB
+        self._limiters: Dict[str, AdmissionController] = {}
+        self._provider_limits: Dict[str, int] = {}
 
     def get_default_provider(self) -> BaseLLMProvider:
         """Get the default Ollama provider."""
@@ -89,86 +118,374 @@ class LLMRouter:
             )
         return self._cache["_default"]
 
+    async def resolve_provider(self, agent_id: str) -> BaseLLMProvider:
+        """
+        Get the LLM provider for an agent, refreshing the config snapshot
+        from the database first if it is missing or older than the TTL.
+        The provider is bound to the agent, which selects its cache policy.
+        """
+        try:
+            await self.refresh_agent_configs()
+        except Exception as e:
+            logger.warning(f"Failed to refresh LLM agent configs, using last snapshot: {e}")
+        return self.get_provider(agent_id).for_agent(agent_id)
+
     def get_provider(self, agent_id: str) -> BaseLLMProvider:
         """
-        Get the LLM provider for a specific agent.
+        Get the LLM provider for a specific agent from the current snapshot.
         Returns the configured override, or falls back to default Ollama.
+        Async callers should prefer `resolve_provider()`, which keeps the
+        snapshot fresh.
         """
         if agent_id in self._cache:
-            return self._cache[agent_id]
+            return self._healthy_or_default(agent_id, self._cache[agent_id])
 
-        # Try to load from database config
         try:
             provider = self._load_agent_config(agent_id)
             if provider:
                 self._cache[agent_id] = provider
-                return provider
+                return self._healthy_or_default(agent_id, provider)
         except Exception as e:
             logger.warning(f"Failed to load LLM config for {agent_id}, using default: {e}")
 
         return self.get_default_provider()
 
-    def _load_agent_config(self, agent_id: str) -> Optional[BaseLLMProvider]:
-        """Load agent-specific LLM config from DB (sync)."""
-        try:
-            from sqlalchemy import create_engine, select
-            from sqlalchemy.orm import Session
-            from config import settings
-            from db.settings_models import AgentModelConfig, LLMProviderConfig
-            from utils.crypto import decrypt_value
+    def _healthy_or_default(self, agent_id: str, provider: BaseLLMProvider) -> BaseLLMProvider:
+        """Route around an override whose circuit is open, if the default is healthy."""
+        if llm_breakers.is_available(provider.provider_name, provider.model):
+            return provider
+        default = self.get_default_provider()
+        if default is not provider and llm_breakers.is_available(default.provider_name, default.model):
+            logger.info(f"{agent_id}: {provider.provider_name} circuit open, routing to default")
+            return default
+        return provider
 
-            sync_url = settings.database_url.replace("+asyncpg", "").replace("postgresql://", "postgresql://")
-            engine = create_engine(sync_url)
+    def _configs_are_fresh(self) -> bool:
+        from config import settings
+        if self._configs_loaded_at is None:
+            return False
+        return time.monotonic() - self._configs_loaded_at < settings.llm_config_cache_ttl
 
-            with Session(engine) as session:
-                # Get agent config
-                agent_cfg = session.execute(
-                    select(AgentModelConfig).where(AgentModelConfig.agent_id == agent_id)
-                ).scalar_one_or_none()
+    async def refresh_agent_configs(self, force: bool = False):
+        """Load every custom agent override (and its provider key) in one query."""
+        if not force and self._configs_are_fresh():
+            return
 
-                if not agent_cfg or not agent_cfg.is_custom:
-                    return None
+        from sqlalchemy import select
+        from db.database import async_session
+        from db.settings_models import AgentModelConfig, LLMProviderConfig
 
-                provider_name = agent_cfg.provider
-                model = agent_cfg.model
+        async with async_session() as session:
+            result = await session.execute(
+                select(
+                    AgentModelConfig.agent_id,
+                    AgentModelConfig.provider,
+                    AgentModelConfig.model,
+                    LLMProviderConfig.api_key_encrypted,
+                )
+                .outerjoin(
+                    LLMProviderConfig,
+                    LLMProviderConfig.provider == AgentModelConfig.provider,
+                )
+                .where(AgentModelConfig.is_custom == True)  # noqa: E712
+            )
+            configs = {
+                row.agent_id: {
+                    "provider": row.provider,
+                    "model": row.model,
+                    "api_key_encrypted": row.api_key_encrypted,
+                }
+                for row in result.all()
+            }
+            limits_result = await session.execute(
+                select(LLMProviderConfig.provider, LLMProviderConfig.max_concurrency)
+                .where(LLMProviderConfig.max_concurrency.isnot(None))
+            )
+            limits = {row.provider: row.max_concurrency for row in limits_result.all()}
 
-                if provider_name == "ollama":
-                    return OllamaProvider(
-                        host=settings.ollama_host,
-                        model=model,
-                    )
+        if configs != self._agent_configs:
+            # Drop providers built from the old snapshot; keep the default.
+            default = self._cache.get("_default")
+            self._cache.clear()
+            if default is not None:
+                self._cache["_default"] = default
+        self._agent_configs = configs
+        self._configs_loaded_at = time.monotonic()
 
-                # Get provider API key
-                provider_cfg = session.execute(
-                    select(LLMProviderConfig).where(
-                        LLMProviderConfig.provider == provider_name
-                    )
-                ).scalar_one_or_none()
+        if limits != self._provider_limits:
+            self._provider_limits = limits
+            for name, limiter in self._limiters.items():
+                limiter.set_limit(self.provider_limit(name))
+
+    def _load_agent_config(self, agent_id: str) -> Optional[BaseLLMProvider]:
+        """Build the agent's override provider from the loaded snapshot (no I/O)."""
+        cfg = self._agent_configs.get(agent_id)
+        if not cfg:
+            return None
 
-                if not provider_cfg or not provider_cfg.api_key_encrypted:
-                    logger.warning(f"No API key for provider {provider_name}")
-                    return None
+        provider_name = cfg["provider"]
+        model = cfg["model"]
 
-                api_key = decrypt_value(provider_cfg.api_key_encrypted)
-                return create_provider(provider_name, model, api_key=api_key)
+        if provider_name == "ollama":
+            return create_provider("ollama", model)
 
-            engine.dispose()
-        except Exception as e:
-            logger.debug(f"Could not load agent config from DB: {e}")
+        if not cfg["api_key_encrypted"]:
+            logger.warning(f"No API key for provider {provider_name}")
             return None
 
-    def invalidate_cache(self, agent_id: Optional[str] = None):
-        """Clear cached providers. Called when settings change."""
+        from utils.crypto import decrypt_value
+        api_key = decrypt_value(cfg["api_key_encrypted"])
+        return create_provider(provider_name, model, api_key=api_key)
+
+    # ── Credential / provider registry ─────────────────────────────────
+
+    def _credentials_are_fresh(self) -> bool:
+        from config import settings
+        if self._credentials_loaded_at is None:
+            return False
+        return time.monotonic() - self._credentials_loaded_at < settings.llm_credentials_cache_ttl
+
+    async def refresh_credentials(self, force: bool = False):
+        """Load and decrypt the API keys of every enabled provider in one query."""
+        if not force and self._credentials_are_fresh():
+            return
+
+        from sqlalchemy import select
+        from db.database import async_session
+        from db.settings_models import LLMProviderConfig
+        from utils.crypto import decrypt_value
+
+        async with async_session() as session:
+            result = await session.execute(
+                select(LLMProviderConfig.provider, LLMProviderConfig.api_key_encrypted)
+                .where(
+                    LLMProviderConfig.api_key_encrypted.isnot(None),
+                    LLMProviderConfig.is_enabled != False,  # noqa: E712
+                )
+            )
+            rows = result.all()
+
+        credentials = {}
+        for row in rows:
+            try:
+                credentials[row.provider] = decrypt_value(row.api_key_encrypted)
+            except Exception as e:
+                logger.warning(f"Could not decrypt API key for {row.provider}: {e}")
+
+        if credentials != self._credentials:
+            self._instances.clear()
+        self._credentials = credentials
+        self._credentials_loaded_at = time.monotonic()
+
+    async def provider_for(
+        self,
+        provider_name: str,
+        model: Optional[str] = None,
+    ) -> Optional[BaseLLMProvider]:
+        """
+        Get a reusable provider instance by name (default model if omitted).
+        Returns None when a cloud provider has no enabled API key.
+        """
+        if model is None:
+            from config import settings
+            model = settings.ollama_model if provider_name == "ollama" else PROVIDER_MODELS[provider_name][0]
+
+        instance = self._instances.get((provider_name, model))
+        if instance is not None and self._credentials_are_fresh():
+            return instance
+
+        if provider_name != "ollama":
+            await self.refresh_credentials()
+            api_key = self._credentials.get(provider_name)
+            if not api_key:
+                return None
+        else:
+            api_key = None
+
+        instance = self._instances.get((provider_name, model))
+        if instance is None:
+            instance = create_provider(provider_name, model, api_key=api_key)
+            self._instances[(provider_name, model)] = instance
+        return instance
+
+    # ── Admission control ──────────────────────────────────────────────
+
+    def provider_limit(self, provider_name: str) -> int:
+        """Max concurrent calls for a provider: its DB row override, else config.py."""
+        from config import settings
+        if provider_name in self._provider_limits:
+            return self._provider_limits[provider_name]
+        return settings.llm_provider_max_concurrency.get(
+            provider_name, settings.llm_default_max_concurrency,
+        )
+
+    def admission(self, provider_name: str) -> AdmissionController:
+        """Get the admission controller that bounds calls to a provider."""
+        limiter = self._limiters.get(provider_name)
+        if limiter is None:
+            from config import settings
+            limiter = AdmissionController(
+                provider_name,
+                max_in_flight=self.provider_limit(provider_name),
+                max_waiting=settings.llm_queue_max_waiting,
+                wait_timeout=settings.llm_queue_timeout,
+                shared=SharedAdmission(provider_name) if settings.llm_admission_redis_enabled else None,
+            )
+            self._limiters[provider_name] = limiter
+        return limiter
+
+    def admission_stats(self) -> Dict[str, dict]:
+        return {name: limiter.stats() for name, limiter in self._limiters.items()}
+
+    def invalidate_cache(self, agent_id: Optional[str] = None, broadcast: bool = True):
+        """
+        Clear cached providers and mark the config snapshot stale.
+        Called when settings change; other processes are notified via Redis
+        unless `broadcast` is False (i.e. we are handling a remote message).
+        """
         if agent_id:
             self._cache.pop(agent_id, None)
         else:
             self._cache.clear()
+            self._credentials.clear()
+            self._instances.clear()
+            self._credentials_loaded_at = None
+        self._configs_loaded_at = None
+
+        if broadcast:
+            self._publish_invalidation(agent_id)
+
+    # ── Cross-process invalidation (Redis pub/sub) ─────────────────────
+
+    def _publish_invalidation(self, agent_id: Optional[str]):
+        try:
+            from utils.redis_client import get_sync_redis
+            message = json.dumps({"origin": self._instance_id, "agent_id": agent_id})
+            get_sync_redis().publish(CONFIG_INVALIDATION_CHANNEL, message)
+        except Exception as e:
+            logger.debug(f"Could not broadcast LLM config invalidation: {e}")
+
+    def _on_invalidation_message(self, message: dict):
+        try:
+            payload = json.loads(message["data"])
+        except (KeyError, TypeError, ValueError):
+            return
+        if payload.get("origin") == self._instance_id:
+            return
+        logger.info(f"LLM config invalidated remotely (agent={payload.get('agent_id') or 'all'})")
+        self.invalidate_cache(payload.get("agent_id"), broadcast=False)
+
+    def _on_listener_error(self, exc: BaseException, pubsub, thread):
+        """
+        Keep the listener thread alive on Redis errors: wait, re-subscribe,
+        and mark the config stale since invalidations sent meanwhile are lost.
+        """
+        logger.warning(f"LLM config invalidation listener error, re-subscribing: {exc}")
+        time.sleep(LISTENER_RETRY_DELAY)
+        try:
+            pubsub.subscribe(**{CONFIG_INVALIDATION_CHANNEL: self._on_invalidation_message})
+        except Exception as e:
+            logger.debug(f"LLM config invalidation re-subscribe failed: {e}")
+            return
+        self.invalidate_cache(broadcast=False)
+
+    def start_invalidation_listener(self):
+        """Subscribe to config invalidations from other processes (background thread)."""
+        if self._pubsub_thread is not None:
+            if self._pubsub_thread.is_alive():
+                return
+            self._pubsub_thread = None  # died anyway; start a new one
+        try:
+            from utils.redis_client import get_sync_redis
+            pubsub = get_sync_redis().pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{CONFIG_INVALIDATION_CHANNEL: self._on_invalidation_message})
+            self._pubsub_thread = pubsub.run_in_thread(
+                sleep_time=1.0, daemon=True, exception_handler=self._on_listener_error,
+            )
+            logger.info("Listening for LLM config invalidations")
+        except Exception as e:
+            logger.warning(f"LLM config invalidation listener unavailable: {e}")
+
+    def stop_invalidation_listener(self):
+        """Stop the pub/sub listener thread, if running."""
+        if self._pubsub_thread is not None:
+            self._pubsub_thread.stop()
+            self._pubsub_thread = None
+
+
+# ─── Request Coalescing ─────────────────────────────────────────────────────
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical LLM calls onto one in-flight provider call.
+
+    The first caller for a key starts the call as a task; callers arriving
+    while it runs await the same task and get its result (or its exception).
+    A waiter being cancelled never cancels the shared call for the others —
+    it is only cancelled once every waiter has gone away.
+
+    Tasks are bound to their event loop (Celery tasks run their own loops),
+    so in-flight calls are tracked per loop.
+    """
+
+    def __init__(self):
+        # loop → { key → (task, [waiter count]) }
+        self._calls: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, list]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        calls = self._calls.setdefault(loop, {})
+
+        entry = calls.get(key)
+        if entry is None:
+            task = loop.create_task(fn())
+            entry = [task, 0]
+            calls[key] = entry
+            task.add_done_callback(lambda _t: calls.pop(key, None))
+            self.leaders += 1
+        else:
+            self.coalesced += 1
+
+        task = entry[0]
+        entry[1] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if entry[1] == 1 and not task.done():
+                task.cancel()
+            raise
+        finally:
+            entry[1] -= 1
+
+    def in_flight(self) -> int:
+        try:
+            return len(self._calls.get(asyncio.get_running_loop(), {}))
+        except RuntimeError:
+            return 0
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight(),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+        }
 
 
 # ─── Singleton ──────────────────────────────────────────────────────────────
 llm_router = LLMRouter()
+llm_single_flight = SingleFlight()
 
 
 def get_llm(agent_id: str) -> BaseLLMProvider:
     """Convenience function to get the LLM provider for an agent."""
     return llm_router.get_provider(agent_id)
+
+
+async def resolve_llm(agent_id: str) -> BaseLLMProvider:
+    """Async convenience: get the agent's provider with a fresh config snapshot."""
+    return await llm_router.resolve_provider(agent_id)
@@ -32,6 +32,33 @@ Rules:
 - CTA should drive engagement (comment, share, save)
 """
 
+CONTENT_CREATOR_MULTI_PROMPT = """Create a high-engagement post about the following topic for EACH of these platforms: {platforms}
+
+Topic: {topic}
+Tone: {tone}
+
+Write a separate version for every platform, adapted to its audience and format.
+Respond with one JSON object keyed by platform name, exactly like this:
+{{
+    "<platform>": {{
+        "caption": "The main post caption (platform-appropriate length)",
+        "hook": "An attention-grabbing opening line",
+        "cta": "A clear call-to-action",
+        "post_text": "The complete post text ready to publish (including the hook, body, and CTA combined)"
+    }}
+}}
+
+Rules:
+- Include every platform listed above as a key, and no others
+- For Instagram: Keep caption under 2200 chars, use emotional hooks
+- For Twitter/X: Keep post_text under 230 chars (hashtags are added later), be punchy and direct
+- For LinkedIn: Professional, under 3000 chars, short paragraphs
+- For Facebook: Can be longer, conversational tone
+- For YouTube: Focus on description and engagement
+- Make the hook irresistible — first 3 seconds matter
+- CTA should drive engagement (comment, share, save)
+"""
+
 # ─── Agent 2: Hashtag Generator ─────────────────────────────────────────────
 
 HASHTAG_SYSTEM = """You are a hashtag research specialist for social media marketing.
@@ -55,6 +82,27 @@ Rules:
 - Mix trending and evergreen hashtags
 """
 
+HASHTAG_MULTI_PROMPT = """Generate optimal hashtags for a post about: {topic}
+Target platforms: {platforms}
+
+Respond with one JSON object keyed by platform name, exactly like this:
+{{
+    "<platform>": {{
+        "niche_hashtags": ["#hashtag1", "#hashtag2", ... ],
+        "broad_hashtags": ["#hashtag1", "#hashtag2", ... ]
+    }}
+}}
+
+Rules:
+- Include every platform listed above as a key, and no others
+- Niche hashtags are specific to the topic (10K-500K posts); broad ones have wider reach (500K+ posts)
+- For Instagram: 10 niche + 10 broad
+- For Twitter and LinkedIn: 3-5 total
+- For other platforms: up to 5 niche + 5 broad
+- No banned or shadowbanned hashtags
+- Mix trending and evergreen hashtags
+"""
+
 # ─── Agent 3: Review Agent ──────────────────────────────────────────────────
 
 REVIEW_SYSTEM = """You are a senior content editor and compliance reviewer.
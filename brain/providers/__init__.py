@@ -3,10 +3,13 @@ ClawtBot — LLM Provider Abstraction
 Base class for all LLM providers (Ollama, OpenAI, Gemini, Anthropic, Groq).
 """
 
+import copy
 import json
 import logging
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import AsyncIterator, Optional
+
+import httpx
 
 logger = logging.getLogger(__name__)
 
@@ -15,8 +18,41 @@ class BaseLLMProvider(ABC):
     """Abstract base class for LLM providers."""
 
     provider_name: str = "base"
+    model: str = ""
+    supports_http2: bool = False
+    request_timeout: float = 60.0
+    # Agent this instance serves — selects the response-cache policy
+    agent_id: Optional[str] = None
+
+    def for_agent(self, agent_id: Optional[str]) -> "BaseLLMProvider":
+        """Return a shallow copy bound to an agent (shares config and HTTP pool)."""
+        if agent_id == self.agent_id:
+            return self
+        bound = copy.copy(self)
+        bound.agent_id = agent_id
+        return bound
+
+    def _http(self) -> httpx.AsyncClient:
+        """Pooled keep-alive client shared by every instance of this provider."""
+        from brain.http_pool import get_http_client
+        return get_http_client(
+            self.provider_name,
+            http2=self.supports_http2,
+            timeout=self.request_timeout,
+        )
+
+    def _breaker(self):
+        """This provider/model's shared circuit breaker (probed via health_check)."""
+        from brain.circuit_breaker import llm_breakers
+        breaker = llm_breakers.get(self.provider_name, self.model)
+        breaker.probe = self.health_check
+        return breaker
+
+    async def aclose(self):
+        """Close this provider's connection pool on the running event loop."""
+        from brain.http_pool import close_http_client
+        await close_http_client(self.provider_name)
 
-    @abstractmethod
     async def generate(
         self,
         prompt: str,
@@ -25,26 +61,150 @@ class BaseLLMProvider(ABC):
         max_tokens: int = 2048,
         json_mode: bool = False,
     ) -> str:
-        """Generate a text completion."""
+        """
+        Generate a text completion.
+        Served from the response cache when this provider is bound to an
+        agent whose cache policy allows it; concurrent identical calls are
+        coalesced onto one provider call (`_generate()`), which is rejected
+        immediately while the provider's circuit is open and otherwise waits
+        for a slot from the provider's admission controller.
+        """
+        from brain.llm_cache import llm_cache
+        from brain.llm_router import llm_router, llm_single_flight
+
+        key = llm_cache.make_key(
+            self.provider_name, self.model, system_prompt, prompt,
+            temperature, json_mode, max_tokens,
+        )
+        ttl = llm_cache.ttl_for(self.agent_id, temperature)
+        if ttl:
+            cached = await llm_cache.get(key, ttl)
+            if cached is not None:
+                return cached
+
+        async def call() -> str:
+            breaker = self._breaker()
+            breaker.ensure_available()
+            async with llm_router.admission(self.provider_name).slot():
+                async with breaker.guard():
+                    text = await self._generate(
+                        prompt=prompt,
+                        system_prompt=system_prompt,
+                        temperature=temperature,
+                        max_tokens=max_tokens,
+                        json_mode=json_mode,
+                    )
+            if ttl and self._is_cacheable(text, json_mode):
+                await llm_cache.set(key, text, ttl)
+            return text
+
+        return await llm_single_flight.do(key, call)
+
+    @abstractmethod
+    async def _generate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        json_mode: bool = False,
+    ) -> str:
+        """Call the provider API — implemented by each provider."""
         pass
 
+    @classmethod
+    def _is_cacheable(cls, text: str, json_mode: bool) -> bool:
+        """Never cache empty output, or JSON-mode output that does not parse."""
+        if not text:
+            return False
+        if json_mode:
+            try:
+                cls._parse_json(text)
+            except ValueError:
+                return False
+        return True
+
+    async def stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        json_mode: bool = False,
+    ) -> AsyncIterator[str]:
+        """
+        Yield completion text chunks as the provider produces them, holding
+        an admission slot for the whole stream.
+        Providers without a streaming API yield the full completion once.
+        """
+        kwargs = dict(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            json_mode=json_mode,
+        )
+        if type(self)._stream is BaseLLMProvider._stream:
+            yield await self.generate(**kwargs)
+            return
+
+        from brain.llm_router import llm_router
+
+        breaker = self._breaker()
+        breaker.ensure_available()
+        async with llm_router.admission(self.provider_name).slot():
+            async with breaker.guard(track_latency=False):
+                async for token in self._stream(**kwargs):
+                    yield token
+
+    async def _stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        json_mode: bool = False,
+    ) -> AsyncIterator[str]:
+        """Call the provider's streaming API — implemented by streaming providers."""
+        raise NotImplementedError
+        yield  # pragma: no cover — makes this an async generator
+
+    @staticmethod
+    async def _iter_sse(response: httpx.Response) -> AsyncIterator[str]:
+        """Yield the `data:` payloads of a Server-Sent Events response."""
+        async for line in response.aiter_lines():
+            if line.startswith("data:"):
+                data = line[5:].strip()
+                if data:
+                    yield data
+
     async def generate_json(
         self,
         prompt: str,
         system_prompt: Optional[str] = None,
         temperature: float = 0.7,
+        max_tokens: int = 2048,
     ) -> dict:
         """Generate and parse a JSON response."""
         raw = await self.generate(
             prompt=prompt,
             system_prompt=system_prompt,
             temperature=temperature,
+            max_tokens=max_tokens,
             json_mode=True,
         )
         try:
             return json.loads(raw)
         except json.JSONDecodeError:
             logger.warning(f"[{self.provider_name}] Failed to parse JSON, attempting extraction...")
+            return self._parse_json(raw)
+
+    @staticmethod
+    def _parse_json(raw: str) -> dict:
+        """Parse JSON, extracting it from a Markdown code block if needed."""
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError:
             if "```json" in raw:
                 raw = raw.split("```json")[1].split("```")[0].strip()
             elif "```" in raw:
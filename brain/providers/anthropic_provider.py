@@ -3,9 +3,9 @@ ClawtBot — Anthropic Provider
 Supports Claude Sonnet, Opus, Haiku.
 """
 
-import httpx
+import json
 import logging
-from typing import Optional
+from typing import AsyncIterator, Optional, Tuple
 
 from brain.providers import BaseLLMProvider
 
@@ -18,20 +18,21 @@ class AnthropicProvider(BaseLLMProvider):
     """Anthropic Claude API provider."""
 
     provider_name = "anthropic"
+    supports_http2 = True
+    request_timeout = REQUEST_TIMEOUT
     API_URL = "https://api.anthropic.com/v1/messages"
 
     def __init__(self, api_key: str, model: str = "claude-sonnet-4-20250514"):
         self.api_key = api_key
         self.model = model
 
-    async def generate(
+    def _build_request(
         self,
         prompt: str,
-        system_prompt: Optional[str] = None,
-        temperature: float = 0.7,
-        max_tokens: int = 2048,
-        json_mode: bool = False,
-    ) -> str:
+        system_prompt: Optional[str],
+        max_tokens: int,
+        json_mode: bool,
+    ) -> Tuple[dict, dict]:
         if json_mode and system_prompt:
             system_prompt += "\n\nYou MUST respond with valid JSON only. No markdown, no explanation."
         elif json_mode:
@@ -52,15 +53,52 @@ class AnthropicProvider(BaseLLMProvider):
             "anthropic-version": "2023-06-01",
             "Content-Type": "application/json",
         }
+        return payload, headers
+
+    async def _generate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        json_mode: bool = False,
+    ) -> str:
+        payload, headers = self._build_request(prompt, system_prompt, max_tokens, json_mode)
+
+        response = await self._http().post(
+            self.API_URL, json=payload, headers=headers, timeout=REQUEST_TIMEOUT,
+        )
+        response.raise_for_status()
+        data = response.json()
+        content = data.get("content", [])
+        if content:
+            return content[0].get("text", "").strip()
+        return ""
+
+    async def _stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        json_mode: bool = False,
+    ) -> AsyncIterator[str]:
+        """Stream tokens from `content_block_delta` Server-Sent Events."""
+        payload, headers = self._build_request(prompt, system_prompt, max_tokens, json_mode)
+        payload["stream"] = True
 
-        async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT) as client:
-            response = await client.post(self.API_URL, json=payload, headers=headers)
+        async with self._http().stream(
+            "POST", self.API_URL, json=payload, headers=headers, timeout=REQUEST_TIMEOUT,
+        ) as response:
             response.raise_for_status()
-            data = response.json()
-            content = data.get("content", [])
-            if content:
-                return content[0].get("text", "").strip()
-            return ""
+            async for data in self._iter_sse(response):
+                event = json.loads(data)
+                if event.get("type") == "content_block_delta":
+                    token = event.get("delta", {}).get("text")
+                    if token:
+                        yield token
+                elif event.get("type") == "message_stop":
+                    break
 
     async def health_check(self) -> bool:
         try:
@@ -76,9 +114,10 @@ class AnthropicProvider(BaseLLMProvider):
                 "max_tokens": 10,
                 "messages": [{"role": "user", "content": "Hi"}],
             }
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                response = await client.post(self.API_URL, json=payload, headers=headers)
-                return response.status_code == 200
+            response = await self._http().post(
+                self.API_URL, json=payload, headers=headers, timeout=15.0,
+            )
+            return response.status_code == 200
         except Exception as e:
             logger.error(f"Anthropic health check failed: {e}")
             return False
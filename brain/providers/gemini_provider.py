@@ -3,9 +3,9 @@ ClawtBot — Google Gemini Provider
 Supports Gemini 2.0 Flash, Gemini 2.5 Pro, etc.
 """
 
-import httpx
+import json
 import logging
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 from brain.providers import BaseLLMProvider
 
@@ -18,20 +18,22 @@ class GeminiProvider(BaseLLMProvider):
     """Google Gemini API provider."""
 
     provider_name = "gemini"
+    supports_http2 = True
+    request_timeout = REQUEST_TIMEOUT
 
     def __init__(self, api_key: str, model: str = "gemini-2.0-flash"):
         self.api_key = api_key
         self.model = model
         self.base_url = "https://generativelanguage.googleapis.com/v1beta"
 
-    async def generate(
+    def _build_payload(
         self,
         prompt: str,
-        system_prompt: Optional[str] = None,
-        temperature: float = 0.7,
-        max_tokens: int = 2048,
-        json_mode: bool = False,
-    ) -> str:
+        system_prompt: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        json_mode: bool,
+    ) -> dict:
         contents = []
         if system_prompt:
             contents.append({
@@ -56,26 +58,58 @@ class GeminiProvider(BaseLLMProvider):
         }
         if json_mode:
             payload["generationConfig"]["responseMimeType"] = "application/json"
+        return payload
+
+    @staticmethod
+    def _extract_text(data: dict) -> str:
+        candidates = data.get("candidates", [])
+        if candidates:
+            parts = candidates[0].get("content", {}).get("parts", [])
+            if parts:
+                return parts[0].get("text", "")
+        return ""
 
+    async def _generate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        json_mode: bool = False,
+    ) -> str:
+        payload = self._build_payload(prompt, system_prompt, temperature, max_tokens, json_mode)
         url = f"{self.base_url}/models/{self.model}:generateContent?key={self.api_key}"
 
-        async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT) as client:
-            response = await client.post(url, json=payload)
+        response = await self._http().post(url, json=payload, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        return self._extract_text(response.json()).strip()
+
+    async def _stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        json_mode: bool = False,
+    ) -> AsyncIterator[str]:
+        """Stream tokens via `streamGenerateContent` in SSE mode."""
+        payload = self._build_payload(prompt, system_prompt, temperature, max_tokens, json_mode)
+        url = f"{self.base_url}/models/{self.model}:streamGenerateContent?alt=sse&key={self.api_key}"
+
+        async with self._http().stream(
+            "POST", url, json=payload, timeout=REQUEST_TIMEOUT,
+        ) as response:
             response.raise_for_status()
-            data = response.json()
-            candidates = data.get("candidates", [])
-            if candidates:
-                parts = candidates[0].get("content", {}).get("parts", [])
-                if parts:
-                    return parts[0].get("text", "").strip()
-            return ""
+            async for data in self._iter_sse(response):
+                token = self._extract_text(json.loads(data))
+                if token:
+                    yield token
 
     async def health_check(self) -> bool:
         try:
             url = f"{self.base_url}/models?key={self.api_key}"
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(url)
-                return response.status_code == 200
+            response = await self._http().get(url, timeout=10.0)
+            return response.status_code == 200
         except Exception as e:
             logger.error(f"Gemini health check failed: {e}")
             return False
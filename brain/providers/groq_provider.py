@@ -3,9 +3,9 @@ ClawtBot — Groq Provider
 Supports fast inference with Llama, Mixtral models.
 """
 
-import httpx
+import json
 import logging
-from typing import Optional
+from typing import AsyncIterator, Optional, Tuple
 
 from brain.providers import BaseLLMProvider
 
@@ -18,20 +18,22 @@ class GroqProvider(BaseLLMProvider):
     """Groq API provider (OpenAI-compatible)."""
 
     provider_name = "groq"
+    supports_http2 = True
+    request_timeout = REQUEST_TIMEOUT
     API_URL = "https://api.groq.com/openai/v1/chat/completions"
 
     def __init__(self, api_key: str, model: str = "llama-3.3-70b-versatile"):
         self.api_key = api_key
         self.model = model
 
-    async def generate(
+    def _build_request(
         self,
         prompt: str,
-        system_prompt: Optional[str] = None,
-        temperature: float = 0.7,
-        max_tokens: int = 2048,
-        json_mode: bool = False,
-    ) -> str:
+        system_prompt: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        json_mode: bool,
+    ) -> Tuple[dict, dict]:
         messages = []
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
@@ -50,12 +52,52 @@ class GroqProvider(BaseLLMProvider):
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
         }
+        return payload, headers
+
+    async def _generate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        json_mode: bool = False,
+    ) -> str:
+        payload, headers = self._build_request(
+            prompt, system_prompt, temperature, max_tokens, json_mode,
+        )
+
+        response = await self._http().post(
+            self.API_URL, json=payload, headers=headers, timeout=REQUEST_TIMEOUT,
+        )
+        response.raise_for_status()
+        data = response.json()
+        return data["choices"][0]["message"]["content"].strip()
+
+    async def _stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        json_mode: bool = False,
+    ) -> AsyncIterator[str]:
+        """Stream tokens via Server-Sent Events (`stream: true`)."""
+        payload, headers = self._build_request(
+            prompt, system_prompt, temperature, max_tokens, json_mode,
+        )
+        payload["stream"] = True
 
-        async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT) as client:
-            response = await client.post(self.API_URL, json=payload, headers=headers)
+        async with self._http().stream(
+            "POST", self.API_URL, json=payload, headers=headers, timeout=REQUEST_TIMEOUT,
+        ) as response:
             response.raise_for_status()
-            data = response.json()
-            return data["choices"][0]["message"]["content"].strip()
+            async for data in self._iter_sse(response):
+                if data == "[DONE]":
+                    break
+                choices = json.loads(data).get("choices") or [{}]
+                token = choices[0].get("delta", {}).get("content")
+                if token:
+                    yield token
 
     async def health_check(self) -> bool:
         try:
@@ -63,12 +105,12 @@ class GroqProvider(BaseLLMProvider):
                 "Authorization": f"Bearer {self.api_key}",
                 "Content-Type": "application/json",
             }
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(
-                    "https://api.groq.com/openai/v1/models",
-                    headers=headers,
-                )
-                return response.status_code == 200
+            response = await self._http().get(
+                "https://api.groq.com/openai/v1/models",
+                headers=headers,
+                timeout=10.0,
+            )
+            return response.status_code == 200
         except Exception as e:
             logger.error(f"Groq health check failed: {e}")
             return False
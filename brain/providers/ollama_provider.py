@@ -4,8 +4,9 @@ Local LLM via Ollama HTTP API. Default provider.
 """
 
 import httpx
+import json
 import logging
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 from brain.providers import BaseLLMProvider
 
@@ -19,24 +20,26 @@ class OllamaProvider(BaseLLMProvider):
     """Ollama local LLM provider."""
 
     provider_name = "ollama"
+    request_timeout = REQUEST_TIMEOUT
 
     def __init__(self, host: str = "http://localhost:11434", model: str = "llama3"):
         self.host = host.rstrip("/")
         self.model = model
         self.base_url = f"{self.host}/api"
 
-    async def generate(
+    def _build_payload(
         self,
         prompt: str,
-        system_prompt: Optional[str] = None,
-        temperature: float = 0.7,
-        max_tokens: int = 2048,
-        json_mode: bool = False,
-    ) -> str:
+        system_prompt: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        json_mode: bool,
+        stream: bool = False,
+    ) -> dict:
         payload = {
             "model": self.model,
             "prompt": prompt,
-            "stream": False,
+            "stream": stream,
             "options": {
                 "temperature": temperature,
                 "num_predict": max_tokens,
@@ -46,14 +49,26 @@ class OllamaProvider(BaseLLMProvider):
             payload["system"] = system_prompt
         if json_mode:
             payload["format"] = "json"
+        return payload
+
+    async def _generate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        json_mode: bool = False,
+    ) -> str:
+        payload = self._build_payload(prompt, system_prompt, temperature, max_tokens, json_mode)
 
         last_error = None
         for attempt in range(1, MAX_RETRIES + 1):
             try:
-                async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT) as client:
-                    response = await client.post(f"{self.base_url}/generate", json=payload)
-                    response.raise_for_status()
-                    return response.json().get("response", "").strip()
+                response = await self._http().post(
+                    f"{self.base_url}/generate", json=payload, timeout=REQUEST_TIMEOUT,
+                )
+                response.raise_for_status()
+                return response.json().get("response", "").strip()
             except httpx.TimeoutException as e:
                 last_error = e
                 logger.warning(f"Ollama timeout (attempt {attempt}/{MAX_RETRIES})")
@@ -66,14 +81,42 @@ class OllamaProvider(BaseLLMProvider):
 
         raise ConnectionError(f"Failed after {MAX_RETRIES} attempts: {last_error}")
 
+    async def _stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        json_mode: bool = False,
+    ) -> AsyncIterator[str]:
+        """Stream tokens from Ollama's newline-delimited JSON output."""
+        payload = self._build_payload(
+            prompt, system_prompt, temperature, max_tokens, json_mode, stream=True,
+        )
+
+        async with self._http().stream(
+            "POST", f"{self.base_url}/generate", json=payload, timeout=REQUEST_TIMEOUT,
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                chunk = json.loads(line)
+                if chunk.get("error"):
+                    raise ConnectionError(f"Ollama stream error: {chunk['error']}")
+                token = chunk.get("response")
+                if token:
+                    yield token
+                if chunk.get("done"):
+                    break
+
     async def health_check(self) -> bool:
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(f"{self.host}/api/tags")
-                response.raise_for_status()
-                models = response.json().get("models", [])
-                available = [m["name"] for m in models]
-                return self.model in available or any(self.model in m for m in available)
+            response = await self._http().get(f"{self.host}/api/tags", timeout=10.0)
+            response.raise_for_status()
+            models = response.json().get("models", [])
+            available = [m["name"] for m in models]
+            return self.model in available or any(self.model in m for m in available)
         except Exception as e:
             logger.error(f"Ollama health check failed: {e}")
             return False
@@ -0,0 +1,239 @@
+"""
+ClawtBot — User Memory Storage
+Durable backends for the Master Agent's per-user interaction patterns
+(`UserMemory` in agents/master_agent.py keeps the bounded in-process copy).
+
+A memory is a plain dict (see `empty_memory`). Updates travel as deltas of
+the same shape — counters hold increments — so any number of API workers
+can flush into the same Redis hash without overwriting each other's counts.
+A batch that could not be written is re-queued by the caller.
+
+Users unknown to Redis are warm-loaded from the chat_messages table.
+"""
+
+import logging
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "clawtbot:user_memory:"
+REDIS_RETRY_AFTER = 30.0  # seconds to skip Redis after an error
+MAX_TOPICS = 50
+PREFERENCE_FIELDS = ("preferred_platform", "preferred_tone")
+
+
+def empty_memory() -> Dict[str, Any]:
+    """A blank memory (also the zero delta)."""
+    return {
+        "intent_counts": Counter(),
+        "topics": [],
+        "last_language": "en",
+        "message_count": 0,
+        "first_seen": None,
+        "last_seen": None,
+        "preferred_platform": None,
+        "preferred_tone": None,
+    }
+
+
+def apply_delta(mem: Dict[str, Any], delta: Dict[str, Any]):
+    """Merge a delta into a memory (or into another pending delta) in place."""
+    mem["message_count"] += delta["message_count"]
+    mem["intent_counts"].update(delta["intent_counts"])
+    if delta["topics"]:
+        mem["topics"] = (mem["topics"] + delta["topics"])[-MAX_TOPICS:]
+    if delta["first_seen"] and (mem["first_seen"] is None or delta["first_seen"] < mem["first_seen"]):
+        mem["first_seen"] = delta["first_seen"]
+    if delta["last_seen"] and (mem["last_seen"] is None or delta["last_seen"] > mem["last_seen"]):
+        mem["last_seen"] = delta["last_seen"]
+    for field in PREFERENCE_FIELDS:
+        if delta[field]:
+            mem[field] = delta[field]
+
+
+class UserMemoryBackend:
+    """
+    Storage interface for user memories. The base class stores nothing,
+    which leaves the in-process LRU plus chat_messages warm-loads.
+    """
+
+    name = "none"
+
+    async def load(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """The stored memory, or None if the user is unknown (or the store is down)."""
+        return None
+
+    async def save(self, user_id: str, mem: Dict[str, Any]):
+        """Store a full memory (used after a warm-load)."""
+
+    async def apply(self, deltas: Dict[str, Dict[str, Any]]) -> bool:
+        """Apply a batch of per-user deltas; False if it was not stored (retry later)."""
+        return True
+
+
+class RedisUserMemoryBackend(UserMemoryBackend):
+    """
+    One Redis hash per user (`clawtbot:user_memory:<id>`): counters are
+    HINCRBY fields (`message_count`, `intent:<name>`), preferences and
+    timestamps are plain fields, and recent topics live in a capped list
+    next to it. Best effort — errors never fail a chat turn.
+    """
+
+    name = "redis"
+
+    def __init__(self):
+        self._down_until = 0.0
+
+    @staticmethod
+    def _keys(user_id: str):
+        key = KEY_PREFIX + user_id
+        return key, key + ":topics"
+
+    def _available(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def _failed(self, e: Exception):
+        logger.debug(f"User memory Redis store unavailable: {e}")
+        self._down_until = time.monotonic() + REDIS_RETRY_AFTER
+
+    async def load(self, user_id: str) -> Optional[Dict[str, Any]]:
+        if not self._available():
+            return None
+        key, topics_key = self._keys(user_id)
+        try:
+            from utils.redis_client import get_redis
+            pipe = get_redis().pipeline(transaction=False)
+            pipe.hgetall(key)
+            pipe.lrange(topics_key, 0, -1)
+            fields, topics = await pipe.execute()
+        except Exception as e:
+            self._failed(e)
+            return None
+        if not fields:
+            return None
+
+        mem = empty_memory()
+        mem["message_count"] = int(fields.get("message_count", 0))
+        mem["intent_counts"] = Counter({
+            name[len("intent:"):]: int(count)
+            for name, count in fields.items() if name.startswith("intent:")
+        })
+        mem["topics"] = list(topics)
+        mem["last_language"] = fields.get("last_language", "en")
+        for field in ("first_seen", "last_seen"):
+            if fields.get(field):
+                mem[field] = datetime.fromisoformat(fields[field])
+        for field in PREFERENCE_FIELDS:
+            mem[field] = fields.get(field) or None
+        return mem
+
+    async def save(self, user_id: str, mem: Dict[str, Any]):
+        if not self._available():
+            return
+        key, topics_key = self._keys(user_id)
+        mapping = {
+            "message_count": mem["message_count"],
+            "last_language": mem["last_language"],
+            **{f"intent:{name}": count for name, count in mem["intent_counts"].items()},
+            **{field: mem[field].isoformat() for field in ("first_seen", "last_seen") if mem[field]},
+            **{field: mem[field] for field in PREFERENCE_FIELDS if mem[field]},
+        }
+        try:
+            from utils.redis_client import get_redis
+            pipe = get_redis().pipeline(transaction=True)
+            pipe.delete(key, topics_key)
+            pipe.hset(key, mapping=mapping)
+            if mem["topics"]:
+                pipe.rpush(topics_key, *mem["topics"][-MAX_TOPICS:])
+            pipe.expire(key, settings.user_memory_redis_ttl)
+            pipe.expire(topics_key, settings.user_memory_redis_ttl)
+            await pipe.execute()
+        except Exception as e:
+            self._failed(e)
+
+    async def apply(self, deltas: Dict[str, Dict[str, Any]]) -> bool:
+        if not deltas:
+            return True
+        if not self._available():
+            return False
+        ttl = settings.user_memory_redis_ttl
+        try:
+            from utils.redis_client import get_redis
+            pipe = get_redis().pipeline(transaction=False)
+            for user_id, delta in deltas.items():
+                key, topics_key = self._keys(user_id)
+                if delta["message_count"]:
+                    pipe.hincrby(key, "message_count", delta["message_count"])
+                for name, count in delta["intent_counts"].items():
+                    pipe.hincrby(key, f"intent:{name}", count)
+                if delta["first_seen"]:
+                    pipe.hsetnx(key, "first_seen", delta["first_seen"].isoformat())
+                if delta["last_seen"]:
+                    pipe.hset(key, "last_seen", delta["last_seen"].isoformat())
+                for field in PREFERENCE_FIELDS:
+                    if delta[field]:
+                        pipe.hset(key, field, delta[field])
+                if delta["topics"]:
+                    pipe.rpush(topics_key, *delta["topics"])
+                    pipe.ltrim(topics_key, -MAX_TOPICS, -1)
+                    pipe.expire(topics_key, ttl)
+                pipe.expire(key, ttl)
+            await pipe.execute()
+        except Exception as e:
+            self._failed(e)
+            return False
+        return True
+
+
+async def load_from_chat_history(user_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Rebuild a user's memory from the chat_messages table: message count and
+    first/last seen from their messages, intent counts from the assistant
+    replies. Topics and preferences are not stored there and start empty.
+    """
+    from sqlalchemy import func, select
+    from db.database import async_session
+    from db.settings_models import ChatMessage
+
+    try:
+        async with async_session() as session:
+            count, first_seen, last_seen = (await session.execute(
+                select(
+                    func.count(ChatMessage.id),
+                    func.min(ChatMessage.created_at),
+                    func.max(ChatMessage.created_at),
+                ).where(ChatMessage.user_id == user_id, ChatMessage.role == "user")
+            )).one()
+            if not count:
+                return None
+            intents = (await session.execute(
+                select(ChatMessage.intent, func.count(ChatMessage.id))
+                .where(
+                    ChatMessage.user_id == user_id,
+                    ChatMessage.role == "assistant",
+                    ChatMessage.intent.isnot(None),
+                )
+                .group_by(ChatMessage.intent)
+            )).all()
+    except Exception as e:
+        logger.debug(f"User memory warm-load failed for {user_id}: {e}")
+        return None
+
+    mem = empty_memory()
+    mem["message_count"] = count
+    mem["first_seen"] = first_seen
+    mem["last_seen"] = last_seen
+    mem["intent_counts"] = Counter({intent: n for intent, n in intents})
+    return mem
+
+
+def get_backend() -> UserMemoryBackend:
+    """The configured durable backend."""
+    if settings.user_memory_redis_enabled:
+        return RedisUserMemoryBackend()
+    return UserMemoryBackend()
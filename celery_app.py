@@ -4,6 +4,7 @@ Task queue with Redis broker and periodic task scheduling.
 """
 
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
 from config import settings
 from cron_config import CELERY_BEAT_SCHEDULE, TIMEZONE
 
@@ -51,3 +52,20 @@ celery_app.autodiscover_tasks([
     "agents",
     "workflow",
 ])
+
+
+# ─── Worker lifecycle ───────────────────────────────────────────────────────
+@worker_process_init.connect
+def _start_llm_config_listener(**kwargs):
+    """Pick up LLM settings changes made through the API without a restart."""
+    from brain.llm_router import llm_router
+    llm_router.start_invalidation_listener()
+
+
+@worker_process_shutdown.connect
+def _close_llm_pools(**kwargs):
+    """Close pooled LLM HTTP connections when a worker process exits."""
+    from brain.llm_router import llm_router
+    from brain.http_pool import run_close_http_clients
+    llm_router.stop_invalidation_listener()
+    run_close_http_clients()
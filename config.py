@@ -6,7 +6,7 @@ Ports are the single source of truth — URLs auto-derive when not overridden.
 
 from pydantic_settings import BaseSettings
 from pydantic import Field, model_validator
-from typing import List
+from typing import Dict, List
 
 
 class Settings(BaseSettings):
@@ -38,6 +38,103 @@ class Settings(BaseSettings):
     ollama_host: str = ""
     ollama_model: str = "llama3.2:latest"
 
+    # ── LLM HTTP Connection Pools ────────────────────────────────────────
+    llm_http_max_connections: int = 20
+    llm_http_max_keepalive_connections: int = 10
+    llm_http_keepalive_expiry: float = 30.0  # seconds an idle connection is kept
+    llm_http2_enabled: bool = True  # only used by cloud providers, needs `h2`
+
+    # ── LLM Routing ──────────────────────────────────────────────────────
+    llm_config_cache_ttl: int = 60  # seconds before agent model configs are re-read
+    llm_credentials_cache_ttl: int = 300  # seconds decrypted provider API keys are kept
+
+    # ── LLM Admission Control ────────────────────────────────────────────
+    # Max concurrent calls per provider; a provider's LLMProviderConfig row
+    # can override it (max_concurrency column). The limit is provider-wide
+    # (all API and Celery workers) while Redis is reachable, per process
+    # otherwise.
+    llm_provider_max_concurrency: Dict[str, int] = Field(default_factory=lambda: {
+        "ollama": 2,
+        "openai": 16,
+        "gemini": 16,
+        "anthropic": 8,
+        "groq": 8,
+    })
+    llm_default_max_concurrency: int = 4  # providers not listed above
+    llm_queue_max_waiting: int = 100  # waiting requests per provider before rejecting
+    llm_queue_timeout: float = 120.0  # max seconds a request waits for a slot
+    llm_admission_redis_enabled: bool = True  # share the limit and priority queue across processes
+    llm_admission_lease: float = 60.0  # seconds a shared slot survives without renewal (crashed worker)
+    llm_admission_poll_interval: float = 0.1  # seconds between shared-slot attempts while waiting
+
+    # ── LLM Circuit Breakers (per provider/model) ────────────────────────
+    llm_breaker_window_seconds: float = 60.0  # rolling window for error rate / latency
+    llm_breaker_min_calls: int = 5  # calls in the window before the error rate counts
+    llm_breaker_failure_rate: float = 0.5  # open at or above this error rate
+    llm_breaker_consecutive_failures: int = 3  # ...or after this many failures in a row
+    llm_breaker_open_seconds: float = 30.0  # cool-down before a trial call
+    llm_breaker_max_open_seconds: float = 300.0  # cool-down doubles up to this
+    llm_breaker_timeout_seconds: float = 25.0  # cancelled calls older than this count as timeouts
+    llm_breaker_probe_interval: float = 15.0  # background health checks of open breakers
+
+    # ── LLM Hedged Requests (Master Agent chat) ──────────────────────────
+    llm_hedging_enabled: bool = False  # fire the next provider while a slow one is pending
+    llm_hedge_percentile: float = 0.95  # hedge once a call outlives this latency quantile
+    llm_hedge_default_delay: float = 8.0  # seconds, until a provider has latency samples
+    llm_hedge_min_delay: float = 1.0
+    llm_hedge_max_delay: float = 20.0
+    llm_hedge_max_paid_per_minute: int = 6  # extra cloud calls hedging may add
+
+    # ── LLM Response Cache ───────────────────────────────────────────────
+    llm_cache_enabled: bool = True
+    llm_cache_redis_enabled: bool = True  # shared tier across API/Celery processes
+    llm_cache_max_entries: int = 1024  # in-process LRU size
+    llm_cache_default_ttl: int = 3600  # seconds, for agents not listed below
+    llm_cache_max_temperature: float = 0.75  # hotter (creative) calls are never cached
+    # Per-agent TTL in seconds (0 disables caching for that agent)
+    llm_cache_agent_ttls: Dict[str, int] = Field(default_factory=lambda: {
+        "hashtag_generator": 86400,
+        "review_agent": 21600,
+        "analytics_agent": 3600,
+        "engagement_bot": 600,
+        "content_creator": 3600,
+        "master_agent": 0,
+    })
+
+    # ── Chat History (Master Agent) ──────────────────────────────────────
+    chat_history_window: int = 6  # most recent messages sent to the Master Agent verbatim
+    chat_summary_enabled: bool = True  # fold older messages into a rolling summary
+    chat_summary_min_messages: int = 6  # unsummarized messages before the summary is refreshed
+    chat_summary_max_batch: int = 40  # messages folded in per refresh
+    chat_summary_max_chars: int = 1200
+
+    # ── Calendar Pipeline ────────────────────────────────────────────────
+    calendar_max_concurrent_entries: int = 8  # per worker; also capped by the LLM provider limit
+    calendar_celery_fan_out: bool = False  # one Celery task per entry (chord) instead of one per upload
+    calendar_insert_chunk_size: int = 1000  # parsed rows per bulk INSERT (and commit) when storing an upload
+    calendar_upload_read_bytes: int = 1024 * 1024  # chunk size when streaming CSV/JSONL uploads
+    calendar_claim_timeout: float = 1800.0  # seconds a QUEUED entry may go untouched before its claim counts as abandoned
+
+    # ── Data Parser (URL sources) ────────────────────────────────────────
+    data_parser_fetch_retries: int = 3  # attempts per URL (timeouts, transport errors, 429/5xx)
+    data_parser_backoff_base: float = 0.5  # seconds; doubled per retry, full jitter
+    data_parser_max_per_host: int = 4  # concurrent fetches per host in DataParserAgent.run_many
+    data_parser_db_batch_size: int = 500  # rows per keyset page of a DATABASE source
+    data_parser_db_default_limit: int = 500  # rows run()/query_db() return when no limit is given
+
+    # ── User Memory (Master Agent personalization) ───────────────────────
+    user_memory_redis_enabled: bool = True  # durable store shared by all workers
+    user_memory_max_users: int = 10000  # in-process LRU size
+    user_memory_idle_ttl: float = 1800.0  # seconds before an idle user is dropped locally
+    user_memory_refresh_seconds: float = 60.0  # re-read from Redis to see other workers' updates
+    user_memory_flush_interval: float = 5.0  # seconds between write-behind flushes
+    user_memory_flush_batch: int = 50  # pending users that trigger an early flush
+    user_memory_redis_ttl: int = 7776000  # 90 days without activity
+
+    # ── Dashboard Stats ──────────────────────────────────────────────────
+    dashboard_stats_ttl: float = 15.0  # seconds /content/stats and /calendar/stats are cached (0 disables)
+    dashboard_stats_max_entries: int = 1024  # cached results per process (one per user for calendar stats)
+
     # ── JWT Authentication ──────────────────────────────────────────────
     jwt_secret_key: str = "change-this-in-production"
     jwt_algorithm: str = "HS256"
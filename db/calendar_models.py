@@ -7,7 +7,7 @@ import uuid
 from datetime import datetime
 from sqlalchemy import (
     Column, String, Text, Integer, Float, Boolean,
-    DateTime, ForeignKey, JSON, Enum as SAEnum,
+    DateTime, ForeignKey, JSON, Enum as SAEnum, Index,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
@@ -77,6 +77,21 @@ class CalendarUpload(Base):
     is_processed = Column(Boolean, default=False)
     processed_at = Column(DateTime, nullable=True)
 
+    # Incremental sync (Google Sheets): validators for conditional GETs and
+    # a hash of the last synced body
+    source_etag = Column(String(255), nullable=True)
+    source_last_modified = Column(String(64), nullable=True)
+    source_hash = Column(String(64), nullable=True)
+    last_synced_at = Column(DateTime, nullable=True)
+
+    # Pipeline progress of the latest processing run (updated atomically
+    # by every worker processing one of the upload's entries)
+    processing_total = Column(Integer, default=0)
+    processing_succeeded = Column(Integer, default=0)
+    processing_failed = Column(Integer, default=0)
+    processing_started_at = Column(DateTime, nullable=True)
+    processing_completed_at = Column(DateTime, nullable=True)
+
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -99,6 +114,10 @@ class CalendarEntry(Base):
 
     # Calendar Data (from parsed row)
     row_number = Column(Integer, nullable=True)
+    # Row identity within the upload and a hash of its content, so a sheet
+    # sync only touches rows that were added, edited or removed
+    row_key = Column(String(64), nullable=True)
+    row_hash = Column(String(64), nullable=True)
     date = Column(String(50), nullable=True)  # Original date from calendar
     scheduled_date = Column(DateTime, nullable=True)  # Parsed datetime
     brand = Column(String(255), nullable=True)
@@ -126,6 +145,12 @@ class CalendarEntry(Base):
     status = Column(SAEnum(CalendarEntryStatus), default=CalendarEntryStatus.PENDING)
     pipeline_stage = Column(SAEnum(PipelineStage), default=PipelineStage.PARSED)
     pipeline_errors = Column(JSON, nullable=True)  # List of error strings per stage
+    # Set when a run claims the entry (→ QUEUED) and at every stage after, so
+    # a claim left behind by a dead worker can be spotted and taken over
+    claimed_at = Column(DateTime, nullable=True)
+    # Outputs of finished stages keyed by PipelineStage value, so a retry
+    # resumes at the first incomplete stage ("_inputs" fingerprints the row)
+    stage_outputs = Column(JSON, nullable=True)
 
     # Generated content (linked to Content model)
     content_ids = Column(JSON, nullable=True)  # UUIDs of generated Content records
@@ -141,3 +166,8 @@ class CalendarEntry(Base):
 
     # Relationships
     upload = relationship("CalendarUpload", back_populates="entries")
+
+    __table_args__ = (
+        # Sheet syncs look entries up by (upload, row identity)
+        Index("ix_calendar_entries_upload_row_key", "upload_id", "row_key"),
+    )
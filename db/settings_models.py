@@ -7,7 +7,7 @@ import uuid
 from datetime import datetime
 from sqlalchemy import (
     Column, String, Text, Integer, Float, Boolean,
-    DateTime, ForeignKey, Enum as SAEnum, UniqueConstraint,
+    DateTime, ForeignKey, Enum as SAEnum, UniqueConstraint, Index,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from db.database import Base
@@ -101,6 +101,7 @@ class LLMProviderConfig(Base):
     is_enabled = Column(Boolean, default=True)
     last_tested_at = Column(DateTime, nullable=True)
     test_status = Column(String(50), nullable=True)  # "connected" | "failed" | null
+    max_concurrency = Column(Integer, nullable=True)  # null = settings.llm_provider_max_concurrency
 
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -134,3 +135,22 @@ class ChatMessage(Base):
     intent = Column(String(50), nullable=True)  # Classified intent (assistant only)
 
     created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        # "last N messages of a conversation" is an index range scan
+        Index("ix_chat_messages_conversation_created", "conversation_id", "created_at"),
+    )
+
+
+class ChatConversationSummary(Base):
+    """Rolling summary of the messages older than the chat history window."""
+    __tablename__ = "chat_conversation_summaries"
+
+    conversation_id = Column(String(50), primary_key=True)
+    user_id = Column(String(50), nullable=False, index=True)
+    summary = Column(Text, nullable=False, default="")
+    # created_at of the newest message folded into the summary
+    summarized_until = Column(DateTime, nullable=True)
+    message_count = Column(Integer, default=0)  # messages folded in so far
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
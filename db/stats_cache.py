@@ -0,0 +1,117 @@
+"""
+ClawtBot — Dashboard Stats Cache
+Short-lived, per-process cache for the dashboard aggregates (/content/stats,
+/calendar/stats), so every open tab polling the dashboard does not re-run
+them.
+
+Each cache scope depends on a set of tables. When a session that wrote to
+one of them (ORM flush or DML statement) commits, the scope is dropped.
+Writes from other processes (Celery workers) show up once the TTL expires.
+"""
+
+import time
+from collections import OrderedDict
+from itertools import chain
+from typing import Any, Dict, Hashable, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from config import settings
+
+# scope → tables its aggregates read
+SCOPE_TABLES: Dict[str, Set[str]] = {
+    "content": {"contents", "schedules"},
+    "calendar": {"calendar_entries", "calendar_uploads"},
+}
+
+
+class StatsCache:
+    """TTL cache keyed by (scope, key), with per-scope invalidation."""
+
+    def __init__(self):
+        # (scope, key) → (expires_at monotonic, value)
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, Any]]" = OrderedDict()
+        self._generations: Dict[str, int] = {scope: 0 for scope in SCOPE_TABLES}
+
+    def generation(self, scope: str) -> int:
+        """Take before computing a value; pass to `set` so stale results are not stored."""
+        return self._generations[scope]
+
+    def get(self, scope: str, key: Hashable = None) -> Any:
+        """The cached value, or None."""
+        entry = self._entries.get((scope, key))
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[(scope, key)]
+            return None
+        return value
+
+    def set(self, scope: str, key: Hashable, value: Any, generation: Optional[int] = None):
+        ttl = settings.dashboard_stats_ttl
+        if ttl <= 0 or (generation is not None and generation != self._generations[scope]):
+            return
+        self._entries[(scope, key)] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end((scope, key))
+        while len(self._entries) > settings.dashboard_stats_max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, scope: str):
+        self._generations[scope] += 1
+        for cache_key in [cache_key for cache_key in self._entries if cache_key[0] == scope]:
+            del self._entries[cache_key]
+
+    def invalidate_tables(self, tables: Set[str]):
+        """Drop every scope that reads one of these tables."""
+        for scope, scope_tables in SCOPE_TABLES.items():
+            if tables & scope_tables:
+                self.invalidate(scope)
+
+    def clear(self):
+        for scope in SCOPE_TABLES:
+            self.invalidate(scope)
+
+
+# ─── Singleton ──────────────────────────────────────────────────────────────
+stats_cache = StatsCache()
+
+
+# ─── Session Hooks ──────────────────────────────────────────────────────────
+# Written tables are collected in session.info and acted on at commit, so a
+# dashboard read between the write and its commit cannot re-cache old data.
+
+_WATCHED = set().union(*SCOPE_TABLES.values())
+_INFO_KEY = "stats_cache_tables"
+
+
+def _record(session: Session, table_name: Optional[str]):
+    if table_name in _WATCHED:
+        session.info.setdefault(_INFO_KEY, set()).add(table_name)
+
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session, flush_context):
+    for obj in chain(session.new, session.dirty, session.deleted):
+        table = getattr(obj, "__table__", None)
+        _record(session, getattr(table, "name", None))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _on_execute(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        _record(orm_execute_state.session, getattr(table, "name", None))
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session):
+    tables = session.info.pop(_INFO_KEY, None)
+    if tables:
+        stats_cache.invalidate_tables(tables)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session):
+    session.info.pop(_INFO_KEY, None)
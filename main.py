@@ -46,16 +46,29 @@ async def lifespan(app: FastAPI):
 
     # Check Ollama connectivity
     from brain.llm_router import llm_router
+    llm_router.start_invalidation_listener()
     default_llm = llm_router.get_default_provider()
     if await default_llm.health_check():
         logger.info(f"✅ Ollama connected (model: {settings.ollama_model})")
     else:
         logger.warning(f"⚠️  Ollama not available or model '{settings.ollama_model}' not found")
 
+    from brain.circuit_breaker import llm_breakers
+    llm_breakers.start_probing()
+
+    from agents.master_agent import user_memory
+    user_memory.start_flusher()
+
     yield
 
     # Shutdown
     logger.info("🛑 Shutting down ClawtBot...")
+    await llm_breakers.stop_probing()
+    await user_memory.stop_flusher()
+    llm_router.stop_invalidation_listener()
+    from brain.http_pool import close_http_clients
+    await close_http_clients()
+    logger.info("✅ LLM connection pools closed")
     await close_db()
     logger.info("✅ Database connections closed")
 
@@ -108,7 +121,8 @@ app.include_router(calendar_router)
 # ─── Health Check ────────────────────────────────────────────────────────────
 @app.get("/health", tags=["System"])
 async def health_check():
-    """System health check endpoint."""
+    """System health check endpoint (includes LLM circuit breaker states)."""
+    from brain.circuit_breaker import llm_breakers
     from brain.llm_router import llm_router
     ollama_ok = await llm_router.get_default_provider().health_check()
 
@@ -117,6 +131,7 @@ async def health_check():
         "app": settings.app_name,
         "env": settings.app_env,
         "ollama": "connected" if ollama_ok else "disconnected",
+        "llm_circuits": llm_breakers.snapshot(),
     }
 
 
@@ -133,3 +133,169 @@ async def test_review_agent_rejected():
         assert result["is_approved"] is False
         assert result["overall_score"] == 3
         assert len(result["issues"]) == 2
+
+
+# ─── Multi-Platform Generation ─────────────────────────────────────────────
+
+def _llm_returning(*responses):
+    llm = MagicMock()
+    llm.generate_json = AsyncMock(side_effect=list(responses))
+    return AsyncMock(return_value=llm), llm
+
+
+@pytest.mark.asyncio
+async def test_content_creator_multi_platform_single_call():
+    """All platforms come from one LLM call; Twitter's limit is enforced locally."""
+    long_tweet = "word " * 80  # 400 chars
+    resolve, llm = _llm_returning({
+        "Instagram": {"caption": "IG caption", "hook": "h", "cta": "c", "post_text": "IG post"},
+        "twitter": {"caption": "tweet", "hook": "h", "cta": "c", "post_text": long_tweet},
+    })
+
+    with patch("agents.content_creator.resolve_llm", resolve):
+        from agents.content_creator import ContentCreatorAgent
+        result = await ContentCreatorAgent().run({
+            "topic": "AI", "platforms": ["instagram", "twitter"], "tone": "casual",
+        })
+
+    llm.generate_json.assert_called_once()
+    assert list(result["platforms"]) == ["instagram", "twitter"]
+    assert result["platforms"]["instagram"]["post_text"] == "IG post"
+    tweet = result["platforms"]["twitter"]
+    assert len(tweet["post_text"]) <= 280
+    assert tweet["post_text"].endswith("…")
+    assert tweet["validation_issues"]
+    assert "validation_issues" not in result["platforms"]["instagram"]
+
+
+@pytest.mark.asyncio
+async def test_content_creator_multi_platform_fills_missing_platform():
+    resolve, llm = _llm_returning(
+        {"instagram": {"caption": "c", "hook": "h", "cta": "c", "post_text": "IG post"}},
+        {"caption": "c", "hook": "h", "cta": "c", "post_text": "LinkedIn post"},
+    )
+
+    with patch("agents.content_creator.resolve_llm", resolve):
+        from agents.content_creator import ContentCreatorAgent
+        result = await ContentCreatorAgent().run({"topic": "AI", "platforms": ["instagram", "linkedin"]})
+
+    assert llm.generate_json.call_count == 2
+    assert result["platforms"]["linkedin"]["post_text"] == "LinkedIn post"
+    assert result["platforms"]["linkedin"]["platform"] == "linkedin"
+
+
+@pytest.mark.asyncio
+async def test_hashtag_generator_multi_platform_caps_per_platform():
+    resolve, llm = _llm_returning({
+        "instagram": {"niche_hashtags": [f"#n{i}" for i in range(10)], "broad_hashtags": ["AI", "#ai", "#Tech"]},
+        "twitter": {"niche_hashtags": [f"#n{i}" for i in range(10)], "broad_hashtags": [f"#b{i}" for i in range(10)]},
+    })
+
+    with patch("agents.hashtag_generator.resolve_llm", resolve):
+        from agents.hashtag_generator import HashtagGeneratorAgent
+        result = await HashtagGeneratorAgent().run({"topic": "AI", "platforms": ["instagram", "twitter"]})
+
+    llm.generate_json.assert_called_once()
+    instagram = result["platforms"]["instagram"]
+    assert len(instagram["niche_hashtags"]) == 10
+    assert instagram["broad_hashtags"] == ["#AI", "#Tech"]
+    twitter = result["platforms"]["twitter"]
+    assert len(twitter["niche_hashtags"]) + len(twitter["broad_hashtags"]) == 5
+
+
+
+@pytest.mark.asyncio
+async def test_hashtag_generator_multi_platform_flat_and_malformed_replies():
+    flat = {"niche_hashtags": ["#AItools"], "broad_hashtags": ["#AI"]}
+    resolve, llm = _llm_returning(flat)
+    with patch("agents.hashtag_generator.resolve_llm", resolve):
+        from agents.hashtag_generator import HashtagGeneratorAgent
+        result = await HashtagGeneratorAgent().run({"topic": "AI", "platforms": ["instagram", "linkedin"]})
+
+    llm.generate_json.assert_called_once()
+    assert result["platforms"]["linkedin"]["niche_hashtags"] == ["#AItools"]
+    assert result["platforms"]["instagram"]["broad_hashtags"] == ["#AI"]
+
+    # A list (or a platform left out) falls back to one call per platform
+    resolve, llm = _llm_returning(
+        [{"niche_hashtags": ["#x"]}],
+        {"niche_hashtags": ["#IGonly"], "broad_hashtags": []},
+        {"niche_hashtags": ["#LIonly"], "broad_hashtags": []},
+    )
+    with patch("agents.hashtag_generator.resolve_llm", resolve):
+        result = await HashtagGeneratorAgent().run({"topic": "AI", "platforms": ["instagram", "linkedin"]})
+
+    assert llm.generate_json.call_count == 3
+    assert result["platforms"]["instagram"]["niche_hashtags"] == ["#IGonly"]
+    assert result["platforms"]["linkedin"]["niche_hashtags"] == ["#LIonly"]
+
+
+@pytest.mark.asyncio
+async def test_content_creator_multi_platform_list_reply_falls_back():
+    resolve, llm = _llm_returning(
+        ["not", "an", "object"],
+        {"caption": "c", "hook": "h", "cta": "c", "post_text": "IG post"},
+        {"caption": "c", "hook": "h", "cta": "c", "post_text": "LinkedIn post"},
+    )
+
+    with patch("agents.content_creator.resolve_llm", resolve):
+        from agents.content_creator import ContentCreatorAgent
+        result = await ContentCreatorAgent().run({"topic": "AI", "platforms": ["instagram", "linkedin"]})
+
+    assert llm.generate_json.call_count == 3
+    assert result["platforms"]["instagram"]["post_text"] == "IG post"
+    assert result["platforms"]["linkedin"]["post_text"] == "LinkedIn post"
+
+def test_fit_post_drops_hashtags_before_cutting_text():
+    from agents.platform_rules import fit_post
+
+    text = "x" * 250
+    post_text, niche, broad = fit_post("twitter", text, ["#one", "#two"], ["#three", "#four"])
+    assert post_text == text
+    assert len(post_text) + len(" ".join(niche + broad)) + 2 <= 280
+    assert broad == [] or niche == ["#one", "#two"]
+
+    post_text, niche, broad = fit_post("twitter", "y" * 300, ["#one"], [])
+    assert (niche, broad) == ([], [])
+    assert len(post_text) == 280
+
+
+async def _byte_chunks(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+@pytest.mark.asyncio
+async def test_stream_csv_matches_buffered_parse_at_any_chunk_size():
+    """Chunk boundaries may split UTF-8 characters and quoted multi-line fields."""
+    from agents.data_parser_agent import DataParserAgent
+
+    data = (
+        "﻿Date,Topic,Platforms,Notes\n"
+        '3/1/2026,"AI, tools",LinkedIn/X,"line1\nline2"\n'
+        "\n"
+        "3/2/2026,Café ☕,IG,\n"
+        '3/3/2026,A 12" pizza,X,n1\n'
+        "3/4/2026,Pasta,IG,n2\n"
+        '3/5/2026,"Quoted ""pizza""",X,"open\n'
+    ).encode("utf-8")
+    parser = DataParserAgent()
+    expected, _, _ = parser._parse_csv(data)
+
+    for size in (1, 5, 4096):
+        errors = []
+        rows = [row async for row in parser.stream_csv(_byte_chunks(data, size), errors)]
+        assert rows == expected and errors == []
+    assert [row["_row_number"] for row in expected] == [2, 3, 4, 5, 6]
+    assert expected[2]["topic"] == 'A 12" pizza' and expected[4]["notes"] == "open"
+
+
+@pytest.mark.asyncio
+async def test_stream_jsonl_reports_bad_lines():
+    from agents.data_parser_agent import DataParserAgent
+
+    data = b'{"topic": "A"}\n[1]\nnot json\n{"topic": "B"}'
+    errors = []
+    rows = [row async for row in DataParserAgent().stream_jsonl(_byte_chunks(data, 7), errors)]
+    assert rows == [{"topic": "A"}, {"topic": "B"}]
+    assert errors == ["Line 2: Expected a JSON object", "Line 3: Invalid JSON"]
@@ -21,3 +21,174 @@ def test_root_endpoint():
             data = response.json()
             assert data["name"] == "ClawtBot API"
             assert data["version"] == "1.0.0"
+
+
+@pytest.mark.asyncio
+async def test_chat_history_load_is_bounded():
+    """Only the last N messages are read; the summary carries the rest."""
+    from unittest.mock import MagicMock
+    from api.chat import ChatRequest, _load_history
+
+    rows = [MagicMock(role="assistant", content="second"), MagicMock(role="user", content="first")]
+    history_result = MagicMock()
+    history_result.all.return_value = rows
+    summary_result = MagicMock()
+    summary_result.scalar_one_or_none.return_value = "Earlier: user asked for AI posts."
+    db = AsyncMock()
+    db.execute = AsyncMock(side_effect=[history_result, summary_result])
+
+    req = ChatRequest(message="hi", conversation_id="conv-1")
+    with patch("config.settings.chat_history_window", 2):
+        history, summary = await _load_history(db, req, "conv-1", is_authenticated=True)
+
+    assert history == [{"role": "user", "content": "first"}, {"role": "assistant", "content": "second"}]
+    assert summary == "Earlier: user asked for AI posts."
+    query = db.execute.call_args_list[0].args[0]
+    assert query._limit_clause is not None
+    assert "ORDER BY chat_messages.created_at DESC" in str(query)
+    # Messages not yet folded into the summary are loaded, beyond the window
+    assert "chat_conversation_summaries.summarized_until" in str(query)
+    with patch("config.settings.chat_history_window", 2), \
+         patch("config.settings.chat_summary_min_messages", 6):
+        from agents.master_agent import prompt_history_limit
+        assert prompt_history_limit() == 7
+
+
+@pytest.mark.asyncio
+async def test_content_stats_single_query_cached_until_commit():
+    """One aggregate query per TTL; a committed content write drops the cache."""
+    from types import SimpleNamespace
+    from unittest.mock import MagicMock
+    from sqlalchemy import Column, Integer, MetaData, Table, create_engine, insert
+    from sqlalchemy.orm import Session
+    from api.content import get_content_stats
+    from db.models import ContentStatus
+    from db.stats_cache import stats_cache
+
+    row = {"total": 3, "avg_review_score": 7.25, "recent_published": 1}
+    row.update({s.value: 0 for s in ContentStatus})
+    row[ContentStatus.DRAFT.value] = 3
+    result = MagicMock()
+    result.one.return_value = SimpleNamespace(_mapping=row)
+    db = AsyncMock()
+    db.execute = AsyncMock(return_value=result)
+
+    stats_cache.clear()
+    first = await get_content_stats(db=db, user=None)
+    second = await get_content_stats(db=db, user=None)
+
+    assert db.execute.await_count == 1
+    assert second == first
+    assert first["by_status"][ContentStatus.DRAFT.value] == 3
+    assert first["avg_review_score"] == 7.2 and first["recent_published_7d"] == 1
+    query = str(db.execute.call_args.args[0])
+    assert "FILTER (WHERE contents.status" in query
+
+    # Any session committing a write to `contents` invalidates the scope
+    contents = Table("contents", MetaData(), Column("id", Integer, primary_key=True))
+    engine = create_engine("sqlite://")
+    contents.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.execute(insert(contents), [{"id": 1}])
+        await get_content_stats(db=db, user=None)  # uncommitted: still cached
+        assert db.execute.await_count == 1
+        session.commit()
+    await get_content_stats(db=db, user=None)
+    assert db.execute.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_calendar_stats_single_query_per_user():
+    """Uploads, statuses, brands and unnested platforms come back from one UNION query."""
+    from types import SimpleNamespace
+    from unittest.mock import MagicMock
+    import uuid
+    from api.calendar import get_calendar_stats
+    from db.stats_cache import stats_cache
+
+    result = MagicMock()
+    result.all.return_value = [
+        ("uploads", None, 2),
+        ("status", "PENDING", 3),
+        ("status", "PUBLISHED", 1),
+        ("brand", "Acme", 3),
+        ("brand", None, 1),
+        ("brand", "", 0),
+        ("platform", "linkedin", 4),
+        ("platform", "twitter", 1),
+    ]
+    db = AsyncMock()
+    db.execute = AsyncMock(return_value=result)
+    user = SimpleNamespace(id=uuid.uuid4())
+
+    stats_cache.clear()
+    stats = await get_calendar_stats(db=db, user=user)
+    await get_calendar_stats(db=db, user=user)
+    await get_calendar_stats(db=db, user=SimpleNamespace(id=uuid.uuid4()))
+
+    assert db.execute.await_count == 2
+    assert stats.total_uploads == 2 and stats.total_entries == 4
+    assert stats.by_status == {"pending": 3, "published": 1}
+    assert stats.by_brand == {"Acme": 3, "Unknown": 1}
+    assert stats.by_platform == {"linkedin": 4, "twitter": 1}
+    assert "json_array_elements_text" in str(db.execute.call_args.args[0])
+
+
+@pytest.mark.asyncio
+async def test_analytics_report_aggregates_in_sql_and_pages_records():
+    """Totals and groups are SQL aggregates; records come one keyset page at a time."""
+    import uuid
+    from datetime import date, datetime
+    from types import SimpleNamespace
+    from unittest.mock import MagicMock
+    from api.analytics import get_analytics_report
+    from db.models import Platform
+
+    metrics = dict(likes=30, comments=6, shares=3, reach=900, impressions=1200,
+                   avg_engagement_rate=4.567, record_count=3)
+    totals = MagicMock()
+    totals.one.return_value = SimpleNamespace(**metrics)
+    groups = MagicMock()
+    groups.all.return_value = [SimpleNamespace(day=date(2026, 1, 2), platform=Platform.TWITTER, **metrics)]
+    records = MagicMock()
+    records.all.return_value = [
+        SimpleNamespace(
+            id=uuid.uuid4(), content_id=uuid.uuid4(), platform=Platform.TWITTER,
+            likes=10, comments=2, shares=1, reach=300, impressions=400,
+            engagement_rate=4.5, fetched_at=datetime(2026, 1, 2, 12 - i),
+        )
+        for i in range(3)
+    ]
+    db = AsyncMock()
+    db.execute = AsyncMock(side_effect=[totals, groups, records])
+
+    report = await get_analytics_report(
+        days=30, include_records=True, limit=2, cursor=None,
+        group_by=["day", "platform"], db=db, user=None,
+    )
+
+    assert report.total_likes == 30 and report.avg_engagement_rate == 4.57 and report.record_count == 3
+    assert report.groups[0].day == date(2026, 1, 2) and report.groups[0].platform == "twitter"
+    assert len(report.records) == 2 and report.records[0].platform == "twitter"
+    last = records.all.return_value[1]
+    assert report.next_cursor == f"{last.fetched_at.isoformat()},{last.id}"
+
+    totals_query, groups_query, records_query = (call.args[0] for call in db.execute.call_args_list)
+    assert "sum(analytics_records.likes)" in str(totals_query)
+    assert "GROUP BY CAST(analytics_records.fetched_at AS DATE), analytics_records.platform" in str(groups_query)
+    assert records_query._limit_clause is not None
+
+    # The next page resumes after the cursor; no records are read when omitted
+    db.execute = AsyncMock(side_effect=[totals, records])
+    await get_analytics_report(
+        days=30, include_records=True, limit=2, cursor=report.next_cursor,
+        group_by=[], db=db, user=None,
+    )
+    assert "(analytics_records.fetched_at, analytics_records.id) <" in str(db.execute.call_args.args[0])
+
+    db.execute = AsyncMock(side_effect=[totals])
+    summary = await get_analytics_report(
+        days=30, include_records=False, limit=2, cursor=None,
+        group_by=[], db=db, user=None,
+    )
+    assert summary.records == [] and summary.groups is None and db.execute.await_count == 1
@@ -253,3 +253,262 @@ async def test_csv_bytes():
     result = await parser.parse_csv_file(csv_bytes)
     
     assert result["total_rows"] == 20
+
+
+# ── Test: Normalization plan ────────────────────────────────────────────────
+
+def test_date_format_detected_from_sample():
+    from agents.data_parser_agent import DataParserAgent
+
+    csv_data = "Date,Topic\n13/03/2026,A\n01/03/2026,B\n25/12/2026,C\n"
+    rows, _, errors = DataParserAgent()._parse_csv(csv_data)
+
+    # 01/03 is ambiguous on its own; the rest of the sheet is day-first
+    assert [r["date"] for r in rows] == ["2026-03-13", "2026-03-01", "2026-12-25"]
+    assert errors == []
+
+
+def test_normalization_plan_memoized_lists_are_not_shared():
+    from agents.data_parser_agent import NormalizationPlan
+
+    plan = NormalizationPlan(["Platforms", "Hashtags"])
+    first = plan.normalize({"Platforms": "LinkedIn, X", "Hashtags": "#ai"}, 2)
+    second = plan.normalize({"Platforms": "LinkedIn, X", "Hashtags": "#ai"}, 3)
+    first["platforms"].append("medium")
+    assert second["platforms"] == ["linkedin", "twitter"]
+    assert second["default_hashtags"] == ["#ai"]
+
+
+# ── Compiled plan vs per-row normalization ─────────────────────────────────
+# The timing comparison is a benchmark: skipped unless RUN_BENCHMARKS is set.
+
+benchmark = pytest.mark.skipif(
+    not os.environ.get("RUN_BENCHMARKS"), reason="benchmark; set RUN_BENCHMARKS=1 to run"
+)
+
+
+def _calendar_csv(row_count):
+    """A generated calendar CSV mixing date, platform and hashtag formats."""
+    import csv
+    import io
+
+    header = [
+        "Date", "Brand", "Content_Type", "Topic", "Platforms",
+        "Approval_Required", "Status", "Default hastags", "Scheduled Date",
+    ]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    for i in range(row_count):
+        date = f"{i % 12 + 1}/{i % 28 + 1}/2026"
+        writer.writerow([
+            date, ("Clawtbot", "Abhishek Singh")[i % 2], "Build in Public", f"Topic {i}",
+            ("LinkedIn, X, Instagram", "LinkedIn, X", "IG/FB")[i % 3],
+            ("TRUE", "FALSE")[i % 2], "Pending", ("#clawtbot", "#clawtbot,#ai #ml")[i % 2], date,
+        ])
+    return buffer.getvalue()
+
+
+def _normalize_per_row(parser, csv_data):
+    """Reference: the uncompiled, row-at-a-time normalization."""
+    import csv
+    import io
+    from agents.data_parser_agent import _normalize_column_name
+
+    reader = csv.DictReader(io.StringIO(csv_data))
+    mapping = {raw: _normalize_column_name(raw) for raw in reader.fieldnames}
+    return [
+        parser._normalize_row({mapping[k]: (v or "").strip() for k, v in raw.items()}, i + 2)
+        for i, raw in enumerate(reader)
+    ]
+
+
+def test_compiled_plan_matches_per_row_normalization():
+    from agents.data_parser_agent import DataParserAgent
+
+    csv_data = _calendar_csv(2_000)
+    parser = DataParserAgent()
+    rows, _, errors = parser._parse_csv(csv_data)
+
+    assert errors == [] and len(rows) == 2_000
+    assert rows == _normalize_per_row(parser, csv_data)
+
+
+@benchmark
+def test_benchmark_normalization_100k_rows():
+    """The compiled plan beats per-row normalization on 100k rows."""
+    import time
+    from agents.data_parser_agent import DataParserAgent
+
+    csv_data = _calendar_csv(100_000)
+    parser = DataParserAgent()
+
+    started = time.perf_counter()
+    rows, _, errors = parser._parse_csv(csv_data)
+    compiled = time.perf_counter() - started
+
+    started = time.perf_counter()
+    reference = _normalize_per_row(parser, csv_data)
+    per_row = time.perf_counter() - started
+
+    assert errors == [] and len(rows) == 100_000
+    assert rows == reference
+    assert compiled < per_row
+
+
+# ── Test: Concurrent multi-source fetch ─────────────────────────────────────
+
+@pytest.mark.asyncio
+async def test_run_many_fetches_concurrently_in_input_order():
+    import asyncio
+    import httpx
+    from unittest.mock import patch
+    from agents.data_parser_agent import DataParserAgent
+
+    in_flight = {"docs.google.com": 0}
+    peak = {"docs.google.com": 0}
+    attempts = {}
+
+    async def handler(request):
+        host = request.url.host
+        in_flight[host] = in_flight.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), in_flight[host])
+        await asyncio.sleep(0.01)
+        in_flight[host] -= 1
+
+        sheet = request.url.path.split("/")[3]
+        attempts[sheet] = attempts.get(sheet, 0) + 1
+        if sheet == "flaky" and attempts[sheet] == 1:
+            return httpx.Response(503)
+        if sheet == "missing":
+            return httpx.Response(404)
+        return httpx.Response(200, content=f"Topic,Platforms\n{sheet} launch,LinkedIn\n".encode())
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    sheets = [f"brand{i}" for i in range(6)] + ["flaky", "missing"]
+    inputs = [
+        {"source_type": "google_sheet", "url": f"https://docs.google.com/spreadsheets/d/{sheet}/edit"}
+        for sheet in sheets
+    ]
+
+    with patch("agents.data_parser_agent.get_http_client", return_value=client), \
+         patch("config.settings.data_parser_max_per_host", 2), \
+         patch("config.settings.data_parser_backoff_base", 0):
+        results = await DataParserAgent().run_many(inputs)
+    await client.aclose()
+
+    assert peak["docs.google.com"] == 2
+    assert [r["rows"][0]["topic"] for r in results[:7]] == [f"{sheet} launch" for sheet in sheets[:7]]
+    assert results[0]["columns"] == ["topic", "platforms"]
+    assert attempts["flaky"] == 2 and attempts["missing"] == 1
+    assert "404" in results[7]["error"] and results[7]["rows"] == []
+
+
+# ── Test: Streaming database source ─────────────────────────────────────────
+
+@pytest.mark.asyncio
+async def test_stream_database_pages_by_keyset():
+    import uuid
+    from datetime import datetime, timedelta
+    from unittest.mock import MagicMock, patch
+    from sqlalchemy.dialects import postgresql
+    from agents.data_parser_agent import DataParserAgent
+
+    start = datetime(2026, 1, 1)
+    table = [
+        {"id": uuid.uuid4(), "created_at": start - timedelta(minutes=i), "topic": f"post {i}"}
+        for i in range(5)
+    ]
+    queries = []
+
+    class FakeResult:
+        def __init__(self, rows):
+            self.rows = rows
+
+        async def _iter(self):
+            for row in self.rows:
+                yield row
+
+        def mappings(self):
+            return self._iter()
+
+    class FakeSession:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def stream(self, query):
+            queries.append(query)
+            offset = 2 * (len(queries) - 1)
+            return FakeResult(table[offset:offset + 2])
+
+    with patch("db.database.async_session", MagicMock(side_effect=FakeSession)):
+        rows = [row async for row in DataParserAgent().stream_database(
+            "content", {"tone": "casual"}, columns=["topic"], batch_size=2,
+        )]
+
+    assert rows == [{"topic": f"post {i}"} for i in range(5)]
+    assert len(queries) == 3
+    first, second = (
+        str(query.compile(dialect=postgresql.dialect())) for query in queries[:2]
+    )
+    assert "contents.topic" in first and "contents.caption" not in first
+    assert "(contents.created_at, contents.id) <" not in first
+    assert "(contents.created_at, contents.id) <" in second
+    assert queries[0].get_execution_options()["yield_per"] == 2
+
+
+@pytest.mark.asyncio
+async def test_stream_database_rejects_unknown_columns():
+    from agents.data_parser_agent import DataParserAgent
+
+    with pytest.raises(ValueError, match="Unknown column"):
+        async for _ in DataParserAgent().stream_database("content", {"1=1; --": "x"}):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_query_db_is_capped_and_closes_the_stream():
+    import uuid
+    from collections import defaultdict
+    from datetime import datetime
+    from unittest.mock import MagicMock, patch
+    from agents.data_parser_agent import DataParserAgent
+
+    row = defaultdict(lambda: None, id=uuid.uuid4(), created_at=datetime(2026, 1, 1), topic="post")
+    sessions = {"open": 0, "limits": []}
+
+    class FakeResult:
+        def __init__(self, size):
+            self.size = size
+
+        async def _iter(self):
+            for _ in range(self.size):
+                yield row
+
+        def mappings(self):
+            return self._iter()
+
+    class FakeSession:
+        async def __aenter__(self):
+            sessions["open"] += 1
+            return self
+
+        async def __aexit__(self, *exc):
+            sessions["open"] -= 1
+            return False
+
+        async def stream(self, query):
+            limit = query._limit_clause.value
+            sessions["limits"].append(limit)
+            return FakeResult(limit)
+
+    with patch("db.database.async_session", MagicMock(side_effect=FakeSession)), \
+         patch("config.settings.data_parser_db_default_limit", 3):
+        result = await DataParserAgent().query_db("content")
+
+    assert result["total_rows"] == 3 and result["rows"][0]["topic"] == "post"
+    assert sessions["limits"] == [3]   # one page, sized to the cap
+    assert sessions["open"] == 0       # the generator's session was closed on break
@@ -20,8 +20,8 @@ class TestBaseLLMProvider:
         class MockProvider(BaseLLMProvider):
             provider_name = "mock"
 
-            async def generate(self, prompt, system_prompt=None, temperature=0.7,
-                             max_tokens=2048, json_mode=False):
+            async def _generate(self, prompt, system_prompt=None, temperature=0.7,
+                                max_tokens=2048, json_mode=False):
                 return '{"key": "value", "count": 42}'
 
             async def health_check(self):
@@ -38,8 +38,8 @@ class TestBaseLLMProvider:
         class MockProvider(BaseLLMProvider):
             provider_name = "mock"
 
-            async def generate(self, prompt, system_prompt=None, temperature=0.7,
-                             max_tokens=2048, json_mode=False):
+            async def _generate(self, prompt, system_prompt=None, temperature=0.7,
+                                max_tokens=2048, json_mode=False):
                 return '```json\n{"key": "extracted"}\n```'
 
             async def health_check(self):
@@ -56,8 +56,8 @@ class TestBaseLLMProvider:
         class MockProvider(BaseLLMProvider):
             provider_name = "mock"
 
-            async def generate(self, prompt, system_prompt=None, temperature=0.7,
-                             max_tokens=2048, json_mode=False):
+            async def _generate(self, prompt, system_prompt=None, temperature=0.7,
+                                max_tokens=2048, json_mode=False):
                 return "not json at all"
 
             async def health_check(self):
@@ -67,6 +67,18 @@ class TestBaseLLMProvider:
         with pytest.raises(json.JSONDecodeError):
             await provider.generate_json("test prompt")
 
+    def test_provider_without_generate_cannot_be_instantiated(self):
+        from brain.providers import BaseLLMProvider
+
+        class IncompleteProvider(BaseLLMProvider):
+            provider_name = "mock"
+
+            async def health_check(self):
+                return True
+
+        with pytest.raises(TypeError, match="_generate"):
+            IncompleteProvider()
+
 
 class TestOllamaProvider:
     """Test the Ollama provider."""
@@ -385,6 +397,619 @@ class TestGroqProvider:
             assert "groq.com" in url
 
 
+# ─── Response Cache Tests ───────────────────────────────────────────────────
+
+
+def _counting_provider(output: str = '{"ok": true}'):
+    from brain.providers import BaseLLMProvider
+
+    class CountingProvider(BaseLLMProvider):
+        provider_name = "mock"
+        model = "mock-1"
+
+        def __init__(self):
+            self.calls = 0
+
+        async def _generate(self, prompt, system_prompt=None, temperature=0.7,
+                            max_tokens=2048, json_mode=False):
+            self.calls += 1
+            return output
+
+        async def health_check(self):
+            return True
+
+    return CountingProvider()
+
+
+class TestLLMResponseCache:
+    """Test the two-tier LLM response cache."""
+
+    def _cache(self, **kwargs):
+        from brain.llm_cache import LLMResponseCache
+        cache = LLMResponseCache(**kwargs)
+        cache._redis_available = lambda: False
+        return cache
+
+    def test_key_covers_every_generation_parameter(self):
+        from brain.llm_cache import LLMResponseCache
+
+        base = ("ollama", "llama3", "sys", "prompt", 0.3, True, 2048)
+        key = LLMResponseCache.make_key(*base)
+        assert key == LLMResponseCache.make_key(*base)
+        for i, changed in enumerate(["groq", "llama3.1", "other", "p2", 0.4, False, 512]):
+            variant = list(base)
+            variant[i] = changed
+            assert LLMResponseCache.make_key(*variant) != key
+
+    @pytest.mark.asyncio
+    async def test_agent_bound_provider_serves_repeat_from_cache(self):
+        cache = self._cache()
+        provider = _counting_provider()
+        bound = provider.for_agent("hashtag_generator")
+
+        with patch("brain.llm_cache.llm_cache", cache):
+            first = await bound.generate("tags for AI", temperature=0.7, json_mode=True)
+            second = await bound.generate("tags for AI", temperature=0.7, json_mode=True)
+            await provider.generate("tags for AI", temperature=0.7, json_mode=True)
+
+        assert first == second
+        assert bound.calls == 1
+        assert provider.calls == 1  # unbound call is never cached
+        assert cache.memory_hits == 1 and cache.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_high_temperature_and_invalid_json_bypass_cache(self):
+        cache = self._cache()
+        hot = _counting_provider().for_agent("hashtag_generator")
+        broken = _counting_provider("not json").for_agent("hashtag_generator")
+
+        with patch("brain.llm_cache.llm_cache", cache):
+            await hot.generate("p", temperature=0.95)
+            await hot.generate("p", temperature=0.95)
+            await broken.generate("q", temperature=0.3, json_mode=True)
+            await broken.generate("q", temperature=0.3, json_mode=True)
+
+        assert hot.calls == 2
+        assert broken.calls == 2
+        assert cache.bypassed == 2
+        assert cache.stores == 0
+
+    @pytest.mark.asyncio
+    async def test_lru_evicts_least_recently_used(self):
+        cache = self._cache(max_entries=2)
+        await cache.set("a", "A", 60)
+        await cache.set("b", "B", 60)
+        assert await cache.get("a", 60) == "A"  # a is now most recent
+        await cache.set("c", "C", 60)
+
+        assert await cache.get("b", 60) is None
+        assert await cache.get("a", 60) == "A"
+        assert await cache.get("c", 60) == "C"
+
+    @pytest.mark.asyncio
+    async def test_redis_hit_is_promoted_to_memory(self):
+        from brain.llm_cache import LLMResponseCache, KEY_PREFIX
+
+        cache = LLMResponseCache()
+        redis = AsyncMock()
+        redis.get.return_value = "from redis"
+
+        with patch("config.settings.llm_cache_redis_enabled", True), \
+             patch("utils.redis_client.get_redis", return_value=redis):
+            assert await cache.get("k", 60) == "from redis"
+            assert await cache.get("k", 60) == "from redis"
+
+        redis.get.assert_called_once_with(KEY_PREFIX + "k")
+        assert cache.redis_hits == 1 and cache.memory_hits == 1
+
+
+# ─── Request Coalescing Tests ───────────────────────────────────────────────
+
+
+class TestSingleFlight:
+    """Test coalescing of concurrent identical LLM calls."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_generates_share_one_call(self):
+        import asyncio
+        from brain.llm_router import SingleFlight
+
+        provider = _counting_provider("shared")
+        original = provider._generate
+
+        async def slow_generate(**kwargs):
+            await asyncio.sleep(0.01)
+            return await original(**kwargs)
+
+        provider._generate = slow_generate
+        flight = SingleFlight()
+        with patch("brain.llm_router.llm_single_flight", flight):
+            results = await asyncio.gather(*[provider.generate("same prompt") for _ in range(5)])
+            await provider.generate("different prompt")
+
+        assert results == ["shared"] * 5
+        assert provider.calls == 2
+        assert flight.leaders == 2 and flight.coalesced == 4
+        assert flight.in_flight() == 0
+
+    @pytest.mark.asyncio
+    async def test_all_waiters_receive_the_same_exception(self):
+        import asyncio
+        from brain.llm_router import SingleFlight
+
+        flight = SingleFlight()
+        error = ConnectionError("ollama down")
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise error
+
+        results = await asyncio.gather(
+            *[flight.do("k", failing) for _ in range(3)], return_exceptions=True,
+        )
+        assert all(r is error for r in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_shared_call(self):
+        import asyncio
+        from brain.llm_router import SingleFlight
+
+        flight = SingleFlight()
+        started = asyncio.Event()
+
+        async def work():
+            started.set()
+            await asyncio.sleep(0.02)
+            return "done"
+
+        first = asyncio.create_task(flight.do("k", work))
+        await started.wait()
+        second = asyncio.create_task(flight.do("k", work))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == "done"
+        assert first.cancelled()
+
+
+# ─── Admission Control Tests ────────────────────────────────────────────────
+
+
+class TestAdmissionController:
+    """Test per-provider concurrency limits and the priority wait queue."""
+
+    @pytest.mark.asyncio
+    async def test_never_exceeds_max_in_flight(self):
+        import asyncio
+        from brain.llm_limiter import AdmissionController
+
+        limiter = AdmissionController("ollama", max_in_flight=2, max_waiting=10, wait_timeout=5)
+        running = peak = 0
+
+        async def work():
+            nonlocal running, peak
+            async with limiter.slot():
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        await asyncio.gather(*[work() for _ in range(6)])
+
+        assert peak == 2
+        stats = limiter.stats()
+        assert stats["admitted"] == 6 and stats["queued"] == 4
+        assert stats["in_flight"] == 0 and stats["queue_depth"] == 0
+
+    @pytest.mark.asyncio
+    async def test_interactive_requests_jump_ahead_of_batch(self):
+        import asyncio
+        from brain.llm_limiter import (
+            AdmissionController, PRIORITY_BATCH, PRIORITY_INTERACTIVE,
+        )
+
+        limiter = AdmissionController("ollama", max_in_flight=1, max_waiting=10, wait_timeout=5)
+        order = []
+
+        async def work(name, priority):
+            async with limiter.slot(priority):
+                order.append(name)
+                await asyncio.sleep(0.01)
+
+        await limiter.acquire()  # occupy the only slot
+        tasks = [
+            asyncio.create_task(work("batch-1", PRIORITY_BATCH)),
+            asyncio.create_task(work("batch-2", PRIORITY_BATCH)),
+            asyncio.create_task(work("chat", PRIORITY_INTERACTIVE)),
+        ]
+        await asyncio.sleep(0)
+        assert limiter.stats()["queue_by_priority"] == {"interactive": 1, "normal": 0, "batch": 2}
+        limiter.release()
+        await asyncio.gather(*tasks)
+
+        assert order == ["chat", "batch-1", "batch-2"]
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_full_and_times_out(self):
+        import asyncio
+        from brain.llm_limiter import AdmissionController, LLMOverloadedError
+
+        limiter = AdmissionController("ollama", max_in_flight=1, max_waiting=1, wait_timeout=0.02)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        with pytest.raises(LLMOverloadedError, match="already waiting"):
+            await limiter.acquire()
+        with pytest.raises(LLMOverloadedError, match="no slot free"):
+            await waiter
+
+        limiter.release()
+        stats = limiter.stats()
+        assert stats["rejected"] == 1 and stats["timeouts"] == 1
+        assert stats["in_flight"] == 0 and stats["queue_depth"] == 0
+
+    def test_router_limits_prefer_provider_row_over_config(self):
+        from brain.llm_router import LLMRouter
+
+        router = LLMRouter()
+        limiter = router.admission("ollama")
+        assert router.admission("ollama") is limiter
+        assert limiter.max_in_flight == router.provider_limit("ollama")
+
+        router._provider_limits = {"ollama": 5}
+        assert router.provider_limit("ollama") == 5
+
+
+
+class _FakeAdmissionRedis:
+    """Stand-in for Redis running the shared admission scripts (one provider)."""
+
+    def __init__(self):
+        self.holders = set()
+        self.waiters = {}  # token → score
+
+    async def eval(self, script, numkeys, *args):
+        from brain.llm_limiter import _ACQUIRE_SCRIPT
+        token = args[numkeys]
+        if script != _ACQUIRE_SCRIPT:
+            return int(token in self.holders)
+        limit, score = int(args[numkeys + 1]), float(args[numkeys + 3])
+        self.waiters.setdefault(token, score)
+        rank = sorted(self.waiters, key=self.waiters.get).index(token)
+        if rank < limit - len(self.holders):
+            del self.waiters[token]
+            self.holders.add(token)
+            return 1
+        return 0
+
+    def pipeline(self, transaction=True):
+        fake = self
+
+        class Pipe:
+            def zrem(self, key, token):
+                fake.holders.discard(token)
+                fake.waiters.pop(token, None)
+
+            async def execute(self):
+                return []
+
+        return Pipe()
+
+
+class TestSharedAdmission:
+    """The provider limit and priority order hold across processes."""
+
+    @pytest.mark.asyncio
+    async def test_limit_and_priority_span_processes(self):
+        import asyncio
+        from brain.llm_limiter import (
+            AdmissionController, SharedAdmission, PRIORITY_BATCH, PRIORITY_INTERACTIVE,
+        )
+
+        redis = _FakeAdmissionRedis()
+        # Two processes sharing one limit of 2
+        api, worker = (
+            AdmissionController("ollama", 2, 10, 5, shared=SharedAdmission("ollama"))
+            for _ in range(2)
+        )
+        running = peak = 0
+        order = []
+
+        async def work(limiter, name, priority, hold=0.02):
+            nonlocal running, peak
+            async with limiter.slot(priority):
+                running += 1
+                peak = max(peak, running)
+                order.append(name)
+                await asyncio.sleep(hold)
+                running -= 1
+
+        with patch("utils.redis_client.get_redis", return_value=redis), \
+             patch("config.settings.llm_admission_poll_interval", 0.001):
+            # Holders finish one at a time, so each freed slot has one winner
+            batch = [
+                asyncio.create_task(work(worker, f"batch-{i}", PRIORITY_BATCH, 0.02 * (i + 1)))
+                for i in range(4)
+            ]
+            while len(redis.holders) < 2:  # the worker holds both slots, two batch calls wait
+                await asyncio.sleep(0.001)
+            chat = asyncio.create_task(work(api, "chat", PRIORITY_INTERACTIVE))
+            await asyncio.gather(chat, *batch)
+
+        assert peak == 2
+        assert order.index("chat") == 2  # first in once a slot frees, ahead of queued batch calls
+        assert not redis.holders and not redis.waiters
+        assert api.stats()["scope"] == "shared"
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_process_limit_without_redis(self):
+        from brain.llm_limiter import AdmissionController, SharedAdmission
+
+        redis = MagicMock()
+        redis.eval = AsyncMock(side_effect=ConnectionError("redis down"))
+        limiter = AdmissionController("ollama", 1, 10, 5, shared=SharedAdmission("ollama"))
+
+        with patch("utils.redis_client.get_redis", return_value=redis):
+            async with limiter.slot():
+                pass
+            async with limiter.slot():
+                pass
+
+        redis.eval.assert_awaited_once()  # skipped while backing off
+        stats = limiter.stats()
+        assert stats["scope"] == "process (redis unavailable)" and stats["shared_fallbacks"] == 1
+
+# ─── Circuit Breaker Tests ──────────────────────────────────────────────────
+
+
+class TestCircuitBreaker:
+    """Test per provider/model circuit breakers."""
+
+    def test_opens_after_consecutive_failures_then_half_opens(self):
+        from brain.circuit_breaker import CircuitBreaker, CircuitOpenError, OPEN, HALF_OPEN, CLOSED
+
+        breaker = CircuitBreaker("ollama:llama3")
+        for _ in range(3):
+            breaker.record_failure()
+        assert breaker.current_state() == OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.ensure_available()
+
+        breaker._opened_at -= breaker._open_for  # cool-down elapsed
+        assert breaker.current_state() == HALF_OPEN
+        breaker.record_success(0.2)
+        assert breaker.current_state() == CLOSED
+
+    @pytest.mark.asyncio
+    async def test_half_open_allows_one_trial_and_failure_doubles_cooldown(self):
+        from brain.circuit_breaker import CircuitBreaker, CircuitOpenError, OPEN
+
+        breaker = CircuitBreaker("groq:llama-3.1-8b-instant")
+        for _ in range(3):
+            breaker.record_failure()
+        first_cooldown = breaker._open_for
+        breaker._opened_at -= first_cooldown
+
+        with pytest.raises(ConnectionError):
+            async with breaker.guard():
+                assert not breaker.is_available()  # trial in flight
+                raise ConnectionError("still down")
+
+        assert breaker.current_state() == OPEN
+        assert breaker._open_for == first_cooldown * 2
+        with pytest.raises(CircuitOpenError):
+            async with breaker.guard():
+                pass
+
+    @pytest.mark.asyncio
+    async def test_early_cancellation_is_not_a_failure(self):
+        import asyncio
+        from brain.circuit_breaker import CircuitBreaker
+
+        breaker = CircuitBreaker("openai:gpt-4o-mini")
+
+        async def call():
+            async with breaker.guard():
+                await asyncio.sleep(1)
+
+        task = asyncio.create_task(call())
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert breaker.snapshot()["calls"] == 0
+
+    @pytest.mark.asyncio
+    async def test_open_provider_fails_fast_without_calling_api(self):
+        from brain.circuit_breaker import BreakerRegistry, CircuitOpenError
+
+        registry = BreakerRegistry()
+        provider = _counting_provider()
+        for _ in range(3):
+            registry.get("mock", "mock-1").record_failure()
+
+        with patch("brain.circuit_breaker.llm_breakers", registry):
+            with pytest.raises(CircuitOpenError):
+                await provider.generate("hello")
+
+        assert provider.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_probe_moves_open_breaker_to_half_open(self):
+        from brain.circuit_breaker import BreakerRegistry, HALF_OPEN
+
+        registry = BreakerRegistry()
+        breaker = registry.get("ollama", "llama3")
+        for _ in range(3):
+            breaker.record_failure()
+        breaker.probe = AsyncMock(return_value=True)
+
+        await registry.probe_open_breakers()
+
+        breaker.probe.assert_called_once()
+        assert breaker.current_state() == HALF_OPEN
+
+    def test_router_routes_around_open_override(self):
+        from brain.circuit_breaker import BreakerRegistry
+        from brain.llm_router import LLMRouter
+
+        registry = BreakerRegistry()
+        router = LLMRouter()
+        override = MagicMock(provider_name="openai", model="gpt-4o")
+        default = MagicMock(provider_name="ollama", model="llama3")
+        router._cache["content_creator"] = override
+        router._cache["_default"] = default
+
+        with patch("brain.llm_router.llm_breakers", registry):
+            assert router.get_provider("content_creator") is override
+            for _ in range(3):
+                registry.get("openai", "gpt-4o").record_failure()
+            assert router.get_provider("content_creator") is default
+
+
+# ─── Streaming Tests ────────────────────────────────────────────────────────
+
+
+def _mock_http(body: str):
+    """Real httpx client whose transport replays a canned streaming body."""
+    import httpx
+
+    def handler(request):
+        return httpx.Response(200, content=body.encode("utf-8"))
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+class TestProviderStreaming:
+    """Test token streaming for each wire format."""
+
+    @pytest.mark.asyncio
+    async def test_ollama_streams_ndjson(self):
+        from brain.providers.ollama_provider import OllamaProvider
+
+        body = "\n".join([
+            json.dumps({"response": "Hel", "done": False}),
+            json.dumps({"response": "lo", "done": False}),
+            json.dumps({"response": "", "done": True}),
+        ])
+        provider = OllamaProvider(host="http://test:11434", model="llama3")
+        with patch.object(provider, "_http", return_value=_mock_http(body)):
+            tokens = [t async for t in provider.stream("hi")]
+
+        assert tokens == ["Hel", "lo"]
+
+    @pytest.mark.asyncio
+    async def test_openai_streams_sse_until_done(self):
+        from brain.providers.openai_provider import OpenAIProvider
+
+        body = (
+            'data: {"choices":[{"delta":{"role":"assistant"}}]}\n\n'
+            'data: {"choices":[{"delta":{"content":"Hi"}}]}\n\n'
+            'data: {"choices":[{"delta":{"content":" there"}}]}\n\n'
+            "data: [DONE]\n\n"
+        )
+        provider = OpenAIProvider(api_key="sk-test")
+        with patch.object(provider, "_http", return_value=_mock_http(body)):
+            tokens = [t async for t in provider.stream("hi")]
+
+        assert "".join(tokens) == "Hi there"
+
+    @pytest.mark.asyncio
+    async def test_anthropic_streams_content_block_deltas(self):
+        from brain.providers.anthropic_provider import AnthropicProvider
+
+        body = (
+            "event: message_start\n"
+            'data: {"type":"message_start","message":{}}\n\n'
+            "event: content_block_delta\n"
+            'data: {"type":"content_block_delta","delta":{"type":"text_delta","text":"Hey"}}\n\n'
+            "event: message_stop\n"
+            'data: {"type":"message_stop"}\n\n'
+        )
+        provider = AnthropicProvider(api_key="test-key")
+        with patch.object(provider, "_http", return_value=_mock_http(body)):
+            tokens = [t async for t in provider.stream("hi")]
+
+        assert tokens == ["Hey"]
+
+    @pytest.mark.asyncio
+    async def test_gemini_streams_candidates(self):
+        from brain.providers.gemini_provider import GeminiProvider
+
+        chunk = {"candidates": [{"content": {"parts": [{"text": "Yo"}]}}]}
+        body = f"data: {json.dumps(chunk)}\n\n" * 2
+        provider = GeminiProvider(api_key="test-key")
+        with patch.object(provider, "_http", return_value=_mock_http(body)):
+            tokens = [t async for t in provider.stream("hi")]
+
+        assert tokens == ["Yo", "Yo"]
+
+    @pytest.mark.asyncio
+    async def test_base_stream_falls_back_to_generate(self):
+        from brain.providers import BaseLLMProvider
+
+        class MockProvider(BaseLLMProvider):
+            provider_name = "mock"
+
+            async def _generate(self, prompt, system_prompt=None, temperature=0.7,
+                                max_tokens=2048, json_mode=False):
+                return "whole answer"
+
+            async def health_check(self):
+                return True
+
+        tokens = [t async for t in MockProvider().stream("hi")]
+        assert tokens == ["whole answer"]
+
+
+# ─── HTTP Pool Tests ────────────────────────────────────────────────────────
+
+
+class TestHTTPPool:
+    """Test the shared per-provider connection pools."""
+
+    @pytest.mark.asyncio
+    async def test_pool_is_reused_across_instances(self):
+        from brain.http_pool import close_http_clients
+        from brain.providers.openai_provider import OpenAIProvider
+
+        a = OpenAIProvider(api_key="sk-a")
+        b = OpenAIProvider(api_key="sk-b", model="gpt-4o")
+        try:
+            assert a._http() is b._http()
+            assert not a._http().is_closed
+        finally:
+            await close_http_clients()
+
+    @pytest.mark.asyncio
+    async def test_pools_are_per_provider(self):
+        from brain.http_pool import close_http_clients
+        from brain.providers.groq_provider import GroqProvider
+        from brain.providers.ollama_provider import OllamaProvider
+
+        groq = GroqProvider(api_key="gsk-test")
+        ollama = OllamaProvider(host="http://test:11434")
+        try:
+            assert groq._http() is not ollama._http()
+        finally:
+            await close_http_clients()
+
+    @pytest.mark.asyncio
+    async def test_close_reopens_fresh_pool(self):
+        from brain.providers.ollama_provider import OllamaProvider
+
+        provider = OllamaProvider(host="http://test:11434")
+        first = provider._http()
+        await provider.aclose()
+
+        assert first.is_closed
+        second = provider._http()
+        assert second is not first
+        await provider.aclose()
+
+
 # ─── Router Tests ───────────────────────────────────────────────────────────
 
 
@@ -440,6 +1065,135 @@ class TestLLMRouter:
         router.invalidate_cache()
         assert len(router._cache) == 0
 
+    def test_load_agent_config_reads_snapshot(self):
+        from brain.llm_router import LLMRouter
+        from brain.providers.groq_provider import GroqProvider
+        from utils.crypto import encrypt_value
+
+        router = LLMRouter()
+        router._agent_configs = {
+            "review_agent": {
+                "provider": "groq",
+                "model": "llama-3.1-8b-instant",
+                "api_key_encrypted": encrypt_value("gsk-test"),
+            },
+        }
+
+        provider = router._load_agent_config("review_agent")
+        assert isinstance(provider, GroqProvider)
+        assert provider.api_key == "gsk-test"
+        assert provider.model == "llama-3.1-8b-instant"
+        assert router._load_agent_config("content_creator") is None
+
+    @pytest.mark.asyncio
+    async def test_provider_for_reuses_instances_and_decrypts_once(self):
+        from brain.llm_router import LLMRouter
+        from brain.providers.openai_provider import OpenAIProvider
+        from utils import crypto
+
+        row = MagicMock(provider="openai", api_key_encrypted=crypto.encrypt_value("sk-live"))
+        session = AsyncMock()
+        session.execute.return_value = MagicMock(all=MagicMock(return_value=[row]))
+        session_cm = MagicMock()
+        session_cm.__aenter__ = AsyncMock(return_value=session)
+        session_cm.__aexit__ = AsyncMock(return_value=False)
+
+        router = LLMRouter()
+        with patch("db.database.async_session", return_value=session_cm), \
+             patch("utils.crypto.decrypt_value", wraps=crypto.decrypt_value) as mock_decrypt:
+            first = await router.provider_for("openai")
+            second = await router.provider_for("openai")
+            missing = await router.provider_for("groq")
+
+        assert isinstance(first, OpenAIProvider) and first.api_key == "sk-live"
+        assert second is first
+        assert missing is None
+        session.execute.assert_called_once()
+        mock_decrypt.assert_called_once()
+
+        with patch.object(router, "_publish_invalidation"):
+            router.invalidate_cache()
+        assert router._instances == {} and router._credentials_loaded_at is None
+
+    def test_fernet_is_built_once(self):
+        from utils.crypto import get_fernet
+
+        assert get_fernet() is get_fernet()
+
+    @pytest.mark.asyncio
+    async def test_resolve_provider_skips_db_while_fresh(self):
+        from brain.llm_router import LLMRouter
+
+        router = LLMRouter()
+        router._configs_loaded_at = __import__("time").monotonic()
+
+        with patch("db.database.async_session") as mock_session:
+            with patch.object(router, "get_default_provider") as mock_default:
+                provider = await router.resolve_provider("content_creator")
+
+        mock_session.assert_not_called()
+        mock_default.return_value.for_agent.assert_called_once_with("content_creator")
+        assert provider is mock_default.return_value.for_agent.return_value
+
+    def test_invalidate_marks_snapshot_stale_and_broadcasts(self):
+        from brain.llm_router import LLMRouter
+
+        router = LLMRouter()
+        router._configs_loaded_at = 123.0
+        with patch.object(router, "_publish_invalidation") as mock_publish:
+            router.invalidate_cache("content_creator")
+
+        assert router._configs_loaded_at is None
+        mock_publish.assert_called_once_with("content_creator")
+
+    def test_remote_invalidation_ignores_own_messages(self):
+        from brain.llm_router import LLMRouter
+
+        router = LLMRouter()
+        router._cache["content_creator"] = MagicMock()
+
+        own = {"data": json.dumps({"origin": router._instance_id, "agent_id": "content_creator"})}
+        router._on_invalidation_message(own)
+        assert "content_creator" in router._cache
+
+        with patch.object(router, "_publish_invalidation") as mock_publish:
+            remote = {"data": json.dumps({"origin": "other-worker", "agent_id": "content_creator"})}
+            router._on_invalidation_message(remote)
+
+        assert "content_creator" not in router._cache
+        mock_publish.assert_not_called()
+
+    def test_listener_error_resubscribes_and_marks_config_stale(self):
+        from brain.llm_router import LLMRouter, CONFIG_INVALIDATION_CHANNEL
+
+        router = LLMRouter()
+        router._configs_loaded_at = 123.0
+        router._cache["content_creator"] = MagicMock()
+        pubsub = MagicMock()
+
+        with patch("brain.llm_router.time.sleep") as mock_sleep, \
+             patch.object(router, "_publish_invalidation") as mock_publish:
+            router._on_listener_error(ConnectionError("gone"), pubsub, MagicMock())
+
+        mock_sleep.assert_called_once()
+        pubsub.subscribe.assert_called_once_with(
+            **{CONFIG_INVALIDATION_CHANNEL: router._on_invalidation_message}
+        )
+        assert router._configs_loaded_at is None
+        assert not router._cache
+        mock_publish.assert_not_called()
+
+    def test_listener_thread_gets_exception_handler(self):
+        from brain.llm_router import LLMRouter
+
+        router = LLMRouter()
+        mock_redis = MagicMock()
+        with patch("utils.redis_client.get_sync_redis", return_value=mock_redis):
+            router.start_invalidation_listener()
+
+        run_in_thread = mock_redis.pubsub.return_value.run_in_thread
+        assert run_in_thread.call_args.kwargs["exception_handler"] == router._on_listener_error
+
 
 class TestCreateProvider:
     """Test the provider factory function."""
@@ -253,6 +253,463 @@ class TestMasterAgentChat:
         assert result["action_data"] is not None
 
 
+class TestMasterAgentStreaming:
+    """Test the streaming chat flow."""
+
+    def setup_method(self):
+        self.agent = MasterAgent()
+
+    def test_extractor_decodes_split_response_field(self):
+        from agents.master_agent import _ResponseTextExtractor
+
+        raw = json.dumps({
+            "intent": "help",
+            "params": {},
+            "response": "Line \"one\"\nnext 🚀",
+        })
+        extractor = _ResponseTextExtractor()
+        text = "".join(extractor.feed(raw[i:i + 3]) for i in range(0, len(raw), 3))
+        assert text == "Line \"one\"\nnext 🚀"
+
+    @pytest.mark.asyncio
+    async def test_chat_stream_yields_tokens_then_result(self):
+        raw = json.dumps({"intent": "help", "params": {}, "response": "I can help!"})
+
+        async def fake_stream(**kwargs):
+            for i in range(0, len(raw), 5):
+                yield raw[i:i + 5]
+
+        mock_llm = MagicMock()
+        mock_llm.stream = fake_stream
+
+        with patch("agents.master_agent.get_llm", return_value=mock_llm):
+            events = [e async for e in self.agent.chat_stream("What can you do?", user_id="test-user")]
+
+        tokens = "".join(e["text"] for e in events if e["type"] == "token")
+        assert tokens == "I can help!"
+        assert events[-1]["type"] == "result"
+        assert events[-1]["result"]["intent"] == "help"
+
+    @pytest.mark.asyncio
+    async def test_chat_stream_falls_back_when_stream_fails(self):
+        async def broken_stream(**kwargs):
+            raise ConnectionError("stream down")
+            yield  # pragma: no cover
+
+        mock_llm = MagicMock()
+        mock_llm.stream = broken_stream
+        fallback_raw = json.dumps({"intent": "general_chat", "params": {}, "response": "Hi!"})
+
+        with patch("agents.master_agent.get_llm", return_value=mock_llm), \
+             patch.object(self.agent, "_call_llm_with_fallback",
+                          AsyncMock(return_value=fallback_raw)) as mock_fallback:
+            events = [e async for e in self.agent.chat_stream("hello", user_id="test-user")]
+
+        mock_fallback.assert_called_once()
+        assert mock_fallback.call_args.kwargs["skip_primary"] is True
+        assert events == [{"type": "result", "result": events[-1]["result"]}]
+        assert events[-1]["result"]["response"] == "Hi!"
+
+
+class TestMasterAgentHedging:
+    """Test hedged requests across the fallback chain."""
+
+    def setup_method(self):
+        from brain.circuit_breaker import BreakerRegistry
+        from brain.llm_hedging import HedgeController
+
+        self.agent = MasterAgent()
+        self.hedging = HedgeController()
+        self.patches = [
+            patch("config.settings.llm_hedging_enabled", True),
+            patch("config.settings.llm_hedge_default_delay", 0.01),
+            patch("config.settings.llm_hedge_min_delay", 0.01),
+            patch("brain.llm_hedging.llm_hedging", self.hedging),
+            patch("brain.circuit_breaker.llm_breakers", BreakerRegistry()),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def teardown_method(self):
+        for p in self.patches:
+            p.stop()
+
+    def _provider(self, name, reply, delay=0.0, error=None):
+        import asyncio
+
+        async def generate(**kwargs):
+            await asyncio.sleep(delay)
+            if error:
+                raise error
+            return reply
+
+        llm = MagicMock(provider_name=name, model=f"{name}-model")
+        llm.generate = AsyncMock(side_effect=generate)
+        return llm
+
+    def _chain(self, primary, fallbacks):
+        by_name = {llm.provider_name: llm for llm in fallbacks}
+        return [
+            patch.object(self.agent, "_get_primary_llm", AsyncMock(return_value=primary)),
+            patch.object(self.agent, "_fallback_models",
+                         return_value=[(llm.provider_name, llm.model) for llm in fallbacks]),
+            patch.object(self.agent, "_fallback_provider",
+                         AsyncMock(side_effect=lambda name, model: by_name[name])),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_fast_fallback_wins_over_slow_primary(self):
+        reply = json.dumps({"intent": "help", "params": {}, "response": "fast"})
+        primary = self._provider("ollama", "{}", delay=5)
+        groq = self._provider("groq", reply)
+
+        p1, p2, p3 = self._chain(primary, [groq])
+        with p1, p2, p3:
+            raw = await self.agent._call_llm_with_fallback("hi", "sys")
+
+        assert raw == reply
+        assert self.hedging.wins == {"groq": 1}
+        assert self.hedging.hedged_turns == 1
+
+    @pytest.mark.asyncio
+    async def test_paid_hedge_budget_is_respected(self):
+        reply = json.dumps({"intent": "help", "params": {}, "response": "slow but ok"})
+        primary = self._provider("ollama", reply, delay=0.05)
+        groq = self._provider("groq", "{}")
+
+        p1, p2, p3 = self._chain(primary, [groq])
+        with p1, p2, p3, patch("config.settings.llm_hedge_max_paid_per_minute", 0):
+            raw = await self.agent._call_llm_with_fallback("hi", "sys")
+
+        assert raw == reply
+        groq.generate.assert_not_called()
+        assert self.hedging.budget_denied == 1
+        assert self.hedging.wins == {"ollama": 1}
+
+    @pytest.mark.asyncio
+    async def test_failures_and_invalid_json_move_to_next_provider(self):
+        reply = json.dumps({"intent": "list_content", "params": {}, "response": "ok"})
+        primary = self._provider("ollama", None, error=ConnectionError("down"))
+        openai = self._provider("openai", "not json")
+        gemini = self._provider("gemini", reply)
+
+        p1, p2, p3 = self._chain(primary, [openai, gemini])
+        with p1, p2, p3:
+            raw = await self.agent._call_llm_with_fallback("hi", "sys")
+
+        assert raw == reply
+        assert self.hedging.wins == {"gemini": 1}
+
+    @pytest.mark.asyncio
+    async def test_hedge_budget_is_charged_only_for_calls_made(self):
+        reply = json.dumps({"intent": "help", "params": {}, "response": "fast"})
+        primary = self._provider("ollama", "{}", delay=5)
+        groq = self._provider("groq", reply)
+        fallbacks = [("openai", "gpt"), ("anthropic", "claude"), ("gemini", "flash"), ("groq", groq.model)]
+
+        with patch.object(self.agent, "_get_primary_llm", AsyncMock(return_value=primary)), \
+             patch.object(self.agent, "_fallback_models", return_value=fallbacks), \
+             patch.object(self.agent, "_fallback_provider",  # only groq has a key
+                          AsyncMock(side_effect=lambda name, model: groq if name == "groq" else None)):
+            raw = await self.agent._call_llm_with_fallback("hi", "sys")
+
+        assert raw == reply
+        assert self.hedging.hedges_fired == 1
+        assert self.hedging.stats()["paid_hedges_last_minute"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_hedge_is_replaced_while_primary_runs(self):
+        reply = json.dumps({"intent": "help", "params": {}, "response": "fast"})
+        primary = self._provider("ollama", "{}", delay=5)
+        openai = self._provider("openai", None, error=ConnectionError("down"))
+        groq = self._provider("groq", reply)
+
+        p1, p2, p3 = self._chain(primary, [openai, groq])
+        with p1, p2, p3, patch("config.settings.llm_hedge_max_paid_per_minute", 1):
+            raw = await self.agent._call_llm_with_fallback("hi", "sys")
+
+        assert raw == reply
+        assert self.hedging.budget_denied == 0
+        assert self.hedging.wins == {"groq": 1}
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# User Memory
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class _RecordingBackend:
+    """Durable store stand-in that keeps full memories and records batches."""
+
+    name = "test"
+
+    def __init__(self, stored=None):
+        self.stored = stored or {}
+        self.batches = []
+        self.down = False
+
+    async def load(self, user_id):
+        return self.stored.get(user_id)
+
+    async def save(self, user_id, mem):
+        self.stored[user_id] = mem
+
+    async def apply(self, deltas):
+        from brain.user_memory_store import apply_delta, empty_memory
+        self.batches.append(deltas)
+        if self.down:
+            return False
+        for user_id, delta in deltas.items():
+            apply_delta(self.stored.setdefault(user_id, empty_memory()), delta)
+        return True
+
+
+class TestUserMemory:
+    """Bounded LRU + write-behind in front of a durable backend."""
+
+    def setup_method(self):
+        from agents.master_agent import UserMemory
+        self.backend = _RecordingBackend()
+        self.memory = UserMemory(backend=self.backend)
+
+    @pytest.mark.asyncio
+    async def test_records_locally_and_flushes_in_one_batch(self):
+        with patch("agents.master_agent.load_from_chat_history", AsyncMock(return_value=None)):
+            await self.memory.ensure_loaded("u1")
+        self.memory.record_interaction("u1", "run_workflow", "post", {"topic": "AI", "platform": "instagram"})
+        self.memory.record_interaction("u1", "run_workflow", "post", {"topic": "ML"})
+        self.memory.record_interaction("u2", "help", "help")
+
+        assert "Recent topics: AI, ML." in self.memory.get_context("u1")
+        assert self.backend.batches == []
+
+        await self.memory.flush()
+
+        assert len(self.backend.batches) == 1
+        stored = self.backend.stored["u1"]
+        assert stored["message_count"] == 2
+        assert stored["intent_counts"] == {"run_workflow": 2}
+        assert stored["topics"] == ["AI", "ML"]
+        assert stored["preferred_platform"] == "instagram"
+        assert self.memory.stats()["pending_users"] == 0
+
+    @pytest.mark.asyncio
+    async def test_lru_is_bounded_by_size_and_idle_ttl(self):
+        with patch("config.settings.user_memory_max_users", 2):
+            for user_id in ("a", "b", "c"):
+                self.memory.record_interaction(user_id, "help", "hi")
+        assert list(self.memory._store) == ["b", "c"]
+
+        with patch("config.settings.user_memory_idle_ttl", 0.0):
+            self.memory.record_interaction("d", "help", "hi")
+        assert list(self.memory._store) == ["d"]
+        assert self.memory.stats()["evictions"] == 3
+        # Evicted users' updates are still written
+        await self.memory.flush()
+        assert set(self.backend.stored) == {"a", "b", "c", "d"}
+
+    @pytest.mark.asyncio
+    async def test_warm_loads_from_chat_history_once(self):
+        from brain.user_memory_store import empty_memory
+        history = empty_memory()
+        history["message_count"] = 7
+        history["intent_counts"]["list_content"] = 4
+        warm = AsyncMock(return_value=history)
+
+        with patch("agents.master_agent.load_from_chat_history", warm):
+            await self.memory.ensure_loaded("u1")
+            await self.memory.ensure_loaded("u1")
+
+        warm.assert_awaited_once_with("u1")
+        assert self.backend.stored["u1"]["message_count"] == 7
+        assert "User has sent 7 messages." in self.memory.get_context("u1")
+        assert self.memory.stats()["warm_loads"] == 1
+
+    @pytest.mark.asyncio
+    async def test_refresh_flushes_own_updates_before_rereading(self):
+        self.memory.record_interaction("u1", "help", "hi")  # before any load
+
+        with patch("agents.master_agent.load_from_chat_history", AsyncMock(return_value=None)):
+            await self.memory.ensure_loaded("u1")
+
+        assert self.backend.stored["u1"]["message_count"] == 1
+        assert self.memory.get_stats("u1")["message_count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_refresh_keeps_local_copy_when_backend_has_nothing(self):
+        from agents.master_agent import UserMemory
+        from brain.user_memory_store import UserMemoryBackend
+        memory = UserMemory(backend=UserMemoryBackend())
+        warm = AsyncMock(return_value=None)
+
+        with patch("agents.master_agent.load_from_chat_history", warm), \
+             patch("config.settings.user_memory_refresh_seconds", 0.0):
+            await memory.ensure_loaded("u1")
+            memory.record_interaction("u1", "run_workflow", "post", {"topic": "AI", "tone": "witty"})
+            await memory.ensure_loaded("u1")
+            await memory.ensure_loaded("u1")
+
+        warm.assert_awaited_once_with("u1")
+        stats = memory.get_stats("u1")
+        assert stats["recent_topics"] == ["AI"] and stats["preferred_tone"] == "witty"
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_requeues_the_batch(self):
+        self.memory.record_interaction("u1", "help", "hi", {"platform": "instagram"})
+        self.backend.down = True
+        await self.memory.flush()
+        self.memory.record_interaction("u1", "help", "again", {"platform": "linkedin"})
+
+        assert self.memory.stats()["pending_users"] == 1
+        self.backend.down = False
+        await self.memory.flush()
+
+        stored = self.backend.stored["u1"]
+        assert stored["message_count"] == 2
+        assert stored["preferred_platform"] == "linkedin"
+        assert self.memory.stats()["flushes"] == 1
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Conversation Summary
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestConversationSummary:
+    """Rolling summary of messages older than the history window."""
+
+    def setup_method(self):
+        self.agent = MasterAgent()
+
+    def test_summary_is_part_of_the_prompt(self):
+        history = [{"role": "user", "content": "Hi"}]
+        prompt, _ = self.agent._build_prompts(
+            "And for LinkedIn?", "test-user", history, "User drafted an AI post for Instagram.",
+        )
+        assert "Earlier in this conversation: User drafted an AI post for Instagram." in prompt
+        assert prompt.index("Earlier in this conversation") < prompt.index("User: Hi")
+
+    def test_prompt_history_follows_settings(self):
+        history = [{"role": "user", "content": f"message {i}"} for i in range(20)]
+        with patch("config.settings.chat_history_window", 4), \
+             patch("config.settings.chat_summary_min_messages", 3):
+            prompt, _ = self.agent._build_prompts("next", "test-user", history)
+
+        assert "User: message 14\n" in prompt and "User: message 19\n" in prompt
+        assert "User: message 13\n" not in prompt
+
+    @pytest.mark.asyncio
+    async def test_summarize_history_sends_only_new_messages(self):
+        mock_llm = AsyncMock()
+        mock_llm.generate = AsyncMock(return_value="  User wants weekly AI posts.  ")
+        messages = [
+            {"role": "user", "content": "Post about AI every week"},
+            {"role": "assistant", "content": "Sure!"},
+        ]
+
+        with patch("agents.master_agent.get_llm", return_value=mock_llm):
+            summary = await self.agent.summarize_history("User is a marketer.", messages)
+
+        assert summary == "User wants weekly AI posts."
+        prompt = mock_llm.generate.call_args.kwargs["prompt"]
+        assert "User is a marketer." in prompt
+        assert "User: Post about AI every week" in prompt
+        assert "Assistant: Sure!" in prompt
+
+    @pytest.mark.asyncio
+    async def test_summarize_history_returns_none_on_failure(self):
+        mock_llm = AsyncMock()
+        mock_llm.generate = AsyncMock(side_effect=ConnectionError("down"))
+
+        with patch("agents.master_agent.get_llm", return_value=mock_llm):
+            assert await self.agent.summarize_history(None, [{"role": "user", "content": "x"}]) is None
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Intent Fast Path
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestIntentFastPath:
+    """Rule-matched commands skip the LLM; everything else falls through."""
+
+    def setup_method(self):
+        from agents.master_agent import IntentClassifier
+        self.classifier = IntentClassifier()
+        self.agent = MasterAgent()
+
+    def test_classifies_commands_with_params(self):
+        assert self.classifier.classify("list my content") == ("list_content", {}, "en")
+        assert self.classifier.classify("Show me my 10 approved posts!") == (
+            "list_content", {"limit": 10, "status": "approved"}, "en",
+        )
+        assert self.classifier.classify("approve 123E4567-e89b-12d3-a456-426614174000") == (
+            "approve_content", {"content_id": "123e4567-e89b-12d3-a456-426614174000"}, "en",
+        )
+        assert self.classifier.classify("test groq") == ("test_provider", {"provider": "groq"}, "en")
+        assert self.classifier.classify("mera content dikhao")[0] == "list_content"
+        assert self.classifier.classify("system status?")[0] == "get_system_status"
+
+    def test_ambiguous_messages_fall_through(self):
+        for message in (
+            "Create an Instagram post about AI trends",
+            "what's the status of my post about cats?",
+            "show content about dogs",
+            "delete 123e4567-e89b-12d3-a456-426614174000",
+            "who are you?",
+        ):
+            assert self.classifier.classify(message) is None, message
+
+        stats = self.classifier.stats()
+        assert stats["hits"] == 0 and stats["misses"] == 5
+        assert stats["hit_rate"] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_chat_skips_llm_on_hit(self):
+        with patch("agents.master_agent.get_llm") as mock_get_llm, \
+             patch("agents.master_agent.ActionExecutor._handle_list_content") as mock_list:
+            mock_list.return_value = {"success": True, "message": "Found 1", "data": [{"id": "abc"}]}
+            result = await self.agent.chat(message="show my draft content", user_id="test-user")
+
+        mock_get_llm.assert_not_called()
+        mock_list.assert_called_once_with({"status": "draft"})
+        assert result["intent"] == "list_content"
+        assert result["action_success"] is True
+        assert "abc" in result["response"]
+
+    @pytest.mark.asyncio
+    async def test_failed_action_replaces_template(self):
+        with patch("agents.master_agent.get_llm") as mock_get_llm, \
+             patch("agents.master_agent.ActionExecutor._handle_approve_content") as mock_approve:
+            mock_approve.return_value = {"success": False, "message": "Content not found"}
+            result = await self.agent.chat(
+                message="approve 123e4567-e89b-12d3-a456-426614174000", user_id="test-user",
+            )
+
+        mock_get_llm.assert_not_called()
+        assert result["action_success"] is False
+        assert result["response"] == "⚠️ Content not found"
+
+    @pytest.mark.asyncio
+    async def test_guest_is_still_gated(self):
+        with patch("agents.master_agent.get_llm") as mock_get_llm, \
+             patch("agents.master_agent.ActionExecutor._handle_list_providers") as mock_list:
+            result = await self.agent.chat(
+                message="show providers", user_id="guest", is_authenticated=False,
+            )
+
+        mock_get_llm.assert_not_called()
+        mock_list.assert_not_called()
+        assert result["action_data"] == {"requires_login": True}
+
+    @pytest.mark.asyncio
+    async def test_chat_stream_hit_yields_template_and_result(self):
+        with patch("agents.master_agent.get_llm") as mock_get_llm:
+            events = [e async for e in self.agent.chat_stream("help", user_id="test-user")]
+
+        mock_get_llm.assert_not_called()
+        assert [e["type"] for e in events] == ["token", "result"]
+        assert events[1]["result"]["intent"] == "help"
+        assert events[0]["text"] == events[1]["result"]["response"]
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # Integration Checks
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -76,3 +76,456 @@ async def test_content_pipeline_full():
         mock_cc_llm.generate_json.assert_called_once()
         mock_hg_llm.generate_json.assert_called_once()
         mock_ra_llm.generate_json.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_content_and_hashtags_run_concurrently():
+    """Hashtags don't wait for the content stage; review waits for both."""
+    import asyncio
+    from workflow.pipeline import ContentPipeline
+
+    running = set()
+    overlapped = []
+
+    def agent(name, output, delay=0.05):
+        async def run(input_data):
+            running.add(name)
+            overlapped.append(set(running))
+            await asyncio.sleep(delay)
+            running.discard(name)
+            return output
+        return run
+
+    pipeline = ContentPipeline()
+    pipeline.content_creator.run = agent("content", {"caption": "c"})
+    pipeline.hashtag_generator.run = agent("hashtags", {"niche_hashtags": ["#a"], "broad_hashtags": ["#b"]})
+    pipeline.review_agent.run = AsyncMock(return_value={"is_approved": False})
+
+    with patch.object(ContentPipeline, "_save_to_db", AsyncMock(return_value="content-id")):
+        result = await pipeline.run(topic="AI", platform="instagram")
+
+    assert {"content", "hashtags"} in overlapped
+    review_input = pipeline.review_agent.run.call_args.args[0]
+    assert review_input["caption"] == "c" and review_input["niche_hashtags"] == ["#a"]
+    assert result["content_id"] == "content-id"
+    assert result["status"] == "draft"
+    assert set(result["timings_ms"]) == {"content", "hashtags", "review", "save", "total"}
+    timings = result["timings_ms"]
+    assert timings["total"] < timings["content"] + timings["hashtags"] + timings["review"] + timings["save"]
+
+
+@pytest.mark.asyncio
+async def test_stage_failure_cancels_running_stages():
+    import asyncio
+    from workflow.stage_graph import Stage, StageGraph
+
+    cancelled = []
+
+    async def slow(results):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append("slow")
+            raise
+
+    async def broken(results):
+        raise ValueError("LLM returned garbage")
+
+    after = AsyncMock()
+    graph = StageGraph([
+        Stage("slow", slow),
+        Stage("broken", broken),
+        Stage("after", after, after=("slow", "broken")),
+    ])
+
+    with pytest.raises(ValueError, match="garbage"):
+        await graph.run()
+
+    assert cancelled == ["slow"]
+    after.assert_not_called()
+
+
+def test_stage_graph_rejects_cycles_and_unknown_dependencies():
+    from workflow.stage_graph import Stage, StageGraph
+
+    noop = AsyncMock()
+    with pytest.raises(ValueError, match="unknown"):
+        StageGraph([Stage("a", noop, after=("missing",))])
+    with pytest.raises(ValueError, match="Cycle"):
+        StageGraph([Stage("a", noop, after=("b",)), Stage("b", noop, after=("a",))])
+
+
+@pytest.mark.asyncio
+async def test_process_upload_bounds_concurrency_and_tracks_progress():
+    """Entries run concurrently up to the limit; progress is counted per entry."""
+    import asyncio
+    from workflow.calendar_pipeline import CalendarPipeline
+
+    pipeline = CalendarPipeline()
+    in_flight = 0
+    peak = 0
+
+    async def process_entry(entry_id):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if entry_id == "e3":
+            raise RuntimeError("provider down")
+        return {"success": entry_id != "e4", "entry_id": entry_id}
+
+    progress = []
+    pipeline.process_entry = process_entry
+    pipeline.claimable_entry_ids = AsyncMock(return_value=[f"e{i}" for i in range(10)])
+    pipeline.claim_entry = AsyncMock(return_value=True)
+    pipeline.start_progress = AsyncMock()
+    pipeline.record_progress = AsyncMock(side_effect=lambda upload_id, ok: progress.append(ok))
+    pipeline._update_upload = AsyncMock()
+
+    result = await pipeline.process_upload("upload-1", concurrency=3)
+
+    assert peak == 3
+    pipeline.start_progress.assert_awaited_once_with("upload-1", 10)
+    assert progress.count(True) == 8 and progress.count(False) == 2
+    assert [r["entry_id"] for r in result["results"]] == [f"e{i}" for i in range(10)]
+    assert result["results"][3]["error"] == "provider down"
+    assert (result["total_entries"], result["success"], result["failed"]) == (10, 8, 2)
+
+
+@pytest.mark.asyncio
+async def test_entry_claimed_by_another_run_is_skipped():
+    from workflow.calendar_pipeline import CalendarPipeline
+
+    pipeline = CalendarPipeline()
+    pipeline.process_entry = AsyncMock(return_value={"success": True, "entry_id": "e1"})
+    pipeline.claimable_entry_ids = AsyncMock(return_value=["e0", "e1"])
+    pipeline.claim_entry = AsyncMock(side_effect=lambda entry_id, retry_failed: entry_id == "e1")
+    pipeline.start_progress = AsyncMock()
+    pipeline.record_progress = AsyncMock()
+    pipeline._update_upload = AsyncMock()
+
+    result = await pipeline.process_upload("upload-1", concurrency=2, retry_failed=True)
+
+    pipeline.process_entry.assert_awaited_once_with("e1")
+    pipeline.record_progress.assert_awaited_once_with("upload-1", True)
+    pipeline.claim_entry.assert_any_await("e0", True)
+    assert (result["success"], result["failed"], result["skipped"]) == (1, 0, 1)
+
+
+def test_claim_abandoned_after_timeout():
+    from datetime import datetime, timedelta
+    from db.calendar_models import CalendarEntryStatus
+    from workflow.calendar_pipeline import _claim_abandoned
+
+    now = datetime.utcnow()
+    with patch("config.settings.calendar_claim_timeout", 600):
+        assert not _claim_abandoned(CalendarEntryStatus.QUEUED, now - timedelta(seconds=60))
+        assert _claim_abandoned(CalendarEntryStatus.QUEUED, now - timedelta(seconds=900))
+        assert _claim_abandoned(CalendarEntryStatus.QUEUED, None)  # claimed before claims were stamped
+        assert not _claim_abandoned(CalendarEntryStatus.APPROVED, now - timedelta(days=1))
+
+
+@pytest.mark.asyncio
+async def test_default_concurrency_respects_provider_limit():
+    from workflow.calendar_pipeline import CalendarPipeline
+
+    provider = MagicMock(provider_name="ollama")
+    with patch("brain.llm_router.resolve_llm", AsyncMock(return_value=provider)), \
+         patch("brain.llm_router.llm_router.provider_limit", return_value=2), \
+         patch("config.settings.calendar_max_concurrent_entries", 8):
+        assert await CalendarPipeline().default_concurrency() == 2
+
+
+def _calendar_entry(**values):
+    """A detached stand-in for a CalendarEntry row (every column defaults to None)."""
+    from types import SimpleNamespace
+    from db.calendar_models import CalendarEntry
+
+    row = {column.name: None for column in CalendarEntry.__table__.columns}
+    row.update(values)
+    return SimpleNamespace(**row)
+
+
+def _fake_session_factory(entry):
+    """async_session() stand-in whose queries all return `entry`; `.open` counts live sessions."""
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=MagicMock(scalar_one_or_none=MagicMock(return_value=entry)))
+    session.commit = AsyncMock()
+    session.flush = AsyncMock()
+    session.add = MagicMock()
+    factory = MagicMock(return_value=session)
+    factory.session, factory.open = session, 0
+
+    async def enter():
+        factory.open += 1
+        return session
+
+    async def exit(*exc):
+        factory.open -= 1
+        return False
+
+    session.__aenter__ = AsyncMock(side_effect=enter)
+    session.__aexit__ = AsyncMock(side_effect=exit)
+    return factory
+
+
+@pytest.mark.asyncio
+async def test_process_entry_resumes_from_first_incomplete_stage():
+    """A retry reuses checkpointed stage outputs and only reruns what failed."""
+    from db.calendar_models import CalendarEntryStatus, PipelineStage
+    from workflow.calendar_pipeline import CalendarPipeline
+
+    entry = _calendar_entry(
+        id="entry-1", topic="AI tools", platforms=["instagram"], tone="casual",
+        approval_required=False,
+    )
+    pipeline = CalendarPipeline()
+    pipeline.content_creator.run = AsyncMock(return_value={
+        "platforms": {"instagram": {"caption": "c", "post_text": "Post about AI"}},
+    })
+    pipeline.hashtag_generator.run = AsyncMock(side_effect=RuntimeError("LLM timeout"))
+    pipeline.review_agent.run = AsyncMock(return_value={"overall_score": 8, "is_approved": True})
+
+    with patch("db.database.async_session", _fake_session_factory(entry)):
+        first = await pipeline.process_entry("entry-1")
+        assert first["success"] is False
+        assert entry.status == CalendarEntryStatus.FAILED
+        assert set(entry.stage_outputs) == {"content_creation", "_inputs"}
+
+        pipeline.hashtag_generator.run = AsyncMock(return_value={
+            "platforms": {"instagram": {"niche_hashtags": ["#AItools"], "broad_hashtags": ["#AI"]}},
+        })
+        second = await pipeline.process_entry("entry-1")
+
+    assert second["success"] is True
+    pipeline.content_creator.run.assert_awaited_once()
+    pipeline.hashtag_generator.run.assert_awaited_once()
+    pipeline.review_agent.run.assert_awaited_once()
+    assert entry.pipeline_stage == PipelineStage.SCHEDULING
+    assert set(entry.stage_outputs) == {"content_creation", "hashtag_generation", "review", "_inputs"}
+
+
+def test_checkpoint_discarded_when_entry_inputs_change():
+    from db.calendar_models import PipelineStage
+    from workflow.calendar_pipeline import CalendarPipeline
+
+    pipeline = CalendarPipeline()
+    entry = _calendar_entry(topic="AI tools", platforms=["instagram"])
+    pipeline._save_checkpoint(entry, PipelineStage.CONTENT_CREATION, {"instagram": {}})
+    assert pipeline._load_checkpoint(entry) == {"content_creation": {"instagram": {}}}
+
+    entry.topic = "Cloud costs"
+    assert pipeline._load_checkpoint(entry) == {}
+
+
+@pytest.mark.asyncio
+async def test_process_entry_holds_no_session_during_llm_calls():
+    """Stage progress uses short UPDATEs; Content rows are bulk-inserted in one transaction."""
+    from workflow.calendar_pipeline import CalendarPipeline
+
+    entry = _calendar_entry(
+        id="entry-1", topic="AI tools", platforms=["instagram", "linkedin"],
+        approval_required=False,
+    )
+    factory = _fake_session_factory(entry)
+    sessions_during_llm = []
+
+    def agent(output):
+        async def run(_input):
+            sessions_during_llm.append(factory.open)
+            return output
+        return run
+
+    post = {"caption": "c", "post_text": "Post about AI"}
+    pipeline = CalendarPipeline()
+    pipeline.content_creator.run = agent({"platforms": {"instagram": post, "linkedin": post}})
+    pipeline.hashtag_generator.run = agent({"platforms": {
+        "instagram": {"niche_hashtags": ["#AItools"], "broad_hashtags": ["#AI"]},
+        "linkedin": {"niche_hashtags": ["#AItools"], "broad_hashtags": []},
+    }})
+    pipeline.review_agent.run = agent({"overall_score": 8, "is_approved": True})
+
+    with patch("db.database.async_session", factory):
+        result = await pipeline.process_entry("entry-1")
+
+    assert result["success"] is True and len(result["content_ids"]) == 2
+    assert sessions_during_llm == [0, 0, 0]
+    inserts = [
+        call for call in factory.session.execute.await_args_list
+        if len(call.args) == 2 and isinstance(call.args[1], list)
+    ]
+    assert len(inserts) == 1
+    assert [row["platform"].value for row in inserts[0].args[1]] == ["instagram", "linkedin"]
+
+
+@pytest.mark.asyncio
+async def test_parse_and_store_bulk_inserts_entries_in_chunks():
+    # Register every mapper, as the app does, so a CalendarUpload can be built
+    import auth.models, db.models, db.settings_models, db.social_connections, db.whatsapp_approval  # noqa: F401
+    from workflow.calendar_pipeline import CalendarPipeline
+
+    rows = [
+        {"_row_number": i, "topic": f"Topic {i}", "date": "2025-03-01", "platforms": ["linkedin"]}
+        for i in range(2500)
+    ]
+    pipeline = CalendarPipeline()
+    pipeline.data_parser.run = AsyncMock(return_value={"rows": rows, "parse_errors": []})
+    factory = _fake_session_factory(None)
+
+    with patch("db.database.async_session", factory), \
+         patch("config.settings.calendar_insert_chunk_size", 1000):
+        result = await pipeline.parse_and_store(
+            "csv_file", "7b0c5f5e-3d8a-4a51-9a53-2f9a1c3e2d10", "March",
+        )
+
+    assert (result["total_rows"], result["parsed_rows"], result["failed_rows"]) == (2500, 2500, 0)
+    chunks = [call.args[1] for call in factory.session.execute.await_args_list]
+    assert [len(chunk) for chunk in chunks] == [1000, 1000, 500]
+    assert chunks[2][-1]["row_number"] == 2499
+    assert chunks[0][0]["scheduled_date"].isoformat() == "2025-03-01T00:00:00"
+    factory.session.add.assert_called_once()  # only the upload goes through the ORM
+
+
+@pytest.mark.asyncio
+async def test_stream_and_store_inserts_before_the_file_is_read():
+    """The first chunk of entries is committed while the upload is still being read."""
+    import auth.models, db.models, db.settings_models, db.social_connections, db.whatsapp_approval  # noqa: F401
+    from workflow.calendar_pipeline import CalendarPipeline
+
+    factory = _fake_session_factory(None)
+    inserted_before_last_chunk = []
+
+    async def chunks():
+        yield b"Topic,Platforms\n"
+        for i in range(5):
+            yield f"Topic {i},LinkedIn\n".encode()
+        inserted_before_last_chunk.append(factory.session.execute.await_count)
+        yield b"Topic 5,X\n"
+
+    with patch("db.database.async_session", factory), \
+         patch("config.settings.calendar_insert_chunk_size", 2), \
+         patch("agents.data_parser_agent.PLAN_SAMPLE_ROWS", 2):
+        result = await CalendarPipeline().stream_and_store(
+            "csv_file", "7b0c5f5e-3d8a-4a51-9a53-2f9a1c3e2d10", "Stream", chunks(),
+        )
+
+    assert (result["total_rows"], result["parsed_rows"], result["failed_rows"]) == (6, 6, 0)
+    assert inserted_before_last_chunk == [2]
+    chunks_inserted = [call.args[1] for call in factory.session.execute.await_args_list]
+    assert [len(chunk) for chunk in chunks_inserted] == [2, 2, 2]
+    assert chunks_inserted[2][1]["platforms"] == ["twitter"]
+
+
+def _sheet_rows(count):
+    return [
+        {"_row_number": i + 2, "date": "2026-03-01", "brand": "Clawtbot",
+         "topic": f"Topic {i}", "tone": "casual", "platforms": ["linkedin"]}
+        for i in range(count)
+    ]
+
+
+def test_sheet_diff_touches_only_changed_rows():
+    """One edit in a 2,000-row sheet updates one entry; nothing else is rewritten."""
+    from collections import Counter
+    from db.calendar_models import CalendarEntryStatus
+    from workflow.calendar_pipeline import CalendarPipeline, _row_hash, _row_key
+
+    pipeline = CalendarPipeline()
+    rows = _sheet_rows(2000)
+    seen = Counter()
+    existing = {
+        _row_key(row, seen): (
+            f"entry-{i}", _row_hash(row), row["_row_number"], True, CalendarEntryStatus.PENDING, None,
+        )
+        for i, row in enumerate(rows)
+    }
+
+    rows[10]["tone"] = "witty"                      # edited in place
+    appended = dict(rows[0], topic="Brand new", _row_number=2002)
+    new, changed, moved, deleted, conflicts, errors = pipeline.diff_sheet_rows(
+        existing, rows + [appended], "upload-1", "user-1",
+    )
+    assert (len(new), len(changed), len(moved), deleted, conflicts, errors) == (1, 1, 0, [], [], [])
+    assert changed[0]["id"] == "entry-10" and changed[0]["tone"] == "witty"
+    assert changed[0]["status"] == CalendarEntryStatus.PENDING
+    assert changed[0]["stage_outputs"] is None
+
+    # A removed row deletes its entry; rows below it only shift position
+    del rows[500]
+    for row in rows[500:]:
+        row["_row_number"] -= 1
+    new, changed, moved, deleted, _, _ = pipeline.diff_sheet_rows(existing, rows, "upload-1", "user-1")
+    assert (len(new), len(changed), deleted) == (0, 1, ["entry-500"])
+    assert len(moved) == 1499 and set(moved[0]) == {"id", "row_number", "row_key", "row_hash"}
+
+
+def test_sheet_diff_never_resets_processed_entries():
+    """Edits and removals of rows whose entries moved on are flagged, not applied."""
+    from collections import Counter
+    from db.calendar_models import CalendarEntryStatus
+    from workflow.calendar_pipeline import CalendarPipeline, _row_hash, _row_key
+
+    pipeline = CalendarPipeline()
+    rows = _sheet_rows(4)
+    statuses = [
+        CalendarEntryStatus.PUBLISHED, CalendarEntryStatus.QUEUED,
+        CalendarEntryStatus.FAILED, CalendarEntryStatus.SCHEDULED,
+    ]
+    seen = Counter()
+    existing = {
+        _row_key(row, seen): (f"entry-{i}", _row_hash(row), row["_row_number"], True, statuses[i], None)
+        for i, row in enumerate(rows)
+    }
+
+    rows[0]["tone"] = "witty"    # published
+    rows[1]["tone"] = "witty"    # queued in a running batch
+    rows[2]["tone"] = "witty"    # failed: safe to regenerate
+    removed = rows.pop(3)        # scheduled
+    new, changed, moved, deleted, conflicts, errors = pipeline.diff_sheet_rows(
+        existing, rows, "upload-1", "user-1",
+    )
+
+    assert (new, moved, deleted, errors) == ([], [], [], [])
+    assert [values["id"] for values in changed] == ["entry-2"]
+    assert changed[0]["status"] == CalendarEntryStatus.PENDING
+    assert [c["id"] for c in conflicts] == ["entry-0", "entry-1", "entry-3"]
+    assert all("content_ids" not in c and "status" not in c for c in conflicts)
+    assert "edited after the entry reached 'published'" in conflicts[0]["pipeline_errors"][0]
+    assert "removed after the entry reached 'scheduled'" in conflicts[2]["pipeline_errors"][0]
+    assert conflicts[2]["row_number"] == removed["_row_number"]
+
+    # The note is added once, however often the sheet is re-synced
+    key = next(k for k, v in existing.items() if v[0] == "entry-0")
+    existing[key] = existing[key][:5] + (conflicts[0]["pipeline_errors"],)
+    _, _, _, _, conflicts, _ = pipeline.diff_sheet_rows(existing, rows, "upload-1", "user-1")
+    assert len(conflicts[0]["pipeline_errors"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_sheet_sync_not_modified_skips_the_diff():
+    from types import SimpleNamespace
+    from db.calendar_models import CalendarSourceType
+    from workflow.calendar_pipeline import CalendarPipeline
+
+    upload = SimpleNamespace(
+        id="upload-1", user_id="user-1", parsed_rows=2000,
+        source_type=CalendarSourceType.GOOGLE_SHEET, source_url="https://docs.google.com/sheet",
+        source_etag='"v1"', source_last_modified=None, source_hash="abc",
+    )
+    pipeline = CalendarPipeline()
+    pipeline.data_parser.fetch_google_sheet_if_changed = AsyncMock(return_value={
+        "not_modified": True, "text": None, "etag": '"v1"', "last_modified": None,
+    })
+    pipeline._update_upload = AsyncMock()
+    pipeline.diff_sheet_rows = MagicMock()
+
+    with patch("db.database.async_session", _fake_session_factory(upload)):
+        result = await pipeline.sync_google_sheet("upload-1")
+
+    pipeline.data_parser.fetch_google_sheet_if_changed.assert_awaited_once_with(
+        "https://docs.google.com/sheet", '"v1"', None,
+    )
+    assert result["changed"] is False and result["unchanged"] == 2000
+    pipeline.diff_sheet_rows.assert_not_called()
+    assert pipeline._update_upload.await_args.kwargs["source_etag"] == '"v1"'
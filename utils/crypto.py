@@ -6,6 +6,7 @@ Fernet-based encryption for storing API keys securely in the database.
 import base64
 import hashlib
 import json
+from functools import lru_cache
 from typing import Any, Dict
 
 from cryptography.fernet import Fernet
@@ -19,9 +20,14 @@ def _derive_key(secret: str) -> bytes:
     return base64.urlsafe_b64encode(digest)
 
 
+@lru_cache(maxsize=4)
+def _fernet_for(secret: str) -> Fernet:
+    return Fernet(_derive_key(secret))
+
+
 def get_fernet() -> Fernet:
-    """Get a Fernet instance using the application secret."""
-    return Fernet(_derive_key(settings.jwt_secret_key))
+    """Get the (cached) Fernet instance for the application secret."""
+    return _fernet_for(settings.jwt_secret_key)
 
 
 def encrypt_dict(data: Dict[str, Any]) -> str:
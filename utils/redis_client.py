@@ -0,0 +1,66 @@
+"""
+ClawtBot — Redis Clients
+Shared Redis connections for caches, progress keys, and cross-process
+pub/sub (API ↔ Celery workers).
+
+Async clients are bound to the event loop that created them (Celery tasks
+run their own loops), so they are cached per loop. The sync client is a
+process-wide singleton used by pub/sub listener threads and sync callers.
+"""
+
+import asyncio
+import logging
+import weakref
+from typing import Optional
+
+import redis
+import redis.asyncio as aioredis
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+SOCKET_TIMEOUT = 2.0  # seconds — Redis is an optimization, never block on it
+
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aioredis.Redis]" = (
+    weakref.WeakKeyDictionary()
+)
+_sync_client: Optional[redis.Redis] = None
+
+
+def get_redis() -> aioredis.Redis:
+    """Get the async Redis client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = aioredis.from_url(
+            settings.redis_url,
+            decode_responses=True,
+            socket_timeout=SOCKET_TIMEOUT,
+            socket_connect_timeout=SOCKET_TIMEOUT,
+        )
+        _async_clients[loop] = client
+    return client
+
+
+def get_sync_redis() -> redis.Redis:
+    """Get the process-wide synchronous Redis client."""
+    global _sync_client
+    if _sync_client is None:
+        _sync_client = redis.Redis.from_url(
+            settings.redis_url,
+            decode_responses=True,
+            socket_timeout=SOCKET_TIMEOUT,
+            socket_connect_timeout=SOCKET_TIMEOUT,
+        )
+    return _sync_client
+
+
+async def close_redis():
+    """Close the async Redis client of the running event loop."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.debug(f"Redis close failed: {e}")
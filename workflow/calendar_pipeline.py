@@ -8,21 +8,112 @@ This orchestrator reads CalendarEntry records from the DB and drives each
 through every agent stage, updating the entry status at each step.
 """
 
+import asyncio
+import hashlib
+import json
 import logging
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
-from uuid import UUID
+from functools import lru_cache
+from typing import Any, AsyncIterable, Callable, Dict, Iterable, List, Optional, Union
+from uuid import UUID, uuid4
 
 from celery import shared_task
 
 from agents.content_creator import ContentCreatorAgent
 from agents.hashtag_generator import HashtagGeneratorAgent
+from agents.platform_rules import fit_post, validate_hashtags
 from agents.review_agent import ReviewAgent
 from agents.data_parser_agent import DataParserAgent, DataSourceType
+from brain.http_pool import run_close_http_clients
+from brain.llm_limiter import PRIORITY_BATCH, llm_priority
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=4096)
+def _parse_scheduled_date(date_str: Any) -> Optional[datetime]:
+    """ISO date of a parsed row as a datetime (calendars repeat dates, hence the cache)."""
+    if not date_str:
+        return None
+    try:
+        return datetime.strptime(date_str, "%Y-%m-%d")
+    except (ValueError, TypeError):
+        return None
+
+
+def _row_hash(row: Dict[str, Any]) -> str:
+    """Content hash of a parsed row (its position in the sheet excluded)."""
+    material = json.dumps(
+        {key: value for key, value in row.items() if key != "_row_number"},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()[:32]
+
+
+def _row_key(row: Dict[str, Any], seen: Counter) -> str:
+    """
+    Identity of a row within its upload: the sheet's own id column when it
+    has one, otherwise its date/brand/topic (numbered when repeated). Editing
+    any other field keeps the key, so the row is updated in place.
+    """
+    explicit = row.get("id") or row.get("row_id")
+    if explicit:
+        identity = f"id:{explicit}"
+    else:
+        identity = "|".join(
+            str(row.get(field) or "").strip().lower() for field in ("date", "brand", "topic")
+        )
+    seen[identity] += 1
+    identity = f"{identity}#{seen[identity]}"
+    return hashlib.sha256(identity.encode("utf-8")).hexdigest()[:32]
+
+
+def _sync_conflict(entry_id, row_key, row_hash, row_number, status, errors, change: str) -> Dict[str, Any]:
+    """
+    Update that flags a sheet edit/removal on an entry already past PENDING
+    or FAILED. Only its position and pipeline_errors change; the note is
+    added once, however often the sheet is synced.
+    """
+    label = getattr(status, "value", status)
+    note = f"Sheet sync: row {change} after the entry reached '{label}'; entry left unchanged"
+    errors = list(errors or [])
+    if note not in errors:
+        errors.append(note)
+    return {
+        "id": entry_id,
+        "row_number": row_number,
+        "row_key": row_key,
+        "row_hash": row_hash,
+        "pipeline_errors": errors,
+    }
+
+
+def _claim_abandoned(status, claimed_at: Optional[datetime]) -> bool:
+    """
+    A QUEUED entry whose claim was not refreshed within
+    `calendar_claim_timeout` — its worker died (or its dispatch was lost).
+    """
+    from config import settings
+    from db.calendar_models import CalendarEntryStatus
+
+    if status != CalendarEntryStatus.QUEUED:
+        return False
+    timeout = timedelta(seconds=settings.calendar_claim_timeout)
+    return claimed_at is None or claimed_at < datetime.utcnow() - timeout
+
+
+async def _aiter(rows: Union[Iterable, AsyncIterable]):
+    """Iterate sync and async row sources alike."""
+    if hasattr(rows, "__aiter__"):
+        async for row in rows:
+            yield row
+    else:
+        for row in rows:
+            yield row
+
+
 class CalendarPipeline:
     """
     End-to-end pipeline for calendar-sourced content.
@@ -31,8 +122,8 @@ class CalendarPipeline:
     1. Parse uploaded data via DataParserAgent
     2. Store parsed rows as CalendarEntry records
     3. For each entry, run through agents:
-       - Content Creator (topic + context → content)
-       - Hashtag Generator (+ merge default hashtags from sheet)
+       - Content Creator (topic + context → a version per platform, one LLM call)
+       - Hashtag Generator (per platform, one LLM call; + merge default hashtags from sheet)
        - Review Agent
        - If approval_required → trigger WhatsApp/manual approval
        - Scheduler Bot → queue for publishing
@@ -68,10 +159,7 @@ class CalendarPipeline:
         Returns: { upload_id, total_rows, parsed_rows, failed_rows, errors }
         """
         from db.database import async_session
-        from db.calendar_models import (
-            CalendarUpload, CalendarEntry, CalendarSourceType,
-            CalendarEntryStatus, PipelineStage,
-        )
+        from db.calendar_models import CalendarUpload, CalendarSourceType
 
         # Parse the data
         parse_input = {"source_type": source_type}
@@ -95,61 +183,23 @@ class CalendarPipeline:
                 source_url=url,
                 original_filename=filename,
                 total_rows=len(rows) + len(parse_errors),
-                parsed_rows=len(rows),
+                parsed_rows=0,
                 failed_rows=len(parse_errors),
-                parse_errors=parse_errors if parse_errors else None,
             )
             session.add(upload)
-            await session.flush()
+            await session.commit()
 
-            # Create entry records
-            entries_created = 0
-            for row in rows:
-                try:
-                    # Parse scheduled date
-                    sched_date = None
-                    date_str = row.get("scheduled_date") or row.get("date")
-                    if date_str:
-                        try:
-                            sched_date = datetime.strptime(date_str, "%Y-%m-%d")
-                        except (ValueError, TypeError):
-                            pass
-
-                    entry = CalendarEntry(
-                        upload_id=upload.id,
-                        user_id=user_id,
-                        row_number=row.get("_row_number"),
-                        date=row.get("date"),
-                        scheduled_date=sched_date,
-                        brand=row.get("brand"),
-                        content_type=row.get("content_type"),
-                        topic=row.get("topic", ""),
-                        tone=row.get("tone", "professional"),
-                        cta=row.get("cta"),
-                        link=row.get("link"),
-                        platforms=row.get("platforms", []),
-                        default_hashtags=row.get("default_hashtags", []),
-                        generated_hashtags=row.get("generated_hashtags", []),
-                        approval_required=row.get("approval_required", False),
-                        model_provider=row.get("model_provider"),
-                        model_name=row.get("model_name") or row.get("model"),
-                        status=CalendarEntryStatus.PENDING,
-                        pipeline_stage=PipelineStage.PARSED,
-                        raw_data=row,
-                        notes=row.get("notes"),
-                    )
-                    session.add(entry)
-                    entries_created += 1
-                except Exception as e:
-                    parse_errors.append(f"Row {row.get('_row_number', '?')}: {str(e)}")
-                    logger.error(f"Failed to create entry: {e}")
+            # Create entry records (chunked bulk INSERTs)
+            entries_created = await self.store_entries(
+                session, upload.id, user_id, rows, parse_errors,
+            )
 
             upload.parsed_rows = entries_created
+            upload.failed_rows = len(parse_errors)
+            upload.parse_errors = parse_errors if parse_errors else None
             upload.is_processed = True
             upload.processed_at = datetime.utcnow()
-
             await session.commit()
-            await session.refresh(upload)
 
             return {
                 "upload_id": str(upload.id),
@@ -160,6 +210,397 @@ class CalendarPipeline:
                 "name": name,
             }
 
+    async def stream_and_store(
+        self,
+        source_type: str,
+        user_id: str,
+        name: str,
+        chunks: AsyncIterable[bytes],
+        filename: str = None,
+    ) -> Dict[str, Any]:
+        """
+        Streaming variant of parse_and_store for CSV and JSONL uploads: the
+        file is decoded and parsed as its chunks arrive and entries are
+        inserted chunk by chunk, so memory stays flat whatever the file
+        size. The upload's row counts are updated with every insert chunk,
+        and `is_processed` turns true once the whole file is stored.
+
+        Returns: { upload_id, total_rows, parsed_rows, failed_rows, errors }
+        """
+        from db.database import async_session
+        from db.calendar_models import CalendarUpload, CalendarSourceType
+
+        if source_type == CalendarSourceType.CSV_FILE.value:
+            parse = self.data_parser.stream_csv
+        elif source_type == CalendarSourceType.JSON_FILE.value:
+            parse = self.data_parser.stream_jsonl
+        else:
+            raise ValueError(f"Streaming is not supported for source type: {source_type}")
+
+        errors: List[str] = []
+        async with async_session() as session:
+            upload = CalendarUpload(
+                user_id=user_id,
+                name=name,
+                source_type=CalendarSourceType(source_type),
+                original_filename=filename,
+                total_rows=0,
+                parsed_rows=0,
+                failed_rows=0,
+            )
+            session.add(upload)
+            await session.commit()
+
+            def progress(created: int):
+                upload.parsed_rows = created
+                upload.failed_rows = len(errors)
+                upload.total_rows = created + len(errors)
+
+            entries_created = await self.store_entries(
+                session, upload.id, user_id, parse(chunks, errors), errors,
+                on_chunk=progress,
+            )
+
+            progress(entries_created)
+            upload.parse_errors = errors if errors else None
+            upload.is_processed = True
+            upload.processed_at = datetime.utcnow()
+            await session.commit()
+
+            return {
+                "upload_id": str(upload.id),
+                "total_rows": upload.total_rows,
+                "parsed_rows": entries_created,
+                "failed_rows": len(errors),
+                "errors": errors,
+                "name": name,
+            }
+
+    async def store_entries(
+        self,
+        session,
+        upload_id,
+        user_id: str,
+        rows: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+        errors: List[str],
+        chunk_size: Optional[int] = None,
+        on_chunk: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """
+        Insert parsed rows as CalendarEntry records with one executemany
+        INSERT (and commit) per chunk, so no ORM objects pile up and memory
+        stays bounded by the chunk size. Rows that cannot be mapped are
+        reported in `errors`. `on_chunk(created)` runs before each chunk's
+        commit (e.g. to update progress in the same transaction). Returns
+        the number of entries created.
+        """
+        from db.calendar_models import CalendarEntry
+        from sqlalchemy import insert
+
+        from config import settings
+
+        chunk_size = chunk_size or settings.calendar_insert_chunk_size
+        statement = insert(CalendarEntry.__table__)
+        created = 0
+        chunk: List[Dict[str, Any]] = []
+        seen: Counter = Counter()
+
+        async def flush_chunk():
+            nonlocal created, chunk
+            await session.execute(statement, chunk)
+            created += len(chunk)
+            chunk = []
+            if on_chunk:
+                on_chunk(created)
+            await session.commit()
+
+        async for row in _aiter(rows):
+            try:
+                chunk.append(self._entry_values(row, upload_id, user_id, _row_key(row, seen)))
+            except Exception as e:
+                errors.append(f"Row {row.get('_row_number', '?')}: {str(e)}")
+                logger.error(f"Failed to create entry: {e}")
+                continue
+            if len(chunk) >= chunk_size:
+                await flush_chunk()
+        if chunk:
+            await flush_chunk()
+        return created
+
+    @staticmethod
+    def _entry_values(
+        row: Dict[str, Any],
+        upload_id,
+        user_id: str,
+        row_key: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Column values of the CalendarEntry for one parsed row."""
+        from db.calendar_models import CalendarEntryStatus, PipelineStage
+
+        now = datetime.utcnow()
+        return {
+            "id": uuid4(),
+            "upload_id": upload_id,
+            "user_id": user_id,
+            "row_number": row.get("_row_number"),
+            "row_key": row_key,
+            "row_hash": _row_hash(row),
+            "date": row.get("date"),
+            "scheduled_date": _parse_scheduled_date(row.get("scheduled_date") or row.get("date")),
+            "brand": row.get("brand"),
+            "content_type": row.get("content_type"),
+            "topic": row.get("topic", ""),
+            "tone": row.get("tone", "professional"),
+            "cta": row.get("cta"),
+            "link": row.get("link"),
+            "platforms": row.get("platforms", []),
+            "default_hashtags": row.get("default_hashtags", []),
+            "generated_hashtags": row.get("generated_hashtags", []),
+            "approval_required": row.get("approval_required", False),
+            "model_provider": row.get("model_provider"),
+            "model_name": row.get("model_name") or row.get("model"),
+            "status": CalendarEntryStatus.PENDING,
+            "pipeline_stage": PipelineStage.PARSED,
+            "raw_data": row,
+            "notes": row.get("notes"),
+            "created_at": now,
+            "updated_at": now,
+        }
+
+    # ── Incremental Google Sheet sync ───────────────────────────────────
+
+    async def sync_google_sheet(self, upload_id: str, user_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Re-sync a Google Sheet upload in place. The sheet is fetched with a
+        conditional GET (ETag / Last-Modified); when it changed, rows are
+        matched to the upload's entries by row identity and only the added,
+        edited and removed ones are written. Edited entries go back to
+        PENDING so the next processing run regenerates just those; entries
+        already past that (queued, approved, scheduled, published...) are
+        left as they are and the change is flagged in their pipeline_errors;
+        a QUEUED entry whose claim was abandoned counts as PENDING.
+
+        Returns: { upload_id, changed, inserted, updated, deleted, conflicts, unchanged, errors }
+        """
+        from db.database import async_session
+        from db.calendar_models import CalendarUpload, CalendarSourceType
+        from sqlalchemy import select, update
+
+        query = select(CalendarUpload).where(CalendarUpload.id == upload_id)
+        if user_id:
+            query = query.where(CalendarUpload.user_id == user_id)
+        async with async_session() as session:
+            upload = (await session.execute(query)).scalar_one_or_none()
+        if not upload:
+            raise ValueError("Upload not found")
+        if upload.source_type != CalendarSourceType.GOOGLE_SHEET or not upload.source_url:
+            raise ValueError("Only Google Sheet uploads can be synced")
+
+        fetched = await self.data_parser.fetch_google_sheet_if_changed(
+            upload.source_url, upload.source_etag, upload.source_last_modified,
+        )
+        now = datetime.utcnow()
+        validators = {
+            "source_etag": fetched["etag"],
+            "source_last_modified": fetched["last_modified"],
+            "last_synced_at": now,
+        }
+        summary = {
+            "upload_id": str(upload.id),
+            "changed": False,
+            "inserted": 0,
+            "updated": 0,
+            "deleted": 0,
+            "conflicts": 0,
+            "unchanged": upload.parsed_rows or 0,
+            "errors": [],
+        }
+
+        body_hash = None
+        if not fetched["not_modified"]:
+            body_hash = hashlib.sha256(fetched["text"].encode("utf-8")).hexdigest()
+        if fetched["not_modified"] or body_hash == upload.source_hash:
+            await self._update_upload(upload_id, **validators)
+            return summary
+
+        rows, _, parse_errors = self.data_parser._parse_csv(fetched["text"])
+        async with async_session() as session:
+            existing = await self._sheet_entry_index(session, upload.id)
+            new, changed, moved, deleted, conflicts, row_errors = self.diff_sheet_rows(
+                existing, rows, upload.id, upload.user_id,
+            )
+            await self._apply_sheet_diff(session, new, changed, moved, deleted, conflicts)
+
+            errors = parse_errors + row_errors
+            stored = len(rows) - len(row_errors)
+            await session.execute(
+                update(CalendarUpload)
+                .where(CalendarUpload.id == upload.id)
+                .values(
+                    total_rows=len(rows) + len(parse_errors),
+                    parsed_rows=stored,
+                    failed_rows=len(errors),
+                    parse_errors=errors or None,
+                    source_hash=body_hash,
+                    processed_at=now,
+                    **validators,
+                )
+            )
+            await session.commit()
+
+        logger.info(
+            f"Synced sheet upload {upload_id}: +{len(new)} ~{len(changed)} -{len(deleted)}"
+            f" ({len(conflicts)} conflicts)"
+        )
+        summary.update(
+            changed=True,
+            inserted=len(new),
+            updated=len(changed),
+            deleted=len(deleted),
+            conflicts=len(conflicts),
+            unchanged=stored - len(new) - len(changed),
+            errors=errors,
+        )
+        return summary
+
+    @staticmethod
+    async def _sheet_entry_index(session, upload_id) -> Dict[str, tuple]:
+        """
+        row_key → (id, row_hash, row_number, identity_stored, status,
+        pipeline_errors) of the upload's entries. An abandoned claim (see
+        `_claim_abandoned`) is reported as PENDING, so its row can be reset.
+        """
+        from db.calendar_models import CalendarEntry, CalendarEntryStatus
+        from sqlalchemy import select
+
+        result = await session.execute(
+            select(
+                CalendarEntry.id, CalendarEntry.row_key, CalendarEntry.row_hash,
+                CalendarEntry.row_number, CalendarEntry.status, CalendarEntry.pipeline_errors,
+                CalendarEntry.claimed_at,
+            )
+            .where(CalendarEntry.upload_id == upload_id)
+            .order_by(CalendarEntry.row_number)
+        )
+        index: Dict[str, tuple] = {}
+        legacy = []
+        statuses = {}
+        for entry_id, row_key, row_hash, row_number, entry_status, entry_errors, claimed_at in result.all():
+            if _claim_abandoned(entry_status, claimed_at):
+                entry_status = CalendarEntryStatus.PENDING  # nobody is working on it
+            statuses[entry_id] = entry_status
+            if row_key is None:
+                legacy.append(entry_id)
+            else:
+                index[row_key] = (entry_id, row_hash, row_number, True, entry_status, entry_errors)
+
+        if legacy:
+            # Imported before rows had identities: derive them from the raw rows
+            result = await session.execute(
+                select(
+                    CalendarEntry.id, CalendarEntry.row_number, CalendarEntry.raw_data,
+                    CalendarEntry.pipeline_errors,
+                )
+                .where(CalendarEntry.id.in_(legacy))
+                .order_by(CalendarEntry.row_number)
+            )
+            seen: Counter = Counter()
+            for entry_id, row_number, raw_data, entry_errors in result.all():
+                raw = raw_data or {}
+                index[_row_key(raw, seen)] = (
+                    entry_id, _row_hash(raw), row_number, False, statuses[entry_id], entry_errors,
+                )
+        return index
+
+    def diff_sheet_rows(
+        self,
+        existing: Dict[str, Any],
+        rows: List[Dict[str, Any]],
+        upload_id,
+        user_id,
+    ) -> tuple:
+        """
+        Compare freshly parsed rows with the upload's entries (`existing`,
+        see `_sheet_entry_index`).
+
+        Returns (new, changed, moved, deleted, conflicts, errors): insert
+        values, full update values for edited rows, position/identity-only
+        updates for rows that just shifted (or still lack a stored
+        identity), the ids of entries whose row is gone, and updates that
+        flag an edit or removal on an entry that is no longer PENDING or
+        FAILED (such entries are never reset or deleted).
+        """
+        from db.calendar_models import CalendarEntryStatus, PipelineStage
+
+        resettable = (CalendarEntryStatus.PENDING, CalendarEntryStatus.FAILED)
+        remaining = dict(existing)
+        new, changed, moved, conflicts, errors = [], [], [], [], []
+        seen: Counter = Counter()
+        for row in rows:
+            try:
+                values = self._entry_values(row, upload_id, user_id, _row_key(row, seen))
+            except Exception as e:
+                errors.append(f"Row {row.get('_row_number', '?')}: {str(e)}")
+                continue
+
+            current = remaining.pop(values["row_key"], None)
+            if current is None:
+                new.append(values)
+                continue
+            entry_id, row_hash, row_number, identity_stored, entry_status, entry_errors = current
+            if row_hash != values["row_hash"] and entry_status not in resettable:
+                conflicts.append(_sync_conflict(
+                    entry_id, values["row_key"], row_hash, values["row_number"],
+                    entry_status, entry_errors, "edited",
+                ))
+            elif row_hash != values["row_hash"]:
+                values.pop("created_at")
+                values.update(
+                    id=entry_id,
+                    status=CalendarEntryStatus.PENDING,
+                    pipeline_stage=PipelineStage.PARSED,
+                    pipeline_errors=None,
+                    stage_outputs=None,
+                    content_ids=None,
+                )
+                changed.append(values)
+            elif row_number != values["row_number"] or not identity_stored:
+                moved.append({
+                    "id": entry_id,
+                    "row_number": values["row_number"],
+                    "row_key": values["row_key"],
+                    "row_hash": values["row_hash"],
+                })
+        deleted = []
+        for row_key, current in remaining.items():
+            entry_id, row_hash, row_number, _, entry_status, entry_errors = current
+            if entry_status in resettable:
+                deleted.append(entry_id)
+            else:
+                conflicts.append(_sync_conflict(
+                    entry_id, row_key, row_hash, row_number, entry_status, entry_errors, "removed",
+                ))
+        return new, changed, moved, deleted, conflicts, errors
+
+    @staticmethod
+    async def _apply_sheet_diff(session, new, changed, moved, deleted, conflicts=()):
+        from db.calendar_models import CalendarEntry
+        from sqlalchemy import delete, insert, update
+        from config import settings
+
+        chunk_size = settings.calendar_insert_chunk_size
+        for start in range(0, len(new), chunk_size):
+            await session.execute(insert(CalendarEntry.__table__), new[start:start + chunk_size])
+        # Bulk UPDATE by primary key (executemany)
+        if changed:
+            await session.execute(update(CalendarEntry), changed)
+        if moved:
+            await session.execute(update(CalendarEntry), moved)
+        if conflicts:
+            await session.execute(update(CalendarEntry), list(conflicts))
+        if deleted:
+            await session.execute(delete(CalendarEntry).where(CalendarEntry.id.in_(deleted)))
+
     # ═══════════════════════════════════════════════════════════════════
     # Step 2: Process Pipeline (per entry)
     # ═══════════════════════════════════════════════════════════════════
@@ -170,10 +611,14 @@ class CalendarPipeline:
 
         Stages: Content Creation → Hashtag Generation → Review →
                 (Approval if required) → Save as Content → Queue for Scheduling
+
+        No DB session is held while an agent waits on the LLM: the entry is
+        read up front, stage progress is written with single UPDATE
+        statements, and the Content rows are bulk-inserted together with the
+        entry's final state in one short transaction.
         """
         from db.database import async_session
         from db.calendar_models import CalendarEntry, CalendarEntryStatus, PipelineStage
-        from db.models import Content, ContentStatus, Platform as PlatformEnum
         from sqlalchemy import select
 
         async with async_session() as session:
@@ -181,220 +626,469 @@ class CalendarPipeline:
                 select(CalendarEntry).where(CalendarEntry.id == entry_id)
             )
             entry = result.scalar_one_or_none()
-            if not entry:
-                return {"success": False, "error": "Entry not found"}
-
-            content_ids = []
-            errors = []
-
-            try:
-                # ── Stage 1: Content Creation ───────────────────────────
-                entry.pipeline_stage = PipelineStage.CONTENT_CREATION
-                entry.status = CalendarEntryStatus.QUEUED
-                await session.commit()
-
-                # Build enriched prompt context from calendar data
-                enriched_topic = self._build_enriched_topic(entry)
+        if not entry:
+            return {"success": False, "error": "Entry not found"}
+
+        try:
+            # Outputs of stages finished by an earlier (failed) attempt
+            checkpoint = self._load_checkpoint(entry)
+            if checkpoint:
+                logger.info(f"Entry {entry_id}: resuming after {sorted(checkpoint)}")
+
+            # Build enriched prompt context from calendar data
+            enriched_topic = self._build_enriched_topic(entry)
+            platforms = list(entry.platforms or []) or ["instagram"]
+            primary = platforms[0]
+
+            # ── Stage 1: Content Creation ───────────────────────────────
+            posts = checkpoint.get(PipelineStage.CONTENT_CREATION.value)
+            if posts is None:
+                await self._update_entry(
+                    entry,
+                    pipeline_stage=PipelineStage.CONTENT_CREATION,
+                    status=CalendarEntryStatus.QUEUED,
+                )
 
+                # One LLM call writes a version for every target platform
                 content_result = await self.content_creator.run({
                     "topic": enriched_topic,
-                    "platform": entry.platforms[0] if entry.platforms else "instagram",
+                    "platforms": platforms,
                     "tone": entry.tone or "professional",
                 })
+                posts = content_result["platforms"]
 
                 # If there's a CTA link from the sheet, use it
-                if entry.link and not content_result.get("cta"):
-                    content_result["cta"] = f"Check it out: {entry.link}"
-                elif entry.cta:
-                    content_result["cta"] = entry.cta
-
-                # ── Stage 2: Hashtag Generation ─────────────────────────
-                entry.pipeline_stage = PipelineStage.HASHTAG_GENERATION
-                await session.commit()
+                for post in posts.values():
+                    if entry.link and not post.get("cta"):
+                        post["cta"] = f"Check it out: {entry.link}"
+                    elif entry.cta:
+                        post["cta"] = entry.cta
+
+                self._save_checkpoint(entry, PipelineStage.CONTENT_CREATION, posts)
+
+            # ── Stage 2: Hashtag Generation ─────────────────────────────
+            tags = checkpoint.get(PipelineStage.HASHTAG_GENERATION.value)
+            if tags is None:
+                await self._update_entry(
+                    entry,
+                    pipeline_stage=PipelineStage.HASHTAG_GENERATION,
+                    status=CalendarEntryStatus.QUEUED,
+                )
 
                 hashtag_result = await self.hashtag_generator.run({
                     "topic": entry.topic,
-                    "platform": entry.platforms[0] if entry.platforms else "instagram",
+                    "platforms": platforms,
                 })
+                tags = hashtag_result["platforms"]
 
-                # Merge default hashtags from sheet
+                # Merge default hashtags from sheet (re-capped per platform)
                 if entry.default_hashtags:
-                    existing_niche = hashtag_result.get("niche_hashtags", [])
-                    merged = list(set(entry.default_hashtags + existing_niche))
-                    hashtag_result["niche_hashtags"] = merged
+                    for platform, platform_tags in tags.items():
+                        niche, broad = validate_hashtags(
+                            platform,
+                            list(entry.default_hashtags) + platform_tags.get("niche_hashtags", []),
+                            platform_tags.get("broad_hashtags", []),
+                        )
+                        platform_tags["niche_hashtags"], platform_tags["broad_hashtags"] = niche, broad
 
-                entry.generated_hashtags = (
-                    hashtag_result.get("niche_hashtags", [])
-                    + hashtag_result.get("broad_hashtags", [])
-                )
+                self._save_checkpoint(entry, PipelineStage.HASHTAG_GENERATION, tags)
 
-                # ── Stage 3: Review ─────────────────────────────────────
-                entry.pipeline_stage = PipelineStage.REVIEW
-                await session.commit()
+            # ── Stage 3: Review ─────────────────────────────────────────
+            review_result = checkpoint.get(PipelineStage.REVIEW.value)
+            if review_result is None:
+                await self._update_entry(
+                    entry,
+                    pipeline_stage=PipelineStage.REVIEW,
+                    status=CalendarEntryStatus.QUEUED,
+                )
 
+                # The primary platform's version is reviewed; its score
+                # applies to the entry's other platforms too
                 review_input = {
-                    **content_result,
-                    "niche_hashtags": hashtag_result.get("niche_hashtags", []),
-                    "broad_hashtags": hashtag_result.get("broad_hashtags", []),
+                    **posts[primary],
+                    "niche_hashtags": tags[primary].get("niche_hashtags", []),
+                    "broad_hashtags": tags[primary].get("broad_hashtags", []),
                 }
                 review_result = await self.review_agent.run(review_input)
+                self._save_checkpoint(entry, PipelineStage.REVIEW, review_result)
+
+            # ── Stage 4: Save as Content + Approval / Scheduling ────────
+            content_rows, errors = self._build_content_rows(
+                entry, posts, tags, review_result, primary,
+            )
+            if entry.approval_required:
+                stage, status = PipelineStage.APPROVAL, CalendarEntryStatus.APPROVAL_SENT
 
-                entry.status = CalendarEntryStatus.REVIEW_PASSED
-                entry.pipeline_stage = PipelineStage.REVIEW
-
-                # ── Stage 4: Save as Content (one per platform) ─────────
-                for platform in entry.platforms:
-                    try:
-                        # Map platform string to enum
-                        try:
-                            platform_enum = PlatformEnum(platform)
-                        except ValueError:
-                            logger.warning(f"Unknown platform '{platform}', skipping")
-                            continue
-
-                        # Determine content status
-                        if entry.approval_required:
-                            content_status = ContentStatus.REVIEWED
-                        elif review_result.get("is_approved", False):
-                            content_status = ContentStatus.APPROVED
-                        else:
-                            content_status = ContentStatus.DRAFT
-
-                        db_content = Content(
-                            topic=entry.topic,
-                            platform=platform_enum,
-                            tone=entry.tone or "professional",
-                            caption=content_result.get("caption"),
-                            hook=content_result.get("hook"),
-                            cta=content_result.get("cta"),
-                            post_text=content_result.get("post_text"),
-                            niche_hashtags=hashtag_result.get("niche_hashtags"),
-                            broad_hashtags=hashtag_result.get("broad_hashtags"),
-                            review_score=review_result.get("overall_score"),
-                            review_feedback=str(review_result.get("issues", [])),
-                            improved_text=review_result.get("improved_text"),
-                            status=content_status,
-                            created_by=entry.user_id,
+                # Try WhatsApp approval if configured
+                try:
+                    from config import settings
+                    if settings.whatsapp_access_token and content_rows:
+                        from api.whatsapp_approval import _send_whatsapp_approval
+                        # Send approval for first content
+                        # (In production, could send for all)
+                        logger.info(
+                            f"WhatsApp approval would be sent for entry {entry_id}"
                         )
-                        session.add(db_content)
-                        await session.flush()
-                        content_ids.append(str(db_content.id))
-
-                    except Exception as e:
-                        errors.append(f"Platform {platform}: {str(e)}")
-                        logger.error(f"Failed to create content for platform {platform}: {e}")
-
-                # ── Stage 5: Approval (if required) ─────────────────────
-                if entry.approval_required:
-                    entry.pipeline_stage = PipelineStage.APPROVAL
-                    entry.status = CalendarEntryStatus.APPROVAL_SENT
-
-                    # Try WhatsApp approval if configured
-                    try:
-                        from config import settings
-                        if settings.whatsapp_access_token and content_ids:
-                            from api.whatsapp_approval import _send_whatsapp_approval
-                            # Send approval for first content
-                            # (In production, could send for all)
-                            logger.info(
-                                f"WhatsApp approval would be sent for entry {entry_id}"
-                            )
-                    except Exception as e:
-                        logger.warning(f"WhatsApp approval skipped: {e}")
-                else:
-                    entry.pipeline_stage = PipelineStage.SCHEDULING
-                    entry.status = CalendarEntryStatus.APPROVED
-
-                # Update entry with content IDs
-                entry.content_ids = content_ids
-                entry.status = (
-                    CalendarEntryStatus.APPROVAL_SENT
-                    if entry.approval_required
-                    else CalendarEntryStatus.APPROVED
+                except Exception as e:
+                    logger.warning(f"WhatsApp approval skipped: {e}")
+            else:
+                stage, status = PipelineStage.SCHEDULING, CalendarEntryStatus.APPROVED
+
+            content_ids = [str(row["id"]) for row in content_rows]
+            await self._save_entry_results(
+                entry,
+                content_rows,
+                content_ids=content_ids,
+                generated_hashtags=(
+                    tags[primary].get("niche_hashtags", [])
+                    + tags[primary].get("broad_hashtags", [])
+                ),
+                pipeline_stage=stage,
+                status=status,
+            )
+
+            return {
+                "success": True,
+                "entry_id": str(entry.id),
+                "content_ids": content_ids,
+                "status": entry.status.value,
+                "pipeline_stage": entry.pipeline_stage.value,
+                "review_score": review_result.get("overall_score"),
+                "errors": errors,
+            }
+
+        except Exception as e:
+            logger.error(f"Pipeline failed for entry {entry_id}: {e}", exc_info=True)
+            try:
+                await self._update_entry(
+                    entry,
+                    pipeline_stage=PipelineStage.FAILED,
+                    status=CalendarEntryStatus.FAILED,
+                    pipeline_errors=(entry.pipeline_errors or []) + [str(e)],
                 )
-                entry.pipeline_stage = (
-                    PipelineStage.APPROVAL
-                    if entry.approval_required
-                    else PipelineStage.SCHEDULING
+            except Exception as update_error:
+                logger.error(f"Could not mark entry {entry_id} failed: {update_error}")
+            return {
+                "success": False,
+                "entry_id": str(entry.id),
+                "error": str(e),
+                "stage": PipelineStage.FAILED.value,
+            }
+
+    def _build_content_rows(
+        self,
+        entry,
+        posts: Dict[str, Any],
+        tags: Dict[str, Any],
+        review_result: Dict[str, Any],
+        primary: str,
+    ) -> tuple:
+        """Content rows (insert dicts) for every platform of the entry, plus per-platform errors."""
+        from db.models import ContentStatus, Platform as PlatformEnum
+
+        # Determine content status
+        if entry.approval_required:
+            content_status = ContentStatus.REVIEWED
+        elif review_result.get("is_approved", False):
+            content_status = ContentStatus.APPROVED
+        else:
+            content_status = ContentStatus.DRAFT
+
+        rows, errors = [], []
+        for platform in entry.platforms or []:
+            try:
+                # Map platform string to enum
+                try:
+                    platform_enum = PlatformEnum(platform)
+                except ValueError:
+                    logger.warning(f"Unknown platform '{platform}', skipping")
+                    continue
+
+                post = posts[platform]
+                post_text, niche, broad = fit_post(
+                    platform,
+                    post.get("post_text") or "",
+                    tags[platform].get("niche_hashtags", []),
+                    tags[platform].get("broad_hashtags", []),
                 )
+                rows.append({
+                    "id": uuid4(),
+                    "topic": entry.topic,
+                    "platform": platform_enum,
+                    "tone": entry.tone or "professional",
+                    "caption": post.get("caption"),
+                    "hook": post.get("hook"),
+                    "cta": post.get("cta"),
+                    "post_text": post_text,
+                    "niche_hashtags": niche,
+                    "broad_hashtags": broad,
+                    "review_score": review_result.get("overall_score"),
+                    "review_feedback": str(review_result.get("issues", [])),
+                    # The reviewer rewrote the primary platform's text only
+                    "improved_text": review_result.get("improved_text") if platform == primary else None,
+                    "status": content_status,
+                    "created_by": entry.user_id,
+                })
+            except Exception as e:
+                errors.append(f"Platform {platform}: {str(e)}")
+                logger.error(f"Failed to create content for platform {platform}: {e}")
+        return rows, errors
 
-                await session.commit()
+    # ── Entry writes (short transactions, never across an LLM call) ─────
 
-                return {
-                    "success": True,
-                    "entry_id": str(entry.id),
-                    "content_ids": content_ids,
-                    "status": entry.status.value,
-                    "pipeline_stage": entry.pipeline_stage.value,
-                    "review_score": review_result.get("overall_score"),
-                    "errors": errors,
-                }
+    @staticmethod
+    async def _update_entry(entry, **values):
+        """
+        Apply `values` to the detached entry and persist them — together with
+        its latest stage checkpoint — in a single UPDATE statement. Also
+        refreshes the entry's claim, so a long run is not taken for abandoned.
+        """
+        from db.database import async_session
+        from db.calendar_models import CalendarEntry
+        from sqlalchemy import update
 
-            except Exception as e:
-                entry.pipeline_stage = PipelineStage.FAILED
-                entry.status = CalendarEntryStatus.FAILED
-                entry.pipeline_errors = (entry.pipeline_errors or []) + [str(e)]
-                await session.commit()
+        values.setdefault("claimed_at", datetime.utcnow())
+        for field, value in values.items():
+            setattr(entry, field, value)
+        async with async_session() as session:
+            await session.execute(
+                update(CalendarEntry)
+                .where(CalendarEntry.id == entry.id)
+                .values(stage_outputs=entry.stage_outputs, **values)
+            )
+            await session.commit()
 
-                logger.error(f"Pipeline failed for entry {entry_id}: {e}", exc_info=True)
-                return {
-                    "success": False,
-                    "entry_id": str(entry.id),
-                    "error": str(e),
-                    "stage": entry.pipeline_stage.value,
-                }
+    @staticmethod
+    async def _save_entry_results(entry, content_rows: List[Dict[str, Any]], **values):
+        """Bulk-insert the entry's Content rows and record its final state in one transaction."""
+        from db.database import async_session
+        from db.calendar_models import CalendarEntry
+        from db.models import Content
+        from sqlalchemy import insert, update
+
+        async with async_session() as session:
+            if content_rows:
+                await session.execute(insert(Content), content_rows)
+            await session.execute(
+                update(CalendarEntry)
+                .where(CalendarEntry.id == entry.id)
+                .values(stage_outputs=entry.stage_outputs, **values)
+            )
+            await session.commit()
+        for field, value in values.items():
+            setattr(entry, field, value)
 
     # ═══════════════════════════════════════════════════════════════════
     # Step 3: Batch Process (all entries from an upload)
     # ═══════════════════════════════════════════════════════════════════
 
-    async def process_upload(self, upload_id: str) -> Dict[str, Any]:
-        """Process all pending entries from a calendar upload."""
-        from db.database import async_session
+    async def process_upload(
+        self,
+        upload_id: str,
+        concurrency: Optional[int] = None,
+        retry_failed: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Process all pending entries from a calendar upload (and, with
+        `retry_failed`, the failed ones — they resume from their first
+        incomplete stage).
+
+        Entries run concurrently, at most `concurrency` at a time (default:
+        the content creator's provider limit, capped by
+        `settings.calendar_max_concurrent_entries`). Each entry is claimed
+        only when its turn comes (see `claim_entry`), so entries still
+        waiting stay PENDING if the worker dies. Progress counts on the
+        CalendarUpload are updated as each entry finishes; results keep
+        row order.
+        """
+        entry_ids = await self.claimable_entry_ids(upload_id, retry_failed)
+        await self.start_progress(upload_id, len(entry_ids))
+
+        semaphore = asyncio.Semaphore(concurrency or await self.default_concurrency())
+
+        async def run(entry_id: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.process_tracked_entry(entry_id, upload_id, retry_failed)
+
+        results = await asyncio.gather(*(run(entry_id) for entry_id in entry_ids))
+        return await self.finish_progress(upload_id, list(results))
+
+    async def process_tracked_entry(
+        self,
+        entry_id: str,
+        upload_id: str,
+        retry_failed: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Claim and process one entry of a batch run and count it on the
+        upload's progress. An entry another run claimed first is skipped.
+        """
+        if not await self.claim_entry(entry_id, retry_failed):
+            return {"success": False, "skipped": True, "entry_id": entry_id, "error": "Already claimed"}
+        try:
+            result = await self.process_entry(entry_id)
+        except Exception as e:
+            result = {"success": False, "entry_id": entry_id, "error": str(e)}
+        await self.record_progress(upload_id, bool(result.get("success")))
+        return result
+
+    async def default_concurrency(self) -> int:
+        """Entries in flight at once: the content creator's provider limit, capped."""
+        from brain.llm_router import llm_router, resolve_llm
+        from config import settings
+
+        limit = settings.calendar_max_concurrent_entries
+        try:
+            provider = await resolve_llm("content_creator")
+            limit = min(limit, llm_router.provider_limit(provider.provider_name))
+        except Exception as e:
+            logger.warning(f"Could not resolve content creator provider limit: {e}")
+        return max(1, limit)
+
+    # ── Batch progress (atomic UPDATEs, safe across Celery workers) ─────
+
+    @staticmethod
+    def _claimable(retry_failed: bool = False):
+        """
+        Entries a run may claim: PENDING ones, FAILED ones with
+        `retry_failed`, and QUEUED ones whose claim was abandoned.
+        """
+        from config import settings
         from db.calendar_models import CalendarEntry, CalendarEntryStatus
+        from sqlalchemy import and_, or_
+
+        statuses = [CalendarEntryStatus.PENDING]
+        if retry_failed:
+            statuses.append(CalendarEntryStatus.FAILED)
+        stale_before = datetime.utcnow() - timedelta(seconds=settings.calendar_claim_timeout)
+        return or_(
+            CalendarEntry.status.in_(statuses),
+            and_(
+                CalendarEntry.status == CalendarEntryStatus.QUEUED,
+                or_(CalendarEntry.claimed_at.is_(None), CalendarEntry.claimed_at < stale_before),
+            ),
+        )
+
+    async def claimable_entry_ids(self, upload_id: str, retry_failed: bool = False) -> List[str]:
+        """Ids of the upload's claimable entries (see `_claimable`) in row order."""
+        from db.database import async_session
+        from db.calendar_models import CalendarEntry
         from sqlalchemy import select
 
         async with async_session() as session:
             result = await session.execute(
-                select(CalendarEntry).where(
-                    CalendarEntry.upload_id == upload_id,
-                    CalendarEntry.status == CalendarEntryStatus.PENDING,
-                ).order_by(CalendarEntry.row_number)
+                select(CalendarEntry.id)
+                .where(CalendarEntry.upload_id == upload_id, self._claimable(retry_failed))
+                .order_by(CalendarEntry.row_number.is_(None), CalendarEntry.row_number)
             )
-            entries = result.scalars().all()
+            return [str(entry_id) for entry_id in result.scalars().all()]
+
+    async def claim_entry(self, entry_id: str, retry_failed: bool = False) -> bool:
+        """
+        Atomically move a claimable entry to QUEUED, so no other run picks
+        it up too. False when it is no longer claimable.
+        """
+        from db.database import async_session
+        from db.calendar_models import CalendarEntry, CalendarEntryStatus
+        from sqlalchemy import update
 
-        results = []
-        success_count = 0
-        fail_count = 0
+        async with async_session() as session:
+            result = await session.execute(
+                update(CalendarEntry)
+                .where(CalendarEntry.id == entry_id, self._claimable(retry_failed))
+                .values(status=CalendarEntryStatus.QUEUED, claimed_at=datetime.utcnow())
+                .returning(CalendarEntry.id)
+            )
+            claimed = result.first() is not None
+            await session.commit()
+        return claimed
+
+    async def start_progress(self, upload_id: str, total: int):
+        await self._update_upload(
+            upload_id,
+            processing_total=total,
+            processing_succeeded=0,
+            processing_failed=0,
+            processing_started_at=datetime.utcnow(),
+            processing_completed_at=None,
+        )
 
-        for entry in entries:
-            try:
-                r = await self.process_entry(str(entry.id))
-                results.append(r)
-                if r.get("success"):
-                    success_count += 1
-                else:
-                    fail_count += 1
-            except Exception as e:
-                fail_count += 1
-                results.append({
-                    "success": False,
-                    "entry_id": str(entry.id),
-                    "error": str(e),
-                })
+    async def record_progress(self, upload_id: str, success: bool):
+        from db.calendar_models import CalendarUpload
+        if success:
+            await self._update_upload(
+                upload_id, processing_succeeded=CalendarUpload.processing_succeeded + 1,
+            )
+        else:
+            await self._update_upload(
+                upload_id, processing_failed=CalendarUpload.processing_failed + 1,
+            )
 
+    async def finish_progress(self, upload_id: str, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Mark the run complete and summarize its per-entry results."""
+        await self._update_upload(upload_id, processing_completed_at=datetime.utcnow())
+        success_count = sum(1 for r in results if r.get("success"))
+        skipped_count = sum(1 for r in results if r.get("skipped"))
         return {
             "upload_id": upload_id,
-            "total_entries": len(entries),
+            "total_entries": len(results),
             "success": success_count,
-            "failed": fail_count,
+            "failed": len(results) - success_count - skipped_count,
+            "skipped": skipped_count,
             "results": results,
         }
 
+    @staticmethod
+    async def _update_upload(upload_id: str, **values):
+        from db.database import async_session
+        from db.calendar_models import CalendarUpload
+        from sqlalchemy import update
+
+        try:
+            async with async_session() as session:
+                await session.execute(
+                    update(CalendarUpload)
+                    .where(CalendarUpload.id == upload_id)
+                    .values(**values)
+                )
+                await session.commit()
+        except Exception as e:
+            # Progress is informational — never fail the batch over it
+            logger.warning(f"Failed to update progress of upload {upload_id}: {e}")
+
     # ═══════════════════════════════════════════════════════════════════
     # Helpers
     # ═══════════════════════════════════════════════════════════════════
 
+    # Entry fields that determine the generated content; a checkpoint made
+    # from different values is discarded.
+    CHECKPOINT_INPUTS = (
+        "topic", "brand", "content_type", "tone", "cta", "link",
+        "notes", "platforms", "default_hashtags",
+    )
+
+    def _checkpoint_fingerprint(self, entry) -> str:
+        material = json.dumps(
+            [getattr(entry, field) for field in self.CHECKPOINT_INPUTS],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()[:16]
+
+    def _load_checkpoint(self, entry) -> Dict[str, Any]:
+        """Stage outputs saved by an earlier attempt, keyed by PipelineStage value."""
+        saved = entry.stage_outputs or {}
+        if saved.get("_inputs") != self._checkpoint_fingerprint(entry):
+            return {}
+        return {stage: output for stage, output in saved.items() if stage != "_inputs"}
+
+    def _save_checkpoint(self, entry, stage, output: Any):
+        """Record a finished stage's output (persisted with the entry's next write)."""
+        saved = dict(self._load_checkpoint(entry))
+        saved[stage.value] = output
+        saved["_inputs"] = self._checkpoint_fingerprint(entry)
+        entry.stage_outputs = saved
+
     def _build_enriched_topic(self, entry) -> str:
         """
         Build an enriched topic string from calendar entry metadata.
@@ -421,25 +1115,88 @@ class CalendarPipeline:
 # Celery Tasks
 # ═════════════════════════════════════════════════════════════════════════════
 
-@shared_task(name="workflow.calendar_pipeline.process_calendar_upload")
-def process_calendar_upload_task(upload_id: str):
-    """Celery task: process all entries from a calendar upload."""
-    import asyncio
-    pipeline = CalendarPipeline()
+def _run_in_new_loop(coro):
+    """Run a coroutine on a fresh event loop (each Celery task gets its own)."""
+    llm_priority.set(PRIORITY_BATCH)  # chat requests are admitted first
     loop = asyncio.new_event_loop()
     try:
-        return loop.run_until_complete(pipeline.process_upload(upload_id))
+        return loop.run_until_complete(coro)
     finally:
+        run_close_http_clients(loop)
         loop.close()
 
 
+@shared_task(name="workflow.calendar_pipeline.process_calendar_upload")
+def process_calendar_upload_task(
+    upload_id: str,
+    fan_out: Optional[bool] = None,
+    retry_failed: bool = False,
+):
+    """
+    Celery task: process all entries from a calendar upload (plus the failed
+    ones with `retry_failed`).
+
+    With `fan_out` (default `settings.calendar_celery_fan_out`) every entry
+    becomes its own task in a chord, so the upload is spread over all
+    workers, and `finalize_calendar_upload_task` aggregates the results.
+    Otherwise this worker processes the entries with bounded concurrency.
+    """
+    from config import settings
+
+    pipeline = CalendarPipeline()
+    if fan_out is None:
+        fan_out = settings.calendar_celery_fan_out
+    if not fan_out:
+        return _run_in_new_loop(pipeline.process_upload(upload_id, retry_failed=retry_failed))
+
+    async def start() -> List[str]:
+        entry_ids = await pipeline.claimable_entry_ids(upload_id, retry_failed)
+        await pipeline.start_progress(upload_id, len(entry_ids))
+        return entry_ids
+
+    # Each entry task claims its entry when it runs; until then it stays claimable
+    entry_ids = _run_in_new_loop(start())
+    if not entry_ids:
+        return _run_in_new_loop(pipeline.finish_progress(upload_id, []))
+
+    from celery import chord
+    result = chord(
+        process_calendar_entry_task.s(entry_id, upload_id, retry_failed) for entry_id in entry_ids
+    )(finalize_calendar_upload_task.s(upload_id))
+    return {"upload_id": upload_id, "dispatched": len(entry_ids), "chord_id": result.id}
+
+
 @shared_task(name="workflow.calendar_pipeline.process_calendar_entry")
-def process_calendar_entry_task(entry_id: str):
-    """Celery task: process a single calendar entry."""
-    import asyncio
+def process_calendar_entry_task(
+    entry_id: str,
+    upload_id: Optional[str] = None,
+    retry_failed: bool = False,
+):
+    """
+    Celery task: process a single calendar entry. With `upload_id` it is a
+    batch run's entry: claimed first and counted on the upload's progress.
+    """
     pipeline = CalendarPipeline()
-    loop = asyncio.new_event_loop()
-    try:
-        return loop.run_until_complete(pipeline.process_entry(entry_id))
-    finally:
-        loop.close()
+    if upload_id:
+        return _run_in_new_loop(pipeline.process_tracked_entry(entry_id, upload_id, retry_failed))
+    return _run_in_new_loop(pipeline.process_entry(entry_id))
+
+
+@shared_task(name="workflow.calendar_pipeline.finalize_calendar_upload")
+def finalize_calendar_upload_task(results: List[Dict[str, Any]], upload_id: str):
+    """Celery chord callback: mark the upload's run complete and summarize it."""
+    pipeline = CalendarPipeline()
+    return _run_in_new_loop(pipeline.finish_progress(upload_id, results))
+
+
+@shared_task(name="workflow.calendar_pipeline.sync_calendar_sheet")
+def sync_calendar_sheet_task(upload_id: str, process: bool = False):
+    """
+    Celery task: incrementally re-sync a Google Sheet upload; with `process`,
+    run the pipeline on the entries the sync added or reset.
+    """
+    pipeline = CalendarPipeline()
+    result = _run_in_new_loop(pipeline.sync_google_sheet(upload_id))
+    if process and (result["inserted"] or result["updated"]):
+        result["processing"] = _run_in_new_loop(pipeline.process_upload(upload_id))
+    return result
@@ -1,6 +1,6 @@
 """
 ClawtBot — Content Pipeline (Workflow Orchestration)
-Chains Agent 1 → Agent 2 → Agent 3 and saves results to database.
+Runs Agent 1 ∥ Agent 2 → Agent 3 and saves results to database.
 """
 
 import logging
@@ -12,6 +12,8 @@ from celery import shared_task
 from agents.content_creator import ContentCreatorAgent
 from agents.hashtag_generator import HashtagGeneratorAgent
 from agents.review_agent import ReviewAgent
+from brain.llm_limiter import PRIORITY_BATCH, llm_priority
+from workflow.stage_graph import Stage, StageGraph
 
 logger = logging.getLogger(__name__)
 
@@ -20,9 +22,13 @@ class ContentPipeline:
     """
     Main workflow pipeline:
     1. Content Creator Agent → generates post content
-    2. Hashtag Generator Agent → generates hashtags
-    3. Review Agent → reviews and scores the content
+    2. Hashtag Generator Agent → generates hashtags (concurrently with 1 —
+       it only needs topic and platform)
+    3. Review Agent → reviews and scores the content (after 1 and 2)
     4. Save to database with appropriate status
+
+    Stages run as a StageGraph; per-stage wall-clock times are returned
+    under "timings_ms".
     """
 
     def __init__(self):
@@ -51,49 +57,58 @@ class ContentPipeline:
         """
         logger.info(f"Starting pipeline: topic='{topic}', platform='{platform}', tone='{tone}'")
 
-        # ── Step 1: Generate Content ────────────────────────────────────
-        logger.info("Step 1/3: Running Content Creator Agent...")
-        content_result = await self.content_creator.run({
-            "topic": topic,
-            "platform": platform,
-            "tone": tone,
-        })
-
-        # ── Step 2: Generate Hashtags ───────────────────────────────────
-        logger.info("Step 2/3: Running Hashtag Generator Agent...")
-        hashtag_result = await self.hashtag_generator.run({
-            "topic": topic,
-            "platform": platform,
-        })
-
-        # ── Step 3: Review Content ──────────────────────────────────────
-        logger.info("Step 3/3: Running Review Agent...")
-        review_input = {
-            **content_result,
-            "niche_hashtags": hashtag_result["niche_hashtags"],
-            "broad_hashtags": hashtag_result["broad_hashtags"],
-        }
-        review_result = await self.review_agent.run(review_input)
+        async def create_content(results: Dict[str, Any]) -> Dict[str, Any]:
+            logger.info("Running Content Creator Agent...")
+            return await self.content_creator.run({
+                "topic": topic,
+                "platform": platform,
+                "tone": tone,
+            })
+
+        async def generate_hashtags(results: Dict[str, Any]) -> Dict[str, Any]:
+            logger.info("Running Hashtag Generator Agent...")
+            return await self.hashtag_generator.run({
+                "topic": topic,
+                "platform": platform,
+            })
+
+        async def review(results: Dict[str, Any]) -> Dict[str, Any]:
+            logger.info("Running Review Agent...")
+            return await self.review_agent.run({
+                **results["content"],
+                "niche_hashtags": results["hashtags"]["niche_hashtags"],
+                "broad_hashtags": results["hashtags"]["broad_hashtags"],
+            })
+
+        async def save(results: Dict[str, Any]) -> str:
+            return await self._save_to_db(
+                topic=topic,
+                platform=platform,
+                tone=tone,
+                content=results["content"],
+                hashtags=results["hashtags"],
+                review=results["review"],
+                user_id=user_id,
+            )
 
-        # ── Save to Database ────────────────────────────────────────────
-        content_id = await self._save_to_db(
-            topic=topic,
-            platform=platform,
-            tone=tone,
-            content=content_result,
-            hashtags=hashtag_result,
-            review=review_result,
-            user_id=user_id,
-        )
+        results, timings = await StageGraph([
+            Stage("content", create_content),
+            Stage("hashtags", generate_hashtags),
+            Stage("review", review, after=("content", "hashtags")),
+            Stage("save", save, after=("review",)),
+        ]).run()
 
-        logger.info(f"Pipeline complete. Content ID: {content_id}")
+        content_id = results["save"]
+        review_result = results["review"]
+        logger.info(f"Pipeline complete. Content ID: {content_id} (timings: {timings})")
 
         return {
             "content_id": str(content_id),
-            "content": content_result,
-            "hashtags": hashtag_result,
+            "content": results["content"],
+            "hashtags": results["hashtags"],
             "review": review_result,
             "status": "reviewed" if review_result.get("is_approved") else "draft",
+            "timings_ms": timings,
         }
 
     async def _save_to_db(
@@ -147,6 +162,7 @@ def run_content_pipeline(topic: str, platform: str, tone: str, user_id: str = No
     """Celery task entrypoint for the content pipeline."""
     import asyncio
     pipeline = ContentPipeline()
+    llm_priority.set(PRIORITY_BATCH)  # chat requests are admitted first
     return asyncio.get_event_loop().run_until_complete(
         pipeline.run(topic=topic, platform=platform, tone=tone, user_id=user_id)
     )
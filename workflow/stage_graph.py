@@ -0,0 +1,95 @@
+"""
+ClawtBot — Stage Graph
+Runs a workflow's stages as a small dependency graph: each stage starts as
+soon as the stages it depends on have finished, so independent agents
+(content creation and hashtag generation) run concurrently.
+
+If any stage fails, the stages still running are cancelled and the error is
+re-raised. The wall-clock time of every stage is recorded.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List
+
+
+class Stage:
+    """One node of the graph: `run(results)` gets the outputs of finished stages."""
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[Dict[str, Any]], Awaitable[Any]],
+        after: Iterable[str] = (),
+    ):
+        self.name = name
+        self.run = run
+        self.after = tuple(after)
+
+
+class StageGraph:
+    """A validated set of stages, runnable any number of times."""
+
+    def __init__(self, stages: List[Stage]):
+        self.stages = self._ordered(stages)
+
+    @staticmethod
+    def _ordered(stages: List[Stage]) -> List[Stage]:
+        """Topological order; rejects unknown dependencies and cycles."""
+        by_name = {stage.name: stage for stage in stages}
+        for stage in stages:
+            missing = [dep for dep in stage.after if dep not in by_name]
+            if missing:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stage(s): {missing}")
+
+        ordered: List[Stage] = []
+        done = set()
+        remaining = list(stages)
+        while remaining:
+            ready = [stage for stage in remaining if all(dep in done for dep in stage.after)]
+            if not ready:
+                raise ValueError(f"Cycle between stages: {[stage.name for stage in remaining]}")
+            for stage in ready:
+                ordered.append(stage)
+                done.add(stage.name)
+                remaining.remove(stage)
+        return ordered
+
+    async def run(self) -> tuple:
+        """
+        Run every stage. Returns (results, timings_ms), both keyed by stage
+        name; timings also include "total".
+        """
+        results: Dict[str, Any] = {}
+        timings: Dict[str, float] = {}
+        tasks: Dict[str, asyncio.Task] = {}
+        started = time.monotonic()
+
+        for stage in self.stages:
+            tasks[stage.name] = asyncio.ensure_future(
+                self._run_stage(stage, tasks, results, timings)
+            )
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+
+        timings["total"] = round((time.monotonic() - started) * 1000, 1)
+        return results, timings
+
+    @staticmethod
+    async def _run_stage(
+        stage: Stage,
+        tasks: Dict[str, asyncio.Task],
+        results: Dict[str, Any],
+        timings: Dict[str, float],
+    ):
+        if stage.after:
+            await asyncio.gather(*(tasks[dep] for dep in stage.after))
+        started = time.monotonic()
+        results[stage.name] = await stage.run(results)
+        timings[stage.name] = round((time.monotonic() - started) * 1000, 1)